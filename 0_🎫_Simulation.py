@@ -1,9 +1,14 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from simulation import run_simulation
-from translations import TRANSLATIONS, render_language_selector
+from absence import ClusteredAbsences
+from analytic import CROSS_CHECK_TOLERANCE, run_analytic
+from background import cancel_job, replace_job
+from charts import bar_buckets, cached_figure, downsample, histogram, label_figure, line_figure, result_hash, scatter
+from cohorts import age_summary
+from profiling import checkpoint
+from queue_policy import FifoPolicy, StrictPriority, WeightedFairShare
+from result_cache import cached_run_simulation, cached_ticket_age_distribution, iter_cached_monte_carlo, monte_carlo_key
+from staffing import find_minimum_staffing
+from translations import TRANSLATIONS, render_cache_stats, render_debug_panel, render_language_selector, start_profiler
 
 # Initialize Session State for Language
 if 'language' not in st.session_state:
@@ -16,103 +21,363 @@ t = get_text()
 
 st.set_page_config(page_title=t['page_title_home'], layout="wide")
 
-# Language Selector (Sidebar Top)
-render_language_selector()
+# Off unless ?profile=1 (or cprofile) or TICKETSIM_PROFILE is set; the checkpoints below are then no-ops
+profiler = start_profiler()
 
-# Re-fetch text after potential language change
-t = get_text()
+# Stopped even when Streamlit interrupts the run or the page raises, so
+# cProfile is never left enabled for the next run
+try:
+    # Language Selector (Sidebar Top)
+    render_language_selector()
+
+    # Re-fetch text after potential language change
+    t = get_text()
+
+    st.title(t['home_title'])
+    st.markdown(t['home_desc'])
+
+    # --- Sidebar Controls ---
+    st.sidebar.header(t['sidebar_settings'])
+
+    st.sidebar.subheader(t['header_staffing'])
+    full_time_agents = st.sidebar.slider(t['ft_agents'], 0, 20, 5, help=t['help_ft'])
+    part_time_agents = st.sidebar.slider(t['pt_agents'], 0, 10, 2, help=t['help_pt'])
+    part_time_hours = st.sidebar.slider(t['pt_hours'], 1, 8, 4)
+    agent_efficiency = st.sidebar.slider(t['efficiency'], 1, 20, 5, help=t['help_eff'])
+    vacation_rate = st.sidebar.slider(t['absenteeism'], 0, 50, 5, help=t['help_absent']) / 100.0
+    clustered_absences = st.sidebar.checkbox(t['absence_clustered'], value=False, help=t['help_clustered'])
+
+    st.sidebar.subheader(t['header_inbound'])
+    avg_daily_tickets = st.sidebar.slider(t['avg_inbound'], 10, 1000, 100)
+    volatility = st.sidebar.slider(t['volatility'], 0, 100, 20, help=t['help_volatility']) / 100.0
+
+    st.sidebar.subheader(t['header_props'])
+    st.sidebar.markdown(t['complexity_dist'])
+    col1, col2, col3 = st.sidebar.columns(3)
+    comp_low = col1.number_input(t['comp_low'], 0, 100, 50)
+    comp_med = col2.number_input(t['comp_med'], 0, 100, 30)
+    comp_high = col3.number_input(t['comp_high'], 0, 100, 20)
+
+    # Normalize complexity if not 100%
+    total_comp = comp_low + comp_med + comp_high
+    if total_comp != 100:
+        st.sidebar.warning(t['warn_normalize'].format(total=total_comp))
+        comp_low = comp_low / total_comp
+        comp_med = comp_med / total_comp
+        comp_high = comp_high / total_comp
+    else:
+        comp_low /= 100.0
+        comp_med /= 100.0
+        comp_high /= 100.0
+
+    automation_rate = st.sidebar.slider(t['automation'], 0, 100, 10) / 100.0
+
+    QUEUE_POLICIES = {
+        'single': None,
+        'fifo': FifoPolicy(),
+        'strict_low': StrictPriority(['Low', 'Medium', 'High']),
+        'strict_high': StrictPriority(['High', 'Medium', 'Low']),
+        'fair': WeightedFairShare(),
+    }
+    queue_policy_name = st.sidebar.selectbox(
+        t['queue_policy'], list(QUEUE_POLICIES), format_func=lambda name: t[f'queue_policy_{name}'],
+        help=t['help_queue_policy']
+    )
+
+    st.sidebar.subheader(t['header_mc'])
+    n_replications = st.sidebar.selectbox(
+        t['mc_replications'], [0, 100, 1000, 10000], index=2,
+        format_func=lambda n: t['mc_off'] if n == 0 else f"{n:,}", help=t['help_mc']
+    )
+    seed = st.sidebar.number_input(t['seed'], 0, 2**31 - 1, 42, help=t['help_seed'])
+    engine = st.sidebar.radio(
+        t['engine'], ['daily', 'hourly', 'event'], format_func=lambda e: t[f'engine_{e}'], help=t['help_engine']
+    )
+    if engine != 'daily' and n_replications:
+        # Monte Carlo runs the batched daily model only
+        st.sidebar.caption(t['engine_event_no_mc'])
+        n_replications = 0
+    queue_policy = QUEUE_POLICIES[queue_policy_name]
+    if engine != 'daily' and queue_policy is not None:
+        st.sidebar.caption(t['queue_policy_daily_only'])
+        queue_policy = None
+
+    # --- Parameters ---
+    sim_params = dict(
+        days=60,
+        avg_daily_tickets=avg_daily_tickets,
+        volatility=volatility,
+        full_time_agents=full_time_agents,
+        part_time_agents=part_time_agents,
+        agent_efficiency=agent_efficiency,
+        part_time_hours=part_time_hours,
+        vacation_rate=vacation_rate,
+        complexity_mix={'Low': comp_low, 'Medium': comp_med, 'High': comp_high},
+        automation_rate=automation_rate,
+        absence_model=ClusteredAbsences() if clustered_absences else None,
+        rng=int(seed),
+        engine=engine,
+        queue_policy=queue_policy
+    )
+    checkpoint('page: controls')
+
+    # 1. KPI Row and 2. The Pulse
+    # The analytic estimate (analytic.py) shows at once; the simulated KPIs replace it when they are ready
+    kpi_row = [
+        (t['kpi_wait'], 'Avg Wait Time (Hours)', "{:.1f} Hours"),
+        (t['kpi_backlog'], 'Max Backlog', "{:.0f} Tickets"),
+        (t['kpi_solved'], 'Total Solved', "{:.0f}"),
+        (t['kpi_clearance'], 'Clearance Rate (%)', "{:.1f}%"),
+    ]
+    dashboard = st.empty()
+    analytic = run_analytic(**sim_params)
+    estimate = analytic.kpis()
+    with dashboard.container():
+        for kpi_col, (label, column, fmt) in zip(st.columns(4), kpi_row):
+            kpi_col.metric(label, fmt.format(estimate[column]))
+            kpi_col.caption(t['analytic_preview'])
+    checkpoint('page: analytic preview')
+
+    # --- Run Simulation ---
+    # Served from the shared cache when only unrelated widgets (e.g. language) changed;
+    # the cache keeps the compact columns and the table is built per rerun
+    result = cached_run_simulation(**sim_params, as_frame=False)
+    df = result.to_frame()
+    kpis = result.kpis()
+    checkpoint('page: simulation')
+
+    # Monte Carlo bands (optional): median KPIs and P5-P95 ranges over many paths.
+    # They run in a background job that publishes results after 100, 1,000 and 10,000 replications;
+    # changing a parameter cancels the job instead of queuing another run behind it
+    MC_WAIT_SECONDS = 0.2  # Runs finishing sooner (small or cached) render without partial results
+    MC_POLL_SECONDS = 0.5
+    mc_job = None
+    if n_replications:
+        mc_job = replace_job(
+            st.session_state, 'monte_carlo_job', monte_carlo_key(n_replications, **sim_params),
+            lambda: iter_cached_monte_carlo(n_replications, **sim_params)
+        )
+        mc_job.wait(MC_WAIT_SECONDS)
+    else:
+        cancel_job(st.session_state, 'monte_carlo_job')
+    checkpoint('page: monte carlo')
+
+
+    def render_dashboard(mc=None, replications=None):
+        """
+        KPI row and The Pulse from the single run, or from Monte Carlo result
+        ``mc``; ``replications`` is given while ``mc`` is a partial result.
+        """
+        kpi_summary = None if mc is None else mc.kpi_summary()
+        median_interval = None if mc is None or replications is None else mc.median_interval()
+        for kpi_col, (label, column, fmt) in zip(st.columns(4), kpi_row):
+            if kpi_summary is None:
+                kpi_col.metric(label, fmt.format(kpis[column]))
+                continue
+            kpi_col.metric(label, fmt.format(kpi_summary.loc['P50', column]))
+            kpi_col.caption(t['mc_range'].format(
+                low=fmt.format(kpi_summary.loc['P5', column]),
+                high=fmt.format(kpi_summary.loc['P95', column])
+            ))
+            if median_interval is not None:
+                # Narrows with every step while the job is running
+                kpi_col.caption(t['mc_median_interval'].format(
+                    low=fmt.format(median_interval.loc['Low', column]),
+                    high=fmt.format(median_interval.loc['High', column])
+                ))
+
+        if replications is not None:
+            st.progress(replications / n_replications, text=t['mc_progress'].format(done=replications, total=n_replications))
+        else:
+            # Cross-check against the expected values: the Monte Carlo mean, or the single run
+            st.caption(t['analytic_summary'].format(utilization=analytic.utilization, growth=analytic.backlog_growth))
+            mismatches = [
+                t['analytic_versus'].format(kpi=label, analytic=fmt.format(check['Analytic']), simulated=fmt.format(check['Simulated']))
+                for (label, _, fmt), check in zip(kpi_row, analytic.cross_check(kpis if mc is None else mc.kpis.mean()))
+                if not check['Agrees']
+            ]
+            if mismatches:
+                st.warning(t['analytic_mismatch'].format(tolerance=CROSS_CHECK_TOLERANCE, kpis='; '.join(mismatches)))
+
+        # Figures are downsampled and cached by their data; only the labels follow the language
+        st.subheader(t['chart_pulse'])
+        if mc is None:
+            fig_pulse = line_figure(df, 'Date', [
+                ('Inbound (Net)', t['legend_inbound'], dict(line=dict(color='blue', dash='dot'))),
+                ('Capacity (Tickets)', t['legend_capacity'], dict(line=dict(color='green'))),
+                ('Backlog (End of Day)', t['legend_backlog'], dict(fill='tozeroy', line=dict(color='red'))),
+            ])
+        else:
+            fig_pulse = line_figure(mc.bands, 'Date', [
+                ('Inbound (Net) P50', t['legend_inbound'], dict(line=dict(color='blue', dash='dot'))),
+                ('Capacity (Tickets) P50', t['legend_capacity'], dict(line=dict(color='green'))),
+                ('Backlog (End of Day) P5', None, dict(line=dict(width=0), showlegend=False, hoverinfo='skip')),
+                ('Backlog (End of Day) P95', t['legend_backlog_band'], dict(fill='tonexty', fillcolor='rgba(255, 0, 0, 0.2)', line=dict(width=0))),
+                ('Backlog (End of Day) P50', t['legend_backlog'], dict(line=dict(color='red'))),
+            ])
+        st.plotly_chart(fig_pulse, width="stretch")
+
+
+    @st.fragment(run_every=MC_POLL_SECONDS)
+    def render_monte_carlo_progress():
+        """Polls the running job; only this fragment reruns until the final result is in."""
+        if mc_job.done:
+            st.rerun()
+        replications, mc = mc_job.latest or (0, None)
+        render_dashboard(mc, replications)
+
+
+    # Emptied first: a container replacing one of the same type would keep the preview's captions
+    dashboard.empty()
+    with dashboard.container():
+        if mc_job is None:
+            render_dashboard()
+        elif mc_job.done:
+            render_dashboard(mc_job.result()[1])
+        else:
+            render_monte_carlo_progress()
+    checkpoint('page: kpis and pulse chart')
+
+    # Per-class backlogs (queue policy): which complexity class is starving
+    if queue_policy is not None:
+        st.subheader(t['chart_class_backlog'])
+        levels = list(sim_params['complexity_mix'])
+        for class_col, level in zip(st.columns(len(levels)), levels):
+            class_col.metric(t['kpi_class_wait'].format(cls=level), f"{df[f'Est. Wait Time (Hours) [{level}]'].mean():.1f} Hours")
+        fig_classes = line_figure(df, 'Date', [(f'Backlog (End of Day) [{level}]', level, {}) for level in levels])
+        st.plotly_chart(fig_classes, width="stretch")
+        checkpoint('page: class chart')
+
+    # Intraday drill-down (hourly engine): one day or the whole horizon by hour
+    if engine == 'hourly':
+        df_hours = cached_run_simulation(**sim_params, resolution='hour')
+        drill_day = st.selectbox(
+            t['drill_day'], [None] + list(df['Date']),
+            format_func=lambda d: t['drill_all_days'] if d is None else d.strftime('%a %d.%m.%Y')
+        )
+        if drill_day is not None:
+            df_hours = df_hours[df_hours['Time'].dt.normalize() == drill_day]
+
+        def intraday_figure():
+            # Imported here: plotly is only loaded once a figure is built, not on a cache hit
+            import plotly.graph_objects as go
+
+            # Bars are averaged into buckets, lines downsampled; the whole horizon has days x 24 points
+            hours, inbound = bar_buckets(df_hours['Time'], df_hours['Inbound (Net)'])
+            keep = downsample(df_hours['Time'], df_hours['Capacity (Tickets)'], df_hours['Backlog (End of Hour)'])
+            times = df_hours['Time'].to_numpy()[keep]
+            fig = go.Figure([
+                go.Bar(x=hours, y=inbound, marker_color='rgba(0, 0, 255, 0.4)'),
+                scatter(times, df_hours['Capacity (Tickets)'].to_numpy()[keep], line=dict(color='green', shape='hv')),
+                scatter(times, df_hours['Backlog (End of Hour)'].to_numpy()[keep], fill='tozeroy', line=dict(color='red')),
+            ])
+            fig.update_layout(legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+            return fig
+
+        hours_key = result_hash(df_hours['Time'], df_hours['Inbound (Net)'], df_hours['Capacity (Tickets)'], df_hours['Backlog (End of Hour)'])
+        fig_hours = label_figure(
+            cached_figure(('intraday', hours_key), intraday_figure),
+            [t['legend_inbound'], t['legend_capacity'], t['legend_backlog']], title=t['chart_intraday']
+        )
+        st.plotly_chart(fig_hours, width="stretch")
+        checkpoint('page: intraday chart')
+
+    # 3. Secondary Charts
+    col_left, col_right = st.columns(2)
+
+    with col_left:
+        st.subheader(t['chart_dist'])
+        # Histogram of real ticket waits from first-in, first-out cohorts, one bar per age in days (rebinned for long horizons)
+        ages = cached_ticket_age_distribution(**sim_params)
+        ages['Tickets'] = ages['Solved'] + ages['Open']
+        nonzero = ages[ages['Tickets'] > 0]
+
+        def age_figure():
+            import plotly.graph_objects as go
+
+            wait_hours, tickets = histogram(nonzero['Wait Time (Hours)'], nonzero['Tickets'])
+            return go.Figure(go.Bar(x=wait_hours, y=tickets))
+
+        fig_hist = label_figure(
+            cached_figure(('ages', result_hash(nonzero['Wait Time (Hours)'], nonzero['Tickets'])), age_figure),
+            title=t['chart_dist'], xaxis_title=t['axis_wait'], yaxis_title=t['axis_tickets']
+        )
+        st.plotly_chart(fig_hist, width="stretch")
+        checkpoint('page: ticket age chart')
+        sla_hours = st.number_input(t['sla_breach_hours'], 1, 500, 24)
+        summary = age_summary(ages, sla_hours)
+        st.caption(t['age_summary'].format(
+            p50=summary['P50'], p90=summary['P90'], p99=summary['P99'],
+            breaches=summary['sla_breaches'], sla=sla_hours, open=summary['open_over_sla']
+        ))
+
+    with col_right:
+        st.subheader(t['chart_staff'])
+        # Stacked area of staff
+        df['Total Staff Hours'] = (df['Staff Available (FT)'] * 8) + (df['Staff Available (PT)'] * part_time_hours)
+        staff_columns = ('Staff Available (FT)', 'Staff Available (PT)')
+
+        def staff_figure():
+            import plotly.graph_objects as go
+
+            dates, *staff = bar_buckets(df['Date'], *(df[column] for column in staff_columns))
+            fig = go.Figure([go.Bar(x=dates, y=available, name=column) for column, available in zip(staff_columns, staff)])
+            fig.update_layout(barmode='stack')
+            return fig
+
+        fig_staff = label_figure(
+            cached_figure(('staff', result_hash(df['Date'], *(df[column] for column in staff_columns))), staff_figure),
+            title=t['chart_staff']
+        )
+        st.plotly_chart(fig_staff, width="stretch")
+        checkpoint('page: staff chart')
+
+    # 4. SLA Staffing Search: cheapest FT/PT mix for the other sidebar parameters
+    with st.expander(t['header_staffing_search']):
+        st.markdown(t['staffing_search_desc'])
+        sla_col1, sla_col2, sla_col3 = st.columns(3)
+        target_wait_hours = sla_col1.number_input(t['sla_target_hours'], 1, 500, 24)
+        wait_percentile = sla_col2.selectbox(t['sla_percentile'], [50, 80, 90, 95], index=2, format_func=lambda p: f"P{p}")
+        service_level = sla_col3.slider(t['sla_service_level'], 50, 99, 95, help=t['help_sla_service_level']) / 100.0
+        bound_col1, bound_col2 = st.columns(2)
+        max_ft = bound_col1.number_input(t['sla_max_ft'], 1, 200, 50)
+        max_pt = bound_col2.number_input(t['sla_max_pt'], 0, 100, 20)
+
+        if st.button(t['sla_search']):
+            search_params = {k: v for k, v in sim_params.items() if k not in ('full_time_agents', 'part_time_agents', 'rng', 'engine')}
+            with st.spinner(t['sla_searching']):
+                st.session_state['staffing_result'] = find_minimum_staffing(
+                    target_wait_hours=target_wait_hours,
+                    wait_percentile=wait_percentile,
+                    service_level=service_level,
+                    max_full_time_agents=max_ft,
+                    max_part_time_agents=max_pt,
+                    seed=int(seed),
+                    **search_params
+                )
+
+        staffing = st.session_state.get('staffing_result')
+        if staffing is not None:
+            if staffing.feasible:
+                res_col1, res_col2, res_col3 = st.columns(3)
+                res_col1.metric(t['ft_agents'], staffing.full_time_agents)
+                res_col2.metric(t['pt_agents'], staffing.part_time_agents)
+                res_col3.metric(t['sla_success_rate'], f"{staffing.success_rate * 100:.1f}%")
+                st.caption(t['sla_found'].format(hours=staffing.staff_hours, candidates=len(staffing.evaluations)))
+            else:
+                st.warning(t['sla_infeasible'])
+            st.dataframe(staffing.evaluations, width="stretch")
+
+    checkpoint('page: staffing search')
+
+    # 5. Data Table
+    with st.expander(t['expander_data']):
+        st.dataframe(df)
+
+    checkpoint('page: data table')
 
-st.title(t['home_title'])
-st.markdown(t['home_desc'])
-
-# --- Sidebar Controls ---
-st.sidebar.header(t['sidebar_settings'])
-
-st.sidebar.subheader(t['header_staffing'])
-full_time_agents = st.sidebar.slider(t['ft_agents'], 0, 20, 5, help=t['help_ft'])
-part_time_agents = st.sidebar.slider(t['pt_agents'], 0, 10, 2, help=t['help_pt'])
-part_time_hours = st.sidebar.slider(t['pt_hours'], 1, 8, 4)
-agent_efficiency = st.sidebar.slider(t['efficiency'], 1, 20, 5, help=t['help_eff'])
-vacation_rate = st.sidebar.slider(t['absenteeism'], 0, 50, 5, help=t['help_absent']) / 100.0
-
-st.sidebar.subheader(t['header_inbound'])
-avg_daily_tickets = st.sidebar.slider(t['avg_inbound'], 10, 1000, 100)
-volatility = st.sidebar.slider(t['volatility'], 0, 100, 20, help=t['help_volatility']) / 100.0
-
-st.sidebar.subheader(t['header_props'])
-st.sidebar.markdown(t['complexity_dist'])
-col1, col2, col3 = st.sidebar.columns(3)
-comp_low = col1.number_input(t['comp_low'], 0, 100, 50)
-comp_med = col2.number_input(t['comp_med'], 0, 100, 30)
-comp_high = col3.number_input(t['comp_high'], 0, 100, 20)
-
-# Normalize complexity if not 100%
-total_comp = comp_low + comp_med + comp_high
-if total_comp != 100:
-    st.sidebar.warning(t['warn_normalize'].format(total=total_comp))
-    comp_low = comp_low / total_comp
-    comp_med = comp_med / total_comp
-    comp_high = comp_high / total_comp
-else:
-    comp_low /= 100.0
-    comp_med /= 100.0
-    comp_high /= 100.0
-
-automation_rate = st.sidebar.slider(t['automation'], 0, 100, 10) / 100.0
-
-# --- Run Simulation ---
-df = run_simulation(
-    days=60,
-    avg_daily_tickets=avg_daily_tickets,
-    volatility=volatility,
-    full_time_agents=full_time_agents,
-    part_time_agents=part_time_agents,
-    agent_efficiency=agent_efficiency,
-    part_time_hours=part_time_hours,
-    vacation_rate=vacation_rate,
-    complexity_mix={'Low': comp_low, 'Medium': comp_med, 'High': comp_high},
-    automation_rate=automation_rate
-)
-
-# --- Dashboard ---
-
-# 1. KPI Row
-kpi1, kpi2, kpi3, kpi4 = st.columns(4)
-
-avg_wait = df['Est. Wait Time (Hours)'].mean()
-max_backlog = df['Backlog (End of Day)'].max()
-total_solved = df['Solved'].sum()
-total_inbound = df['Inbound (Net)'].sum()
-
-kpi1.metric(t['kpi_wait'], f"{avg_wait:.1f} Hours", delta_color="inverse")
-kpi2.metric(t['kpi_backlog'], f"{int(max_backlog)} Tickets", delta_color="inverse")
-kpi3.metric(t['kpi_solved'], f"{int(total_solved)}")
-kpi4.metric(t['kpi_clearance'], f"{(total_solved/total_inbound)*100:.1f}%")
-
-# 2. Main Chart: The Pulse
-st.subheader(t['chart_pulse'])
-fig_pulse = go.Figure()
-fig_pulse.add_trace(go.Scatter(x=df['Date'], y=df['Inbound (Net)'], name=t['legend_inbound'], line=dict(color='blue', dash='dot')))
-fig_pulse.add_trace(go.Scatter(x=df['Date'], y=df['Capacity (Tickets)'], name=t['legend_capacity'], line=dict(color='green')))
-fig_pulse.add_trace(go.Scatter(x=df['Date'], y=df['Backlog (End of Day)'], name=t['legend_backlog'], fill='tozeroy', line=dict(color='red')))
-st.plotly_chart(fig_pulse, width="stretch")
-
-# 3. Secondary Charts
-col_left, col_right = st.columns(2)
-
-with col_left:
-    st.subheader(t['chart_dist'])
-    # Histogram of wait times
-    fig_hist = px.histogram(df, x="Est. Wait Time (Hours)", nbins=20, title=t['chart_dist'])
-    st.plotly_chart(fig_hist, width="stretch")
-
-with col_right:
-    st.subheader(t['chart_staff'])
-    # Stacked area of staff
-    df['Total Staff Hours'] = (df['Staff Available (FT)'] * 8) + (df['Staff Available (PT)'] * part_time_hours)
-    fig_staff = px.bar(df, x='Date', y=['Staff Available (FT)', 'Staff Available (PT)'], title=t['chart_staff'])
-    st.plotly_chart(fig_staff, width="stretch")
-
-# 4. Data Table
-with st.expander(t['expander_data']):
-    st.dataframe(df)
+    render_cache_stats()
+    render_debug_panel(profiler)
+finally:
+    if profiler is not None:
+        profiler.stop()
@@ -0,0 +1,293 @@
+"""
+Absence models for the ticket simulation.
+
+An absence model turns ``vacation_rate`` into concrete absent agent-days.
+Draws come back as sorted, unique flat keys
+``(replication * n_agents + agent) * days + day``, so single runs and
+Monte Carlo batches share one code path. A single run is stored as a
+bit-packed (agents x days) ``AbsenceSchedule``.
+
+Models draw from any ``rng`` accepted by the simulation (see
+``random_streams.py``). Generators and common random numbers provide
+uniforms that ``keys_from_uniforms`` maps to absences, so scenarios sharing
+the same uniforms get coupled absence patterns.
+"""
+import numpy as np
+
+from random_streams import absence_uniforms, is_standardized, legacy_state
+
+
+def _unique_keys(keys):
+    """Sorted unique keys; a sort plus neighbour comparison beats ``np.unique`` here."""
+    keys = np.sort(keys, axis=None)
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+
+class AbsenceSchedule:
+    """
+    Bit-packed (agents x days) absence matrix.
+
+    The agent axis is packed with ``np.packbits``, eight agents per byte, so
+    2,000 agents x 365 days take ~91 kB instead of 730 kB as a bool matrix.
+    Per-day counts are taken directly on the packed bytes.
+    """
+
+    def __init__(self, packed, n_agents, days):
+        self.packed = packed
+        self.n_agents = n_agents
+        self.days = days
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """Packs a boolean (agents x days) matrix."""
+        matrix = np.asarray(matrix, dtype=bool)
+        n_agents, days = matrix.shape
+        return cls(np.packbits(matrix, axis=0), n_agents, days)
+
+    @classmethod
+    def from_keys(cls, keys, n_agents, days):
+        """
+        Builds the schedule from unique flat ``agent * days + day`` keys.
+
+        The packed bytes are written directly: keys are unique, so summing
+        each agent's bit value per (byte, day) cell equals OR-ing them.
+        """
+        agent, day = np.divmod(keys, days)
+        n_bytes = (n_agents + 7) // 8
+        packed = np.bincount(
+            (agent >> 3) * days + day,
+            weights=np.left_shift(1, 7 - (agent & 7)),
+            minlength=n_bytes * days
+        )
+        return cls(packed.astype(np.uint8).reshape(n_bytes, days), n_agents, days)
+
+    def to_dense(self):
+        """Unpacks to a boolean (agents x days) matrix."""
+        return np.unpackbits(self.packed, axis=0, count=self.n_agents).view(bool)
+
+    @property
+    def n_absent_days(self):
+        """Total number of absent agent-days."""
+        return int(np.bitwise_count(self.packed).sum())
+
+    def absent_counts(self, full_time_agents):
+        """
+        Number of absent FT and PT agents per day.
+
+        Rows ``[0, full_time_agents)`` are full-time agents, the rest part-time.
+        Both groups are counted in a single reduction: the packed columns are
+        masked with one bit mask per group and their set bits summed.
+
+        Returns:
+        --------
+        tuple of np.ndarray
+            (ft_absent, pt_absent), each of shape (days,).
+        """
+        is_full_time = np.arange(self.n_agents) < full_time_agents
+        group_masks = np.packbits([is_full_time, ~is_full_time], axis=1)[:, :, None]
+        counts = np.bitwise_count(self.packed[None] & group_masks).sum(axis=1, dtype=np.int64)
+        return counts[0], counts[1]
+
+
+def count_absences(keys, n_agents, full_time_agents, days, n_replications):
+    """
+    Counts absent FT and PT agents per (replication, day) from flat keys.
+
+    This is the batched counterpart of ``AbsenceSchedule.absent_counts``: one
+    ``np.bincount`` over the keys, without materializing any matrix.
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (ft_absent, pt_absent), each of shape (n_replications, days).
+    """
+    if len(keys) == 0:
+        counts = np.zeros((n_replications, 2, days), dtype=np.int64)
+        return counts[:, 0], counts[:, 1]
+
+    replication, agent_day = np.divmod(keys, n_agents * days)
+    agent, day = np.divmod(agent_day, days)
+    is_part_time = agent >= full_time_agents
+    counts = np.bincount(
+        (replication * 2 + is_part_time) * days + day,
+        minlength=n_replications * 2 * days
+    ).reshape(n_replications, 2, days)
+    return counts[:, 0], counts[:, 1]
+
+
+def employed_keys(keys, n_agents, full_time_agents, days, ft_employed, pt_employed):
+    """
+    Keeps the absences of agents employed on the day.
+
+    With a headcount that varies by day, absences are drawn for the largest
+    team: rows ``[0, full_time_agents)`` are full-time, the rest part-time.
+    The i-th agent of a group is employed on the days its group has more
+    than i agents; absent days of the other rows are dropped, so absences
+    keep their share of the agents actually employed.
+
+    Parameters:
+    -----------
+    keys : np.ndarray
+        Flat ``(replication * n_agents + agent) * days + day`` keys
+    n_agents : int
+        Agent rows of the keys
+    full_time_agents : int
+        Full-time rows of the keys
+    days : int
+        Days of the keys
+    ft_employed, pt_employed : int or np.ndarray
+        Full-time and part-time agents employed per day, shape (days,)
+
+    Returns:
+    --------
+    np.ndarray
+        The keys of employed agents
+    """
+    agent, day = np.divmod(keys % (n_agents * days), days)
+    employed = np.where(
+        agent < full_time_agents,
+        agent < np.broadcast_to(ft_employed, (days,))[day],
+        agent - full_time_agents < np.broadcast_to(pt_employed, (days,))[day]
+    )
+    return keys[employed]
+
+
+class UniformAbsences:
+    """
+    Absent agent-days spread uniformly over agents and days.
+
+    ``int(days * vacation_rate * n_agents)`` (agent, day) pairs are drawn with
+    replacement; drawing a pair twice marks one absent day. This is the model
+    ``run_simulation`` has always used. With the global or a ``RandomState``
+    it consumes the random stream in the same order as the original
+    per-pair loop.
+    """
+
+    uniforms_per_draw = 2
+
+    # Absent days never reach beyond the horizon
+    spill_days = 0
+
+    # Every absent day is drawn on its own
+    mean_block_days = 1
+
+    def n_draws(self, n_agents, days, vacation_rate):
+        """Number of (agent, day) pairs to draw."""
+        return int(days * vacation_rate * n_agents) if n_agents > 0 else 0
+
+    def keys_from_uniforms(self, uniforms, n_agents, days, spill_days=0):
+        """Maps uniforms of shape (n_replications, n_draws, 2) to unique flat keys."""
+        agent = np.minimum((uniforms[..., 0] * n_agents).astype(np.int64), n_agents - 1)
+        day = np.minimum((uniforms[..., 1] * days).astype(np.int64), days - 1)
+        replication = np.arange(uniforms.shape[0])[:, None]
+        return _unique_keys((replication * n_agents + agent) * (days + 2 * spill_days) + spill_days + day)
+
+    def draw_keys(self, n_agents, days, vacation_rate, n_replications=1, rng=None, spill_days=0):
+        """
+        Draws absences for ``n_replications`` schedules and returns unique flat keys.
+
+        Keys are laid out over ``days + 2 * spill_days`` columns, like those
+        of ``ClusteredAbsences``; uniform absences leave the extra days empty.
+        """
+        n_draws = self.n_draws(n_agents, days, vacation_rate)
+        if n_draws <= 0:
+            return np.empty(0, dtype=np.int64)
+        if is_standardized(rng):
+            uniforms = absence_uniforms(rng, n_replications, n_draws, self.uniforms_per_draw)
+            return self.keys_from_uniforms(uniforms, n_agents, days, spill_days)
+
+        # Alternating (agent, day) bounds draw all pairs in a single call
+        bounds = np.tile([n_agents, days], (n_replications, n_draws, 1))
+        draws = legacy_state(rng).randint(0, bounds)
+        replication = np.arange(n_replications)[:, None]
+        keys = (replication * n_agents + draws[..., 0]) * (days + 2 * spill_days) + spill_days + draws[..., 1]
+        return _unique_keys(keys)
+
+
+class ClusteredAbsences:
+    """
+    Multi-day absence blocks, e.g. vacations, instead of isolated days.
+
+    The expected absent agent-days are the same as for ``UniformAbsences``
+    but arrive as blocks of ``min_block_days`` to ``max_block_days``
+    consecutive days. Each block covers an anchor day drawn uniformly or from
+    ``start_weights``; blocks are cut off at the horizon edges and
+    overlapping blocks of one agent count each day once.
+
+    Parameters:
+    -----------
+    min_block_days : int
+        Shortest absence block in days
+    max_block_days : int
+        Longest absence block in days
+    start_weights : array-like, optional
+        Relative likelihood of each simulated day being covered by a block,
+        e.g. higher weights in August for summer vacations. Must have one
+        entry per simulated day. Uniform if omitted.
+    """
+
+    # Agent, block length, anchor day and anchor position within the block
+    uniforms_per_draw = 4
+
+    def __init__(self, min_block_days=3, max_block_days=10, start_weights=None):
+        if not 1 <= min_block_days <= max_block_days:
+            raise ValueError("Block lengths must satisfy 1 <= min_block_days <= max_block_days")
+        self.min_block_days = min_block_days
+        self.max_block_days = max_block_days
+        self.start_weights = None if start_weights is None else np.asarray(start_weights, dtype=float)
+
+    @property
+    def mean_block_days(self):
+        """Average length of an absence block in days."""
+        return (self.min_block_days + self.max_block_days) / 2
+
+    @property
+    def spill_days(self):
+        """Days a block anchored on the first or last day can reach beyond the horizon."""
+        return self.max_block_days - 1
+
+    def n_draws(self, n_agents, days, vacation_rate):
+        """Number of absence blocks to draw."""
+        expected_absent_days = int(days * vacation_rate * n_agents)
+        return int(round(expected_absent_days / self.mean_block_days)) if n_agents > 0 else 0
+
+    def keys_from_uniforms(self, uniforms, n_agents, days, spill_days=0):
+        """
+        Maps uniforms of shape (n_replications, n_blocks, 4) to unique flat keys.
+
+        Block days up to ``spill_days`` before and after the horizon are
+        kept, with keys laid out over ``days + 2 * spill_days`` columns from
+        ``-spill_days`` on, so neighbouring stretches of days can continue the
+        blocks (see ``streaming.py``).
+        """
+        n_replications, n_blocks = uniforms.shape[:2]
+        block_range = self.max_block_days - self.min_block_days + 1
+        agents = np.minimum((uniforms[..., 0] * n_agents).astype(np.int64), n_agents - 1)
+        lengths = self.min_block_days + np.minimum((uniforms[..., 1] * block_range).astype(np.int64), block_range - 1)
+        if self.start_weights is None:
+            anchors = np.minimum((uniforms[..., 2] * days).astype(np.int64), days - 1)
+        else:
+            if len(self.start_weights) != days:
+                raise ValueError(f"start_weights has {len(self.start_weights)} entries, expected {days}")
+            cumulative = np.cumsum(self.start_weights)
+            anchors = np.searchsorted(cumulative, uniforms[..., 2] * cumulative[-1], side='right')
+        starts = anchors - (uniforms[..., 3] * lengths).astype(np.int64)
+
+        # Expand every block into its days in one pass
+        lengths = lengths.ravel()
+        block = np.repeat(np.arange(lengths.size), lengths)
+        block_offset = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        day = starts.ravel()[block] + (np.arange(block.size) - block_offset)
+        in_horizon = (day >= -spill_days) & (day < days + spill_days)
+
+        replication = block // n_blocks
+        keys = (replication * n_agents + agents.ravel()[block]) * (days + 2 * spill_days) + spill_days + day
+        return _unique_keys(keys[in_horizon])
+
+    def draw_keys(self, n_agents, days, vacation_rate, n_replications=1, rng=None, spill_days=0):
+        """Draws absence blocks for ``n_replications`` schedules and returns unique flat keys."""
+        n_blocks = self.n_draws(n_agents, days, vacation_rate)
+        if n_blocks <= 0:
+            return np.empty(0, dtype=np.int64)
+        uniforms = absence_uniforms(rng, n_replications, n_blocks, self.uniforms_per_draw)
+        return self.keys_from_uniforms(uniforms, n_agents, days, spill_days)
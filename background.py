@@ -0,0 +1,119 @@
+"""
+Background jobs for the pages.
+
+Streamlit runs a page script to the end before anything is shown, so a long
+computation blocks the page. ``BackgroundJob`` moves it into a worker
+thread: the job consumes an iterator of partial results, e.g. Monte Carlo
+runs with growing replication counts, and keeps the latest one for the page
+to poll from a fragment.
+
+Jobs live in the session state under a name (``replace_job``). A rerun with
+other parameters cancels the running job instead of queuing more work
+behind it; cancellation takes effect before the next partial result is
+computed.
+"""
+import threading
+
+
+class BackgroundJob:
+    """
+    Computes the items of ``steps`` in a daemon thread.
+
+    Parameters:
+    -----------
+    key : hashable
+        What the job computes, e.g. a cache key of its parameters
+    steps : iterable
+        Partial results, computed lazily; the last one is the final result
+    """
+
+    def __init__(self, key, steps):
+        self.key = key
+        self._latest = None
+        self._error = None
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(steps,), name='ticketsim-job', daemon=True)
+        self._thread.start()
+
+    def _run(self, steps):
+        try:
+            iterator = iter(steps)
+            while not self._cancelled.is_set():
+                try:
+                    self._latest = next(iterator)
+                except StopIteration:
+                    break
+        except Exception as error:
+            self._error = error
+        finally:
+            self._finished.set()
+
+    @property
+    def latest(self):
+        """Most recent partial result, None before the first one."""
+        return self._latest
+
+    @property
+    def done(self):
+        """True once all steps are computed or one of them failed."""
+        return self._finished.is_set() and not self._cancelled.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stops the job before its next step; the running step is finished and discarded."""
+        self._cancelled.set()
+
+    def wait(self, timeout=None):
+        """Waits up to ``timeout`` seconds for the job to end; returns ``done``."""
+        self._finished.wait(timeout)
+        return self.done
+
+    def result(self):
+        """Final result of a finished job; re-raises the error of a failed step."""
+        if not self.done:
+            raise RuntimeError("Background job has not finished")
+        if self._error is not None:
+            raise self._error
+        return self._latest
+
+
+def replace_job(jobs, name, key, steps):
+    """
+    The job ``name`` of ``jobs`` (e.g. ``st.session_state``) for ``key``.
+
+    A running or finished job for the same key is kept. Otherwise the old
+    job is cancelled and a new one started on ``steps()``.
+
+    Parameters:
+    -----------
+    jobs : MutableMapping
+        Where jobs are kept between reruns
+    name : str
+        Slot of the job in ``jobs``
+    key : hashable
+        Parameters of the wanted computation
+    steps : callable
+        Returns the iterable of partial results, called only for a new job
+
+    Returns:
+    --------
+    BackgroundJob
+    """
+    job = jobs.get(name)
+    if job is not None and job.key == key and not job.cancelled:
+        return job
+    if job is not None:
+        job.cancel()
+    job = jobs[name] = BackgroundJob(key, steps())
+    return job
+
+
+def cancel_job(jobs, name):
+    """Cancels the job ``name`` of ``jobs``, if any, e.g. when its output is switched off."""
+    job = jobs.pop(name, None)
+    if job is not None:
+        job.cancel()
@@ -0,0 +1,326 @@
+"""
+Performance benchmarks with regression gates.
+
+``python benchmark.py`` times the daily engine over a matrix of horizons,
+team sizes, volatility and Monte Carlo replication counts and prints wall
+time, peak memory and calls per second per case::
+
+    python benchmark.py --save              # record benchmark_baseline.json
+    python benchmark.py --compare           # exit 1 if a case regressed
+    python benchmark.py --suite full --filter mc
+
+Wall time is the median of repeated calls; peak memory is measured in a
+separate call under ``tracemalloc``, which sees NumPy's allocations.
+
+Every suite also starts with cold-start cases (``import-*``): the import
+time of the simulation core, the batch runner and the top-level imports of
+each Streamlit page, each measured in fresh interpreters. A case
+regresses when its wall time or peak memory exceeds the baseline by more
+than ``--threshold`` (default 25%). Differences below ``MIN_SECONDS`` or
+``MIN_BYTES`` are noise and never count. Baselines are only comparable on
+the machine that recorded them; the file stores the platform next to the
+results.
+"""
+import argparse
+import ast
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from simulation import run_monte_carlo, run_simulation
+
+BASELINE_PATH = Path(__file__).with_name('benchmark_baseline.json')
+
+# Relative slowdown or memory growth that fails the gate
+DEFAULT_THRESHOLD = 0.25
+
+# Absolute differences below these are timer and allocator noise
+MIN_SECONDS = 0.002
+MIN_BYTES = 1 << 20
+
+# Repeat each case until this much time has been spent (at least MIN_REPEATS calls)
+TARGET_SECONDS = 0.3
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+
+# Matrix axes per suite; cases above MAX_WORK agent-days x replications are skipped
+SUITES = {
+    'quick': {
+        'days': (30, 365),
+        'agents': (5, 50),
+        'volatility': (0.2,),
+        'replications': (None, 100),
+    },
+    'full': {
+        'days': (30, 365, 3650),
+        'agents': (5, 50, 500, 5000),
+        'volatility': (0.0, 0.2),
+        'replications': (None, 100, 1000),
+    },
+}
+MAX_WORK = 2e8
+
+# Cold-start cases: modules, then page scripts whose top-level imports are timed
+STARTUP_MODULES = ('simulation', 'cli')
+PAGE_GLOBS = ('0_*.py', 'pages/*.py')
+
+# Runs inside a fresh interpreter; prints the seconds spent in the imports and
+# their traced peak memory when asked for it
+_STARTUP_TIMER = '''
+import sys, time, tracemalloc
+if sys.argv[1] == 'trace':
+    tracemalloc.start()
+start = time.perf_counter()
+{imports}
+seconds = time.perf_counter() - start
+print(seconds, tracemalloc.get_traced_memory()[1])
+'''
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One point of the benchmark matrix; ``replications=None`` is a single ``run_simulation``."""
+    days: int
+    agents: int
+    volatility: float
+    replications: int | None
+
+    @property
+    def name(self):
+        mode = 'single' if self.replications is None else f'mc{self.replications}'
+        return f"{mode}-d{self.days}-a{self.agents}-v{self.volatility:g}"
+
+    def params(self):
+        # Inbound a little above what the team can solve, so the backlog recursion has work to do
+        full_time_agents = max(1, self.agents * 4 // 5)
+        return {
+            'days': self.days,
+            'full_time_agents': full_time_agents,
+            'part_time_agents': self.agents - full_time_agents,
+            'avg_daily_tickets': 26 * self.agents,
+            'volatility': self.volatility,
+            'rng': 42,
+            'start_date': '2025-01-01',
+        }
+
+    def run(self):
+        if self.replications is None:
+            return run_simulation(**self.params())
+        return run_monte_carlo(self.replications, **self.params())
+
+
+@dataclass(frozen=True)
+class StartupCase:
+    """Import time of a module, or of the top-level imports of a page script (path ending in ``.py``)."""
+    target: str
+
+    @property
+    def name(self):
+        if not self.target.endswith('.py'):
+            return f"import-{self.target}"
+        # '0_🎫_Simulation.py' -> 'import-page-simulation'
+        return f"import-page-{Path(self.target).stem.split('_')[-1].lower()}"
+
+    def imports(self):
+        if not self.target.endswith('.py'):
+            return f"import {self.target}"
+        tree = ast.parse((BASELINE_PATH.parent / self.target).read_text(encoding='utf-8'))
+        return '\n'.join(
+            ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+        )
+
+
+def startup_cases():
+    pages = sorted(
+        str(path.relative_to(BASELINE_PATH.parent))
+        for pattern in PAGE_GLOBS for path in BASELINE_PATH.parent.glob(pattern)
+    )
+    return [StartupCase(target) for target in (*STARTUP_MODULES, *pages)]
+
+
+def benchmark_cases(suite='quick', name_filter=None):
+    """
+    Startup cases, then the cases of ``suite`` in matrix order, optionally
+    only those whose name contains ``name_filter``.
+    """
+    axes = SUITES[suite]
+    cases = [case for case in startup_cases() if name_filter is None or name_filter in case.name]
+    for days, agents, volatility, replications in itertools.product(
+        axes['days'], axes['agents'], axes['volatility'], axes['replications']
+    ):
+        if days * agents * (replications or 1) > MAX_WORK:
+            continue
+        case = BenchmarkCase(days, agents, volatility, replications)
+        if name_filter is None or name_filter in case.name:
+            cases.append(case)
+    return cases
+
+
+def measure(case):
+    """
+    Times ``case``.
+
+    Returns:
+    --------
+    dict
+        ``seconds`` (median wall time), ``calls_per_second``,
+        ``peak_bytes`` (traced peak of one call) and ``repeats``.
+    """
+    # Warm-up call, also the first timing
+    times = []
+    start = time.perf_counter()
+    case.run()
+    times.append(time.perf_counter() - start)
+    while len(times) < MAX_REPEATS and (len(times) < MIN_REPEATS or sum(times) < TARGET_SECONDS):
+        start = time.perf_counter()
+        case.run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        case.run()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    seconds = statistics.median(times)
+    return {
+        'seconds': seconds,
+        'calls_per_second': 1.0 / seconds if seconds > 0 else float('inf'),
+        'peak_bytes': peak_bytes,
+        'repeats': len(times),
+    }
+
+
+def _run_startup(case, mode):
+    completed = subprocess.run(
+        [sys.executable, '-c', _STARTUP_TIMER.format(imports=case.imports()), mode],
+        capture_output=True, text=True, check=True, cwd=BASELINE_PATH.parent
+    )
+    seconds, peak_bytes = completed.stdout.split()[-2:]
+    return float(seconds), int(peak_bytes)
+
+
+def measure_startup(case):
+    """
+    Times the imports of ``case`` in fresh interpreters, so nothing is cached
+    in ``sys.modules``; the same fields as ``measure``.
+    """
+    times = [_run_startup(case, 'time')[0] for _ in range(MIN_REPEATS)]
+    seconds = statistics.median(times)
+    return {
+        'seconds': seconds,
+        'calls_per_second': 1.0 / seconds if seconds > 0 else float('inf'),
+        'peak_bytes': _run_startup(case, 'trace')[1],
+        'repeats': len(times),
+    }
+
+
+def run_benchmarks(cases, report=None):
+    """Measures every case; ``report(case, result)`` is called after each one."""
+    results = {}
+    for case in cases:
+        measured = measure_startup(case) if isinstance(case, StartupCase) else measure(case)
+        results[case.name] = {**asdict(case), **measured}
+        if report is not None:
+            report(case, results[case.name])
+    return results
+
+
+def environment():
+    """Where the numbers were taken; baselines from another machine are not comparable."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, 'w') as file:
+        json.dump({'environment': environment(), 'results': results}, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def load_baseline(path=BASELINE_PATH):
+    with open(path) as file:
+        return json.load(file)
+
+
+def find_regressions(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares ``results`` with the ``results`` section of a baseline.
+
+    Only cases present in both are tracked. A case regresses when wall time
+    or peak memory grows by more than ``threshold`` and by more than the
+    ``MIN_SECONDS`` / ``MIN_BYTES`` noise floor.
+
+    Returns:
+    --------
+    list of dict
+        One entry per regressed metric: ``case``, ``metric``, ``baseline``,
+        ``current`` and ``change`` (relative).
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric, floor in (('seconds', MIN_SECONDS), ('peak_bytes', MIN_BYTES)):
+            before, after = previous[metric], current[metric]
+            if after - before > max(threshold * before, floor):
+                regressions.append({
+                    'case': name, 'metric': metric, 'baseline': before, 'current': after,
+                    'change': after / before - 1 if before > 0 else float('inf'),
+                })
+    return regressions
+
+
+def _print_result(case, result):
+    print(f"{case.name:<28} {result['seconds'] * 1000:>10.2f} ms {result['calls_per_second']:>10.1f}/s "
+          f"{result['peak_bytes'] / 2**20:>9.1f} MB")
+
+
+def main(argv=None):
+    """Runs the suite; returns 1 if ``--compare`` found a regression."""
+    parser = argparse.ArgumentParser(description="Benchmark the simulation engine.")
+    parser.add_argument('--suite', choices=sorted(SUITES), default='quick')
+    parser.add_argument('--filter', default=None, help="only cases whose name contains this text")
+    parser.add_argument('--save', nargs='?', const=BASELINE_PATH, default=None, metavar='PATH',
+                        help=f"write the results as baseline (default {BASELINE_PATH.name})")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_PATH, default=None, metavar='PATH',
+                        help=f"fail on regressions against a baseline (default {BASELINE_PATH.name})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown or memory growth (default 0.25)")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    print(f"{'case':<28} {'wall time':>13} {'calls':>12} {'peak memory':>12}")
+    results = run_benchmarks(benchmark_cases(args.suite, args.filter), report=_print_result)
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"Saved {len(results)} cases to {args.save}")
+    if baseline is None:
+        return 0
+
+    regressions = find_regressions(results, baseline['results'], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression['case']} {regression['metric']}: "
+              f"{regression['baseline']:.4g} -> {regression['current']:.4g} ({regression['change']:+.0%})")
+    tracked = len(set(results) & set(baseline['results']))
+    print(f"{tracked} tracked cases, {len(regressions)} regressions (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,480 @@
+"""
+Parameter calibration from historical ticket exports: ``ticketsim-calibrate export.csv``.
+
+Ticketing systems export one row per ticket, often tens of millions of
+rows. ``aggregate_export`` streams a CSV or Parquet export in chunks of
+``chunk_rows`` rows and keeps only running totals:
+
+- tickets and automated tickets per calendar day of creation;
+- per complexity level, the tickets handled by agents and the sum of
+  their handling hours.
+
+Memory therefore depends on the number of days covered, not on the number
+of rows. ``fit_parameters`` turns the totals into ``run_simulation``
+parameters:
+
+- ``avg_daily_tickets`` and ``volatility`` from the maximum-likelihood
+  lognormal fit of the daily ticket counts (mu and sigma are the mean and
+  standard deviation of the log counts; days without tickets are left out
+  and reported as ``empty_days``);
+- ``automation_rate`` as the share of automated tickets;
+- ``complexity_mix`` as the share of each level among agent-handled tickets;
+- ``agent_efficiency`` and ``complexity_factors`` from the mean handling
+  hours per level. The reference level (``Low`` when present) keeps its
+  default factor, so processing ``factor / agent_efficiency`` hours per
+  ticket reproduces the observed means.
+
+Parameters whose columns are missing from the export are not fitted and
+keep the ``run_simulation`` defaults.
+
+``calibrate`` caches the fitted parameters as JSON in ``cache_dir``. An
+entry is reused while the export's size and modification time are
+unchanged; otherwise the file's content hash decides, so a touched but
+unchanged export is not aggregated again.
+
+Export columns (renamed with ``columns``)::
+
+    created_at       creation timestamp (required)
+    complexity       Low / Medium / High (case-insensitive, or mapped with complexity_labels)
+    handling_hours   agent handling time of the ticket in hours
+    automated        true when the ticket was resolved without an agent
+"""
+import argparse
+import dataclasses
+import hashlib
+import json
+import math
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from simulation import simulation_defaults
+
+EXIT_OK = 0
+EXIT_INVALID = 2
+
+# Export column per field; only ``created`` is required
+DEFAULT_COLUMNS = {
+    'created': 'created_at',
+    'complexity': 'complexity',
+    'handling_hours': 'handling_hours',
+    'automated': 'automated',
+}
+
+# Rows read per chunk
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('TICKETSIM_CACHE_DIR', Path.home() / '.cache' / 'ticketsim')) / 'calibration'
+
+LEVELS = ('Low', 'Medium', 'High')
+
+_TRUE_STRINGS = {'true', 't', 'yes', 'y', '1'}
+
+
+class CalibrationError(ValueError):
+    """Raised for exports that cannot be calibrated."""
+
+
+@dataclass
+class TicketAggregates:
+    """
+    Running totals of an export, filled chunk by chunk with ``add``.
+
+    Attributes:
+    -----------
+    first_day : int or None
+        Day number (days since 1970-01-01) of ``tickets[0]``
+    tickets : np.ndarray
+        Tickets created per day from ``first_day`` on
+    automated : np.ndarray
+        Automated tickets per day
+    level_tickets : np.ndarray
+        Agent-handled tickets per level of ``LEVELS``
+    level_timed : np.ndarray
+        Agent-handled tickets with a handling time per level
+    level_hours : np.ndarray
+        Sum of handling hours per level
+    rows, skipped_rows, unknown_complexity : int
+        Rows read, rows without a valid creation time and rows with a
+        complexity outside ``LEVELS``
+    fields : set
+        Fields present in the export
+    """
+    first_day: int = None
+    tickets: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    automated: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    level_tickets: np.ndarray = field(default_factory=lambda: np.zeros(len(LEVELS), dtype=np.int64))
+    level_timed: np.ndarray = field(default_factory=lambda: np.zeros(len(LEVELS), dtype=np.int64))
+    level_hours: np.ndarray = field(default_factory=lambda: np.zeros(len(LEVELS)))
+    rows: int = 0
+    skipped_rows: int = 0
+    unknown_complexity: int = 0
+    fields: set = field(default_factory=set)
+
+    def add(self, chunk, complexity_labels=None):
+        """
+        Adds one chunk with the fields of ``DEFAULT_COLUMNS`` as columns.
+
+        Parameters:
+        -----------
+        chunk : pd.DataFrame
+            Rows of the export, columns renamed to the field names
+        complexity_labels : dict, optional
+            Export value -> level of ``LEVELS``
+        """
+        self.rows += len(chunk)
+        self.fields.update(chunk.columns)
+        days = _day_numbers(chunk['created'])
+        valid = days >= 0
+        self.skipped_rows += int((~valid).sum())
+        chunk, days = chunk[valid], days[valid]
+        if not len(days):
+            return
+        automated = _flags(chunk['automated']) if 'automated' in chunk else np.zeros(len(chunk), dtype=bool)
+        self._add_days(days, automated)
+
+        handled = ~automated
+        if 'complexity' in chunk:
+            levels = _level_codes(chunk['complexity'], complexity_labels)[handled]
+            known = levels >= 0
+            self.unknown_complexity += int((~known).sum())
+            self.level_tickets += np.bincount(levels[known], minlength=len(LEVELS))
+            if 'handling_hours' in chunk:
+                hours = pd.to_numeric(chunk['handling_hours'], errors='coerce').to_numpy(dtype=float)[handled][known]
+                timed = np.isfinite(hours) & (hours >= 0)
+                self.level_timed += np.bincount(levels[known][timed], minlength=len(LEVELS))
+                self.level_hours += np.bincount(levels[known][timed], weights=hours[timed], minlength=len(LEVELS))
+        elif 'handling_hours' in chunk:
+            # Without complexity every handled ticket counts as the reference level
+            hours = pd.to_numeric(chunk['handling_hours'], errors='coerce').to_numpy(dtype=float)[handled]
+            timed = np.isfinite(hours) & (hours >= 0)
+            self.level_timed[0] += int(timed.sum())
+            self.level_hours[0] += hours[timed].sum()
+
+    def _add_days(self, days, automated):
+        """Adds per-day counts, growing the day range to cover ``days``."""
+        low, high = int(days.min()), int(days.max())
+        if self.first_day is None:
+            self.first_day = low
+        start = min(self.first_day, low)
+        stop = max(self.first_day + len(self.tickets), high + 1)
+        if start < self.first_day or stop > self.first_day + len(self.tickets):
+            before = self.first_day - start
+            after = stop - self.first_day - len(self.tickets)
+            self.tickets = np.pad(self.tickets, (before, after))
+            self.automated = np.pad(self.automated, (before, after))
+            self.first_day = start
+        offsets = days - self.first_day
+        self.tickets += np.bincount(offsets, minlength=len(self.tickets))
+        self.automated += np.bincount(offsets[automated], minlength=len(self.tickets))
+
+
+@dataclass(frozen=True)
+class Calibration:
+    """
+    Outcome of ``calibrate``.
+
+    Attributes:
+    -----------
+    params : dict
+        Fitted ``run_simulation`` keyword arguments, ready for
+        ``run_simulation(days=..., **params)``
+    mu, sigma : float
+        Lognormal parameters of the daily ticket count
+    start, end : str
+        First and last day of the export (ISO dates)
+    days : int
+        Days from ``start`` to ``end``
+    empty_days : int
+        Days without tickets, left out of the lognormal fit
+    tickets : int
+        Tickets with a valid creation time
+    skipped_rows : int
+        Rows without a valid creation time
+    handling_hours : dict
+        Mean handling hours per level with handling times
+    """
+    params: dict
+    mu: float
+    sigma: float
+    start: str
+    end: str
+    days: int
+    empty_days: int
+    tickets: int
+    skipped_rows: int
+    handling_hours: dict
+
+    def to_dict(self):
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+    def to_scenario_file(self, name='calibrated'):
+        """Scenario file contents for ``ticketsim`` (see ``cli``), with the fitted parameters as defaults."""
+        return {'defaults': dict(self.params), 'scenarios': [{'name': name}]}
+
+
+def read_export(path, columns=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Reads a CSV or Parquet export in chunks.
+
+    Parameters:
+    -----------
+    path : str or Path
+        ``.csv`` (optionally compressed, e.g. ``.csv.gz``) or ``.parquet`` file
+    columns : dict, optional
+        Export column per field, merged over ``DEFAULT_COLUMNS``
+    chunk_rows : int
+        Rows per chunk
+
+    Yields:
+    -------
+    pd.DataFrame
+        Chunks with the fields present in the export as columns
+    """
+    path = Path(path)
+    columns = {**DEFAULT_COLUMNS, **(columns or {})}
+    if path.suffix.lower() in ('.parquet', '.pq'):
+        yield from _read_parquet(path, columns, chunk_rows)
+    elif '.csv' in (suffix.lower() for suffix in path.suffixes):
+        header = pd.read_csv(path, nrows=0).columns
+        present = _present_columns(path, columns, header)
+        names = {column: name for name, column in present.items()}
+        # Timestamps are parsed per chunk; reading them as text keeps the dtype stable across chunks
+        for chunk in pd.read_csv(path, usecols=list(names), chunksize=chunk_rows, dtype={present['created']: str}):
+            yield chunk.rename(columns=names)
+    else:
+        raise CalibrationError(f"{path}: expected a .csv or .parquet export")
+
+
+def _read_parquet(path, columns, chunk_rows):
+    try:
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Parquet exports require pyarrow (pip install pyarrow)") from error
+    export = pyarrow.parquet.ParquetFile(path)
+    present = _present_columns(path, columns, export.schema_arrow.names)
+    names = {column: name for name, column in present.items()}
+    for batch in export.iter_batches(batch_size=chunk_rows, columns=list(names)):
+        yield batch.to_pandas().rename(columns=names)
+
+
+def _present_columns(path, columns, header):
+    """Fields whose export column exists; the creation time is required."""
+    if columns['created'] not in header:
+        raise CalibrationError(f"{path}: no creation time column {columns['created']!r}")
+    return {name: column for name, column in columns.items() if column in header}
+
+
+def _day_numbers(created):
+    """Days since 1970-01-01 of the creation times, -1 where invalid; local calendar days for zoned times."""
+    if not pd.api.types.is_datetime64_any_dtype(created):
+        created = pd.to_datetime(created, errors='coerce')
+    if getattr(created.dt, 'tz', None) is not None:
+        created = created.dt.tz_localize(None)
+    days = created.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    return np.where(np.isnat(days), -1, days.astype(np.int64))
+
+
+def _flags(values):
+    """Boolean flags from bools, numbers or strings such as "true" / "yes"."""
+    if values.dtype == bool:
+        return values.to_numpy()
+    if pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0).to_numpy() != 0
+    return values.astype(str).str.strip().str.lower().isin(_TRUE_STRINGS).to_numpy()
+
+
+def _level_codes(values, complexity_labels=None):
+    """Index into ``LEVELS`` per value, -1 for unknown levels."""
+    lookup = {level.lower(): code for code, level in enumerate(LEVELS)}
+    for label, level in (complexity_labels or {}).items():
+        lookup[str(label).strip().lower()] = LEVELS.index(level)
+    return values.astype(str).str.strip().str.lower().map(lookup).fillna(-1).to_numpy(dtype=np.intp)
+
+
+def aggregate_export(path, columns=None, complexity_labels=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Streams an export into ``TicketAggregates``; see ``read_export`` for the arguments.
+
+    ``complexity_labels`` maps export values to levels of ``LEVELS``,
+    e.g. ``{'P1': 'High'}``.
+    """
+    aggregates = TicketAggregates()
+    for chunk in read_export(path, columns, chunk_rows):
+        aggregates.add(chunk, complexity_labels)
+    return aggregates
+
+
+def fit_parameters(aggregates):
+    """
+    Fits ``run_simulation`` parameters to aggregated exports.
+
+    Parameters:
+    -----------
+    aggregates : TicketAggregates
+        Totals from ``aggregate_export``
+
+    Returns:
+    --------
+    Calibration
+    """
+    counts = aggregates.tickets
+    positive = counts[counts > 0]
+    if len(positive) < 2:
+        raise CalibrationError("The export needs tickets on at least two days")
+    log_counts = np.log(positive)
+    mu, sigma = float(log_counts.mean()), float(log_counts.std(ddof=1))
+    params = {
+        # Mean and coefficient of variation of the fitted lognormal (inverse of _lognormal_params)
+        'avg_daily_tickets': round(math.exp(mu + sigma ** 2 / 2), 2),
+        'volatility': round(math.sqrt(math.expm1(sigma ** 2)), 4),
+    }
+    if 'automated' in aggregates.fields:
+        params['automation_rate'] = round(float(aggregates.automated.sum() / counts.sum()), 4)
+    if aggregates.level_tickets.sum() > 0:
+        mix = aggregates.level_tickets / aggregates.level_tickets.sum()
+        params['complexity_mix'] = {level: round(float(share), 4) for level, share in zip(LEVELS, mix)}
+
+    timed = aggregates.level_timed > 0
+    mean_hours = np.divide(aggregates.level_hours, aggregates.level_timed, out=np.zeros(len(LEVELS)), where=timed)
+    handling_hours = {level: round(float(hours), 4) for level, hours, present in zip(LEVELS, mean_hours, timed) if present}
+    if timed.any():
+        default_factors = simulation_defaults()['complexity_factors']
+        reference = int(np.argmax(timed))
+        if mean_hours[reference] <= 0:
+            raise CalibrationError(f"Handling times of {LEVELS[reference]} tickets are all zero")
+        efficiency = default_factors[LEVELS[reference]] / mean_hours[reference]
+        params['agent_efficiency'] = round(float(efficiency), 4)
+        params['complexity_factors'] = {
+            level: round(float(efficiency * hours), 4) if present else default_factors[level]
+            for level, hours, present in zip(LEVELS, mean_hours, timed)
+        }
+
+    first_day = np.datetime64(aggregates.first_day, 'D')
+    return Calibration(
+        params=params,
+        mu=mu,
+        sigma=sigma,
+        start=str(first_day),
+        end=str(first_day + np.timedelta64(len(counts) - 1, 'D')),
+        days=len(counts),
+        empty_days=int((counts == 0).sum()),
+        tickets=int(counts.sum()),
+        skipped_rows=aggregates.skipped_rows,
+        handling_hours=handling_hours,
+    )
+
+
+def file_digest(path, block_bytes=1024 ** 2):
+    """BLAKE2b hash of the file's content, read block by block."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as file:
+        while block := file.read(block_bytes):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def calibrate(path, columns=None, complexity_labels=None, chunk_rows=DEFAULT_CHUNK_ROWS, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Fits ``run_simulation`` parameters to a ticket export, through the cache.
+
+    Parameters:
+    -----------
+    path : str or Path
+        CSV or Parquet export, see the module docstring for its columns
+    columns : dict, optional
+        Export column per field, merged over ``DEFAULT_COLUMNS``
+    complexity_labels : dict, optional
+        Export value -> level of ``LEVELS``
+    chunk_rows : int
+        Rows read per chunk
+    cache_dir : str or Path or None
+        Directory of the cached fits; None always recomputes
+
+    Returns:
+    --------
+    Calibration
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError as error:
+        raise CalibrationError(f"{path}: {error}") from error
+
+    def compute():
+        return fit_parameters(aggregate_export(path, columns, complexity_labels, chunk_rows))
+
+    if cache_dir is None:
+        return compute()
+    # One entry per export and options; chunk_rows does not change the fit
+    options = json.dumps([str(path.resolve()), columns, complexity_labels], sort_keys=True, default=str)
+    entry_path = Path(cache_dir) / f"{hashlib.blake2b(options.encode(), digest_size=16).hexdigest()}.json"
+    try:
+        entry = json.loads(entry_path.read_text())
+    except (OSError, ValueError):
+        entry = None
+    if entry is not None and (entry['size'], entry['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+        return Calibration.from_dict(entry['calibration'])
+    digest = file_digest(path)
+    if entry is not None and entry['digest'] == digest:
+        calibration = Calibration.from_dict(entry['calibration'])
+    else:
+        calibration = compute()
+    entry_path.parent.mkdir(parents=True, exist_ok=True)
+    entry_path.write_text(json.dumps({
+        'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest, 'calibration': calibration.to_dict()
+    }, indent=2))
+    return calibration
+
+
+def _column_option(value):
+    """``field=column`` argument of ``--column``."""
+    name, sep, column = value.partition('=')
+    if not sep or name not in DEFAULT_COLUMNS:
+        raise argparse.ArgumentTypeError(f"expected FIELD=COLUMN with FIELD one of {', '.join(DEFAULT_COLUMNS)}")
+    return name, column
+
+
+def main(argv=None):
+    """Console entry point; returns the exit code."""
+    parser = argparse.ArgumentParser(
+        prog='ticketsim-calibrate', description="Fit simulation parameters to a historical ticket export."
+    )
+    parser.add_argument('export', help="CSV or Parquet export with one row per ticket")
+    parser.add_argument('-o', '--output', help="write a ticketsim scenario file (.json)")
+    parser.add_argument('--name', default='calibrated', help="scenario name (default: calibrated)")
+    parser.add_argument('--column', type=_column_option, action='append', default=[], metavar='FIELD=COLUMN',
+                        help="export column of a field, e.g. created=opened_at (repeatable)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help="rows read per chunk")
+    parser.add_argument('--no-cache', action='store_true', help="ignore and do not write cached fits")
+    args = parser.parse_args(argv)
+
+    try:
+        calibration = calibrate(
+            args.export, dict(args.column), chunk_rows=args.chunk_rows,
+            cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR
+        )
+    except (CalibrationError, ValueError) as error:
+        print(f"ticketsim-calibrate: {error}", file=sys.stderr)
+        return EXIT_INVALID
+
+    print(f"{calibration.tickets:,} tickets on {calibration.days} days ({calibration.start} to {calibration.end}), "
+          f"{calibration.empty_days} days without tickets, {calibration.skipped_rows:,} rows skipped")
+    for name, value in calibration.params.items():
+        print(f"  {name} = {json.dumps(value)}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(calibration.to_scenario_file(args.name), indent=2))
+        print(f"Wrote scenario {args.name!r} to {args.output}")
+    return EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Server-side chart payloads for the pages.
+
+Plotly ships every point of a figure to the browser, and histogram or box
+traces bin the raw values client-side. The helpers here reduce what is
+sent before a figure is built:
+
+- ``downsample`` keeps at most ``MAX_POINTS`` points of line traces with
+  Largest-Triangle-Three-Buckets (LTTB), which preserves peaks and dips;
+  ``scatter`` switches to WebGL (``Scattergl``) above ``WEBGL_POINTS``.
+- ``bar_buckets``, ``histogram``, ``cdf`` and ``box`` summarize bars,
+  distributions and boxes with NumPy, so only bin heights or quartiles are
+  plotted.
+
+Built figures are stored as JSON in ``FIGURE_CACHE``, keyed on a hash of
+the plotted data (``result_hash``). Translated texts are applied after the
+lookup with ``label_figure``, so reruns that only change labels, e.g. the
+language, reuse the cached figure instead of rebuilding it.
+"""
+import hashlib
+import json
+
+import numpy as np
+
+from result_cache import SimulationCache
+
+# Points per line trace after downsampling
+MAX_POINTS = 2000
+
+# Line traces with more points render with WebGL
+WEBGL_POINTS = 1000
+
+# Bars per bar trace and bins per histogram
+MAX_BARS = 400
+MAX_BINS = 80
+
+FIGURE_CACHE = SimulationCache(max_bytes=32 * 1024 ** 2)
+
+
+def _numeric(x):
+    """``x`` as floats; dates become nanoseconds."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb(x, y, n_out):
+    """
+    Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last point are kept; every bucket in between contributes
+    the point spanning the largest triangle with the previously kept point
+    and the average of the next bucket.
+
+    Parameters:
+    -----------
+    x, y : array-like
+        Series to downsample, ``x`` ascending (numbers or dates)
+    n_out : int
+        Number of points to keep, at least 3
+
+    Returns:
+    --------
+    np.ndarray
+        Ascending indices into ``x`` and ``y``
+    """
+    x, y = _numeric(x), np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # Missing values count as 0 for the choice; the point itself is kept as is
+    y = np.nan_to_num(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    means_x = np.add.reduceat(x[1:-1], edges[:-1] - 1) / np.diff(edges)
+    means_y = np.add.reduceat(y[1:-1], edges[:-1] - 1) / np.diff(edges)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        if bucket + 1 < n_out - 2:
+            next_x, next_y = means_x[bucket + 1], means_y[bucket + 1]
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous]) -
+            (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        keep[bucket + 1] = previous
+    return keep
+
+
+def downsample(x, *ys, max_points=MAX_POINTS):
+    """
+    Indices to plot for series ``ys`` that share ``x``.
+
+    LTTB runs per series and the chosen points are merged, so bands and
+    their median keep the same x values; the result may hold up to
+    ``len(ys) * max_points`` points.
+    """
+    if len(x) <= max_points:
+        return np.arange(len(x))
+    return np.unique(np.concatenate([lttb(x, y, max_points) for y in ys]))
+
+
+def scatter(x, y, **kwargs):
+    """``go.Scatter``, or ``go.Scattergl`` above ``WEBGL_POINTS`` points."""
+    # Imported here: plotly is only loaded once a figure is built, not on a cache hit
+    import plotly.graph_objects as go
+
+    trace = go.Scattergl if len(x) > WEBGL_POINTS else go.Scatter
+    return trace(x=np.asarray(x), y=np.asarray(y), **kwargs)
+
+
+def bar_buckets(x, *ys, max_bars=MAX_BARS):
+    """
+    Means of consecutive, equally sized groups of bars (e.g. 4 hours or
+    a week), at most ``max_bars`` groups; the last group may be shorter.
+
+    Returns:
+    --------
+    tuple
+        The first ``x`` of every group and one array of group means per
+        series in ``ys``
+    """
+    x = np.asarray(x)
+    if len(x) <= max_bars:
+        return (x, *(np.asarray(y, dtype=float) for y in ys))
+    starts = np.arange(0, len(x), -(-len(x) // max_bars))
+    sizes = np.diff(np.append(starts, len(x)))
+    return (x[starts], *(np.add.reduceat(np.asarray(y, dtype=float), starts) / sizes for y in ys))
+
+
+def histogram(values, weights=None, max_bins=MAX_BINS):
+    """
+    Bin centers and heights of ``values``; values that already are at most
+    ``max_bins`` distinct bins (e.g. ticket age buckets) are kept as is.
+    """
+    values = np.asarray(values, dtype=float)
+    weights = np.ones_like(values) if weights is None else np.asarray(weights, dtype=float)
+    if len(values) <= max_bins:
+        return values, weights
+    heights, edges = np.histogram(values, bins=max_bins, weights=weights)
+    return (edges[:-1] + edges[1:]) / 2, heights
+
+
+def cdf(values, weights=None):
+    """Sorted ``values`` and the cumulative share of ``weights`` up to each."""
+    values = np.asarray(values, dtype=float)
+    weights = np.ones_like(values) if weights is None else np.asarray(weights, dtype=float)
+    order = np.argsort(values, kind='stable')
+    cumulative = np.cumsum(weights[order])
+    return values[order], cumulative / max(cumulative[-1] if len(cumulative) else 0, 1)
+
+
+def box(values, name, **kwargs):
+    """
+    ``go.Box`` from precomputed quartiles, mean and Tukey fences
+    (the most extreme values within 1.5 IQR), without the raw values.
+    """
+    import plotly.graph_objects as go
+
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return go.Box(x=[name], name=name, **kwargs)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return go.Box(
+        x=[name], name=name, q1=[q1], median=[median], q3=[q3], mean=[values.mean()],
+        lowerfence=[inside.min()], upperfence=[inside.max()], **kwargs
+    )
+
+
+def result_hash(*columns):
+    """Hash of the plotted data, a figure cache key independent of labels."""
+    digest = hashlib.blake2b(digest_size=16)
+    for column in columns:
+        column = np.ascontiguousarray(np.asarray(column))
+        digest.update(f'{column.dtype.str}{column.shape}'.encode())
+        digest.update(column.tobytes() if column.dtype != object else repr(column.tolist()).encode())
+    return digest.hexdigest()
+
+
+def cached_figure(key, build, cache=FIGURE_CACHE):
+    """
+    Figure dict for ``key``, calling ``build()`` (returning a ``go.Figure``
+    without translated texts) on a miss.
+    """
+    def to_json():
+        import plotly.io as pio
+
+        return pio.to_json(build(), validate=False)
+
+    return json.loads(cache.get_or_compute(key, to_json))
+
+
+def line_figure(frame, x, traces, cache=FIGURE_CACHE, **layout):
+    """
+    Cached, downsampled line chart of columns of ``frame``.
+
+    Parameters:
+    -----------
+    frame : pd.DataFrame
+        Data with the ``x`` column and one column per trace
+    x : str
+        Column of the x axis
+    traces : list of tuple
+        ``(column, name, style)`` per trace; ``style`` holds further trace
+        arguments such as ``line`` or ``fill`` and is part of the cache key
+    **layout
+        Layout texts, see ``label_figure``
+
+    Returns:
+    --------
+    dict
+        Figure for ``st.plotly_chart``
+    """
+    columns = [column for column, _, _ in traces]
+
+    def build():
+        import plotly.graph_objects as go
+
+        keep = downsample(frame[x], *(frame[column] for column in columns))
+        xs = frame[x].to_numpy()[keep]
+        return go.Figure([scatter(xs, frame[column].to_numpy()[keep], **style) for column, _, style in traces])
+
+    key = ('line', repr([(column, style) for column, _, style in traces]),
+           result_hash(frame[x], *(frame[column] for column in columns)))
+    return label_figure(cached_figure(key, build, cache), [name for _, name, _ in traces], **layout)
+
+
+def label_figure(figure, names=(), **layout):
+    """
+    Sets trace names and layout texts of a ``cached_figure`` dict.
+
+    Parameters:
+    -----------
+    figure : dict
+        Figure from ``cached_figure``, changed in place
+    names : sequence of str or None
+        Name per trace in order; None keeps the trace's name
+    **layout
+        Layout values by path, e.g. ``title`` or ``xaxis_title``
+
+    Returns:
+    --------
+    dict
+        ``figure``
+    """
+    for trace, name in zip(figure['data'], names):
+        if name is not None:
+            trace['name'] = name
+    for path, value in layout.items():
+        *parents, leaf = path.split('_')
+        node = figure.setdefault('layout', {})
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = value
+    return figure
@@ -0,0 +1,344 @@
+"""
+Headless batch runner: ``ticketsim scenarios.toml -o results/``.
+
+Reads scenario definitions from a TOML or JSON file, simulates them in
+parallel and writes one KPI summary plus a daily series per scenario.
+Only NumPy and pandas are imported, never Streamlit or Plotly, so nightly
+jobs start fast.
+
+Scenario file::
+
+    seed = 42                      # base seed, default 0
+    n_replications = 200           # default for every scenario
+
+    [defaults]                     # run_simulation parameters for every scenario
+    days = 365
+    avg_daily_tickets = 120
+
+    [sla]                          # optional, same meaning as find_minimum_staffing
+    target_wait_hours = 24
+    wait_percentile = 90
+    service_level = 0.95
+
+    [[scenarios]]
+    name = "baseline"
+    full_time_agents = 6
+
+    [[scenarios]]
+    name = "summer"
+    absence_model = { type = "clustered", max_block_days = 14 }
+    queue_policy = "strict"
+    sla = { target_wait_hours = 8 }
+
+    [[scenarios]]
+    name = "hiring"
+    full_time_agents = { type = "steps", points = { 0 = 5, "2025-03-01" = 8 } }
+    automation_rate = { type = "ramp", points = { 0 = 0.1, 180 = 0.3 } }
+
+JSON files use the same structure. A scenario holds ``name``, optionally
+``n_replications``, ``seed`` and ``sla`` (merged over the file-level
+values), and any ``run_simulation`` parameter except ``rng``.
+``absence_model`` and ``queue_policy`` are given by ``type``
+(see ``ABSENCE_MODELS`` and ``QUEUE_POLICIES``), either as a plain string
+or as a table whose other keys are constructor arguments. Parameters that
+may vary by day (see ``schedules.py``) take a list with one value per day
+or a schedule table: ``type`` is ``steps`` or ``ramp`` with ``points``
+keyed by day offset or date, or ``weekly`` or ``monthly`` with ``values``.
+
+Seeds are deterministic: a scenario without its own ``seed`` draws from
+``SeedSequence(seed, spawn_key=(crc32(name),))``. Its results therefore
+depend neither on the worker count nor on the other scenarios in the file.
+
+Exit codes: ``EXIT_OK`` when every SLA is met (or none is set),
+``EXIT_SLA_VIOLATION`` when at least one scenario misses its SLA and
+``EXIT_INVALID`` for unreadable or invalid scenario files.
+"""
+import argparse
+import json
+import os
+import sys
+import tomllib
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from absence import ClusteredAbsences, UniformAbsences
+from queue_policy import FifoPolicy, StrictPriority, WeightedFairShare
+from schedules import TIME_VARYING_PARAMS, Schedule
+from simulation import (
+    SimulationResult,
+    _percentile_label,
+    run_monte_carlo,
+    run_simulation,
+    simulation_defaults,
+)
+from sweep import pool_context
+
+EXIT_OK = 0
+EXIT_SLA_VIOLATION = 1
+EXIT_INVALID = 2
+
+# Scenario file names for the parameters that take objects
+ABSENCE_MODELS = {'uniform': UniformAbsences, 'clustered': ClusteredAbsences}
+QUEUE_POLICIES = {'fifo': FifoPolicy, 'strict': StrictPriority, 'fair': WeightedFairShare}
+SCHEDULES = {'steps': Schedule.steps, 'ramp': Schedule.ramp, 'weekly': Schedule.weekly, 'monthly': Schedule.monthly}
+
+# Levels that complexity_mix and complexity_factors must both cover
+COMPLEXITY_LEVELS = ('Low', 'Medium', 'High')
+
+# SLA of a scenario unless the file says otherwise
+DEFAULT_SLA = {'target_wait_hours': 24, 'wait_percentile': 90, 'service_level': 0.95}
+
+# Percentiles of the per-replication KPIs in the summary
+SUMMARY_PERCENTILES = (5, 50, 95)
+
+
+class ScenarioError(ValueError):
+    """Raised for scenario files that cannot be run."""
+
+
+def load_scenarios(path):
+    """
+    Reads a scenario file into a list of runnable scenarios.
+
+    Parameters:
+    -----------
+    path : str or Path
+        ``.toml`` or ``.json`` file in the format of the module docstring
+
+    Returns:
+    --------
+    list of dict
+        One dict per scenario with ``name``, ``n_replications``, ``seed``
+        (a ``np.random.SeedSequence``), ``sla`` (dict or None) and
+        ``params`` (``run_simulation`` keyword arguments).
+    """
+    path = Path(path)
+    try:
+        if path.suffix.lower() == '.toml':
+            with open(path, 'rb') as file:
+                spec = tomllib.load(file)
+        elif path.suffix.lower() == '.json':
+            with open(path) as file:
+                spec = json.load(file)
+        else:
+            raise ScenarioError(f"{path}: expected a .toml or .json file")
+    except (OSError, tomllib.TOMLDecodeError, json.JSONDecodeError) as error:
+        raise ScenarioError(f"{path}: {error}") from error
+
+    unknown = set(spec) - {'seed', 'n_replications', 'defaults', 'sla', 'scenarios'}
+    if unknown:
+        raise ScenarioError(f"Unknown top-level keys {sorted(unknown)}")
+    if not spec.get('scenarios'):
+        raise ScenarioError("The file defines no [[scenarios]]")
+    if not isinstance(spec['scenarios'], list) or not all(isinstance(entry, dict) for entry in spec['scenarios']):
+        raise ScenarioError("Every entry of scenarios must be a table")
+    for key in ('defaults', 'sla'):
+        if not isinstance(spec.get(key, {}), dict):
+            raise ScenarioError(f"{key} must be a table")
+
+    names = [scenario.get('name') for scenario in spec['scenarios']]
+    if any(not isinstance(name, str) or not name for name in names) or len(set(names)) != len(names):
+        raise ScenarioError("Every scenario needs a unique, non-empty name")
+    if any('/' in name or os.sep in name for name in names):
+        raise ScenarioError("Scenario names become file names and cannot contain path separators")
+
+    base_seed = spec.get('seed', 0)
+    return [
+        _scenario(
+            {**spec.get('defaults', {}), **scenario},
+            spec.get('n_replications', 1),
+            spec.get('sla'),
+            base_seed
+        )
+        for scenario in spec['scenarios']
+    ]
+
+
+def _scenario(entry, n_replications, sla, base_seed):
+    """Validates one merged scenario entry and builds its parameters."""
+    entry = dict(entry)
+    name = entry.pop('name')
+    n_replications = entry.pop('n_replications', n_replications)
+    seed = entry.pop('seed', None)
+    if not isinstance(entry.get('sla', {}), dict):
+        raise ScenarioError(f"Scenario {name!r}: sla must be a table")
+    if 'sla' in entry or sla is not None:
+        sla = {**DEFAULT_SLA, **(sla or {}), **entry.pop('sla', {})}
+
+    defaults = simulation_defaults()
+    unknown = set(entry) - set(defaults) | ({'rng', 'as_frame'} & set(entry))
+    if unknown:
+        raise ScenarioError(f"Scenario {name!r}: unknown or unsupported parameters {sorted(unknown)}")
+    if not isinstance(n_replications, int) or n_replications < 1:
+        raise ScenarioError(f"Scenario {name!r}: n_replications must be a positive integer")
+    if entry.get('resolution', 'day') != 'day':
+        raise ScenarioError(f"Scenario {name!r}: only resolution='day' is supported")
+    if n_replications > 1 and entry.get('engine', 'daily') != 'daily':
+        raise ScenarioError(f"Scenario {name!r}: replications require engine='daily'")
+    for key in ('complexity_mix', 'complexity_factors'):
+        if key in entry and (not isinstance(entry[key], dict) or set(entry[key]) != set(COMPLEXITY_LEVELS)):
+            raise ScenarioError(f"Scenario {name!r}: {key} needs exactly the levels {list(COMPLEXITY_LEVELS)}")
+
+    for key, registry in (('absence_model', ABSENCE_MODELS), ('queue_policy', QUEUE_POLICIES)):
+        if entry.get(key) is not None:
+            entry[key] = _build(name, key, entry[key], registry)
+    for key in TIME_VARYING_PARAMS:
+        if key == 'complexity_mix' and isinstance(entry.get(key), dict):
+            entry[key] = {level: _schedule(name, f"{key}.{level}", share) for level, share in entry[key].items()}
+        elif key in entry:
+            entry[key] = _schedule(name, key, entry[key])
+    if seed is None:
+        seed = np.random.SeedSequence(base_seed, spawn_key=(zlib.crc32(name.encode()),))
+    else:
+        seed = np.random.SeedSequence(seed)
+    return {'name': name, 'n_replications': n_replications, 'seed': seed, 'sla': sla, 'params': entry}
+
+
+def _build(name, key, spec, registry):
+    """Instantiates a ``type`` string or ``{type = ..., **kwargs}`` table from ``registry``."""
+    spec = {'type': spec} if isinstance(spec, str) else dict(spec)
+    kind = spec.pop('type', None)
+    if kind not in registry:
+        raise ScenarioError(f"Scenario {name!r}: {key} type must be one of {sorted(registry)}, got {kind!r}")
+    try:
+        return registry[kind](**spec)
+    except (TypeError, ValueError) as error:
+        raise ScenarioError(f"Scenario {name!r}: invalid {key}: {error}") from error
+
+
+def _schedule(name, key, spec):
+    """A schedule table as a ``Schedule``, a per-day list as an array; other values unchanged."""
+    if isinstance(spec, list):
+        return np.asarray(spec, dtype=float)
+    if not isinstance(spec, dict):
+        return spec
+    spec = dict(spec)
+    kind = spec.pop('type', None)
+    if kind not in SCHEDULES:
+        raise ScenarioError(f"Scenario {name!r}: {key} schedule type must be one of {sorted(SCHEDULES)}, got {kind!r}")
+    field = 'points' if kind in ('steps', 'ramp') else 'values'
+    if set(spec) != {field}:
+        raise ScenarioError(f"Scenario {name!r}: {key} schedule of type {kind!r} takes only {field!r}")
+    values = spec[field]
+    if field == 'points':
+        # TOML and JSON keys are strings; day offsets become ints again
+        values = {int(day) if str(day).isdigit() else day: value for day, value in dict(values).items()}
+    try:
+        return SCHEDULES[kind](values)
+    except (TypeError, ValueError) as error:
+        raise ScenarioError(f"Scenario {name!r}: invalid {key} schedule: {error}") from error
+
+
+def run_scenario(scenario):
+    """
+    Simulates one scenario from ``load_scenarios``.
+
+    Returns:
+    --------
+    tuple
+        (summary, daily): ``summary`` is a dict with the KPI percentiles over
+        replications and the SLA outcome, ``daily`` the ``run_simulation``
+        table for a single replication or the Monte Carlo bands otherwise.
+    """
+    params = {**scenario['params'], 'rng': scenario['seed']}
+    sla = scenario['sla']
+    wait_percentile = sla['wait_percentile'] if sla else 95
+    wait_column = f"{_percentile_label(wait_percentile)} Wait Time (Hours)"
+
+    if scenario['n_replications'] == 1:
+        daily = run_simulation(**params)
+        kpis = SimulationResult.from_frame(daily).kpis()
+        kpis[wait_column] = np.percentile(daily['Est. Wait Time (Hours)'], wait_percentile)
+        kpis = pd.DataFrame([kpis])
+    else:
+        result = run_monte_carlo(
+            scenario['n_replications'], SUMMARY_PERCENTILES, wait_percentiles=(wait_percentile,), **params
+        )
+        daily, kpis = result.bands, result.kpis
+
+    summary = {'Scenario': scenario['name'], 'Replications': scenario['n_replications']}
+    quantiles = kpis.quantile(np.asarray(SUMMARY_PERCENTILES) / 100.0)
+    for column in kpis.columns:
+        for percentile, value in zip(SUMMARY_PERCENTILES, quantiles[column]):
+            summary[f"{column} {_percentile_label(percentile)}"] = value
+    if sla:
+        success_rate = float((kpis[wait_column] <= sla['target_wait_hours']).mean())
+        summary.update({
+            'SLA Target (Hours)': sla['target_wait_hours'],
+            'SLA Wait Percentile': wait_percentile,
+            'SLA Service Level': sla['service_level'],
+            'SLA Success Rate': success_rate,
+            'SLA Met': success_rate >= sla['service_level'],
+        })
+    return summary, daily
+
+
+def run_scenarios(scenarios, max_workers=None):
+    """Runs ``scenarios`` on up to ``max_workers`` processes (all CPUs by default); results in input order."""
+    max_workers = min(max_workers or os.cpu_count() or 1, len(scenarios))
+    if max_workers <= 1:
+        return [run_scenario(scenario) for scenario in scenarios]
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=pool_context()) as executor:
+        return list(executor.map(run_scenario, scenarios))
+
+
+def write_results(results, output_dir, file_format='csv'):
+    """
+    Writes ``kpis.<format>`` with one summary row per scenario and
+    ``daily/<scenario>.<format>`` with each daily series.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The summary table.
+    """
+    output_dir = Path(output_dir)
+    (output_dir / 'daily').mkdir(parents=True, exist_ok=True)
+    summary = pd.DataFrame([row for row, _ in results])
+    tables = [(output_dir / f'kpis.{file_format}', summary)]
+    tables += [(output_dir / 'daily' / f"{row['Scenario']}.{file_format}", daily) for row, daily in results]
+    for path, table in tables:
+        if file_format == 'parquet':
+            table.to_parquet(path, index=False)
+        else:
+            table.to_csv(path, index=False)
+    return summary
+
+
+def main(argv=None):
+    """Console entry point; returns the exit code."""
+    parser = argparse.ArgumentParser(
+        prog='ticketsim', description="Run ticket simulation scenarios without the Streamlit UI."
+    )
+    parser.add_argument('scenario_file', help="TOML or JSON file with [[scenarios]]")
+    parser.add_argument('-o', '--output', default='results', help="output directory (default: results)")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument('--format', choices=('csv', 'parquet'), default='csv', help="output file format")
+    args = parser.parse_args(argv)
+
+    try:
+        scenarios = load_scenarios(args.scenario_file)
+        results = run_scenarios(scenarios, args.workers)
+    except (ScenarioError, TypeError, ValueError) as error:
+        print(f"ticketsim: {error}", file=sys.stderr)
+        return EXIT_INVALID
+    summary = write_results(results, args.output, args.format)
+
+    violations = 0
+    for row, _ in results:
+        status = ''
+        if 'SLA Met' in row:
+            status = 'SLA met' if row['SLA Met'] else 'SLA VIOLATED'
+            violations += not row['SLA Met']
+        print(f"{row['Scenario']}: avg wait {row['Avg Wait Time (Hours) P50']:.1f} h, "
+              f"max backlog {row['Max Backlog P50']:.0f}  {status}".rstrip())
+    print(f"Wrote {len(summary)} scenarios to {args.output}")
+    return EXIT_SLA_VIOLATION if violations else EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+Ticket ages from first-in, first-out daily cohorts.
+
+``Est. Wait Time`` is a forward estimate (backlog / capacity). Here the
+backlog is tracked as cohorts instead: the tickets that arrived on each day
+and are still open. Every day's solved tickets are taken from the oldest
+cohorts first, so each solved ticket has a known age in days.
+
+Cohorts are read off the cumulative arrival and departure curves, one age
+at a time over all days, replications and queue classes at once: on day
+``t`` the cohort of day ``t - age`` loses the overlap of its arrival
+interval with the day's departure interval. Ages up to ``AGE_BUFFER_DAYS``
+are tracked individually; older tickets share one overflow bucket. The loop
+stops at the oldest age still open anywhere, so a run is at most
+O(days x buffer) array work regardless of the ticket count, and usually a
+few passes.
+"""
+import numpy as np
+
+from simulation import (
+    EVENT_EXCLUDED_PARAMS,
+    REACTION_TIME_HOURS,
+    _avg_complexity_factor,
+    _percentile_label,
+    _processing_hours,
+    _require_constant,
+    _run_stages,
+    simulation_defaults,
+)
+
+# Ages tracked individually; older tickets share the last age bucket
+AGE_BUFFER_DAYS = 90
+
+# Percentiles reported for ticket ages
+AGE_PERCENTILES = (50, 90, 99)
+
+
+def track_cohorts(inbound, solved, buffer_days=AGE_BUFFER_DAYS):
+    """
+    Ages of solved and open tickets under first-in, first-out service.
+
+    Within a day, arrivals and departures are spread evenly, so the tickets
+    a cohort hands to a day's departures have a mean age that need not be
+    a whole number of days.
+
+    Parameters:
+    -----------
+    inbound : np.ndarray
+        Tickets arriving per day, shape (..., days)
+    solved : np.ndarray
+        Tickets solved per day, same shape; never more than the queue holds
+    buffer_days : int
+        Ages tracked individually; ``buffer_days`` and older share one bucket
+
+    Returns:
+    --------
+    dict of np.ndarray
+        Shape (..., min(buffer_days, days) + 1); bucket ``k`` holds tickets
+        that crossed ``k`` day boundaries, the last bucket all older ones.
+        ``solved_by_age`` and ``open_by_age`` count tickets solved over the
+        run and still open at the horizon; ``age_days`` is the mean age of
+        both in days (open tickets up to the horizon).
+    """
+    days = inbound.shape[-1]
+    n_ages = min(buffer_days, days)
+    shape = inbound.shape[:-1] + (n_ages + 1,)
+    if days == 0:
+        # No days, no tickets: one empty overflow bucket
+        return {key: np.zeros(shape) for key in ('solved_by_age', 'open_by_age', 'age_days')}
+    # Rows as a 2D batch; rows whose cohorts have all been served drop out of
+    # later ages, so one congested replication does not keep the others looping
+    inbound = inbound.reshape(-1, days)
+    solved = solved.reshape(-1, days)
+    arrived = np.cumsum(inbound, axis=-1)
+    departed = np.cumsum(solved, axis=-1)
+    arrived_before = arrived - inbound
+    departed_before = departed - solved
+    tolerance = 1e-9 * np.maximum(arrived[..., -1:], 1.0)
+    total_arrived, total_departed, row_tolerance = arrived[:, -1], departed[:, -1], tolerance
+
+    solved_by_age = np.zeros((len(inbound), n_ages + 1))
+    open_by_age = np.zeros_like(solved_by_age)
+    age_sum = np.zeros_like(solved_by_age)
+    rows = slice(None)
+    for age in range(n_ages):
+        # Cohort of day t - age against the departures of day t, for t >= age
+        cohort_start, cohort_end = arrived_before[..., :days - age], arrived[..., :days - age]
+        low = np.maximum(departed_before[..., age:], cohort_start)
+        high = np.minimum(departed[..., age:], cohort_end)
+        served = np.maximum(high - low, 0.0)
+        solved_by_age[rows, age] = served.sum(axis=-1)
+
+        # Mean age of the served slice: departure minus arrival time of its midpoint
+        middle = (low + high) / 2
+        departure = np.divide(middle - departed_before[..., age:], solved[..., age:],
+                              out=np.zeros_like(middle), where=served > 0)
+        arrival = np.divide(middle - cohort_start, inbound[..., :days - age],
+                            out=np.zeros_like(middle), where=served > 0)
+        age_sum[rows, age] = (served * (age + departure - arrival)).sum(axis=-1)
+
+        # Cohort of day days - 1 - age at the horizon, aged up to the end of the last day
+        day = days - 1 - age
+        low = np.maximum(departed[..., -1], arrived_before[..., day])
+        still_open = np.maximum(arrived[..., day] - low, 0.0)
+        open_by_age[rows, age] = still_open
+        arrival = np.divide((arrived[..., day] + low) / 2 - arrived_before[..., day], inbound[..., day],
+                            out=np.zeros_like(still_open), where=still_open > 0)
+        age_sum[rows, age] += still_open * (age + 1 - arrival)
+
+        # Cohorts fully served before the day they would turn one day older
+        # leave nothing for the next age
+        alive = (cohort_end > departed_before[..., age:] + tolerance).any(axis=-1)
+        if not alive.any():
+            break
+        if alive.sum() < len(alive) // 2:
+            rows = np.flatnonzero(alive) if isinstance(rows, slice) else rows[alive]
+            inbound, solved, arrived, departed = inbound[alive], solved[alive], arrived[alive], departed[alive]
+            arrived_before, departed_before, tolerance = arrived_before[alive], departed_before[alive], tolerance[alive]
+
+    # Overflow bucket: whatever the tracked ages do not cover, counted at the buffer age
+    solved_by_age[..., n_ages] = total_departed - solved_by_age.sum(axis=-1)
+    open_by_age[..., n_ages] = total_arrived - total_departed - open_by_age.sum(axis=-1)
+    # Drop float noise left over from the cumulative sums
+    solved_by_age[solved_by_age <= row_tolerance] = 0.0
+    open_by_age[open_by_age <= row_tolerance] = 0.0
+    age_sum[..., n_ages] = (solved_by_age[..., n_ages] + open_by_age[..., n_ages]) * n_ages
+
+    tickets = solved_by_age + open_by_age
+    age_days = np.divide(
+        age_sum, tickets, out=np.broadcast_to(np.arange(n_ages + 1.0), tickets.shape).copy(), where=tickets > 0
+    )
+    return {
+        'solved_by_age': solved_by_age.reshape(shape),
+        'open_by_age': open_by_age.reshape(shape),
+        'age_days': age_days.reshape(shape),
+    }
+
+
+def age_hours(age_days, avg_complexity_factor, agent_efficiency):
+    """
+    Wait in hours of tickets aged ``age_days``: time in the queue plus
+    processing and reaction time, as in ``Est. Wait Time``.
+    """
+    processing_time_hours = _processing_hours(avg_complexity_factor, agent_efficiency)
+    return age_days * 24.0 + processing_time_hours + REACTION_TIME_HOURS
+
+
+def age_percentiles(values, counts, percentiles):
+    """
+    Percentiles of a ticket histogram.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        Mean value of each bucket, shape (..., buckets) or (buckets,)
+    counts : np.ndarray
+        Tickets per bucket, shape (..., buckets)
+    percentiles : sequence of float
+        Percentiles in 0-100
+
+    Returns:
+    --------
+    np.ndarray
+        Value of the bucket holding each percentile, shape
+        (len(percentiles), ...); NaN where there are no tickets.
+    """
+    cumulative = np.cumsum(counts, axis=-1)
+    total = cumulative[..., -1:]
+    values = np.broadcast_to(values, np.shape(counts))
+    result = []
+    for percentile in percentiles:
+        bucket = np.argmax(cumulative >= total * (percentile / 100.0) - 1e-9 * total, axis=-1)
+        value = np.take_along_axis(values, bucket[..., None], axis=-1)[..., 0]
+        result.append(np.where(total[..., 0] > 0, value, np.nan))
+    return np.array(result)
+
+
+def age_frame(solved_by_age, open_by_age, wait_hours):
+    """One row per age bucket: wait in hours and tickets solved at / still open with that age."""
+    import pandas as pd
+
+    return pd.DataFrame({
+        'Age (Days)': np.arange(len(wait_hours)),
+        'Wait Time (Hours)': wait_hours,
+        'Solved': solved_by_age,
+        'Open': open_by_age,
+    })
+
+
+def ticket_age_distribution(**params):
+    """
+    Distribution of real ticket ages for one simulation run.
+
+    Parameters:
+    -----------
+    **params
+        Any keyword argument accepted by ``run_simulation``, with
+        ``resolution='day'``. The daily engine reads its cohorts directly, the
+        hourly engine from its daily roll-up; the event engine buckets the
+        waits of its individual tickets by whole days.
+
+    Returns:
+    --------
+    pd.DataFrame
+        ``age_frame`` with ``min(AGE_BUFFER_DAYS, days) + 1`` rows; the last
+        row holds all older tickets. Open tickets count with their age at
+        the horizon.
+    """
+    defaults = simulation_defaults()
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise TypeError(f"ticket_age_distribution() got unexpected parameters: {sorted(unknown)}")
+    p = {**defaults, **params}
+    if p['resolution'] != 'day':
+        raise ValueError("ticket_age_distribution() buckets ages by day, resolution must be 'day'")
+    if p['engine'] != 'daily':
+        _require_constant(p, f"engine={p['engine']!r}")
+
+    # Imported here: the other engines are only loaded when used
+    if p['engine'] == 'event':
+        from event_engine import simulate_tickets
+
+        log = simulate_tickets(**{name: value for name, value in p.items() if name not in EVENT_EXCLUDED_PARAMS})
+        return _event_age_frame(log)
+    if p['engine'] == 'hourly':
+        from intraday import HOURS, simulate_hours
+
+        hours = simulate_hours(p)
+        days = len(hours['dates'])
+        ages = track_cohorts(
+            hours['actual_inbound'].reshape(days, HOURS).sum(axis=1),
+            hours['solved'].reshape(days, HOURS).sum(axis=1)
+        )
+        wait_hours = age_hours(
+            ages['age_days'], _avg_complexity_factor(p['complexity_mix'], p['complexity_factors']),
+            p['agent_efficiency']
+        )
+        return age_frame(ages['solved_by_age'], ages['open_by_age'], wait_hours)
+    if p['engine'] != 'daily':
+        raise ValueError(f"Unknown engine {p['engine']!r}, expected 'daily', 'event' or 'hourly'")
+    paths = _run_stages(None, p, ages=True)
+    return age_frame(paths['solved_by_age'], paths['open_by_age'], paths['age_hours'])
+
+
+def _event_age_frame(log, buffer_days=AGE_BUFFER_DAYS):
+    """Buckets the real waits of a ``TicketLog`` by whole days; each row holds the mean wait of its bucket."""
+    n_ages = min(buffer_days, log.days)
+    wait_hours = log.wait_hours
+    bucket = np.minimum((wait_hours // 24).astype(np.int64), n_ages)
+    is_open = ~np.isfinite(log.resolved)
+    counts = {
+        key: np.bincount(bucket[mask], minlength=n_ages + 1).astype(float)
+        for key, mask in (('solved', ~is_open), ('open', is_open))
+    }
+    tickets = counts['solved'] + counts['open']
+    mean_wait = np.divide(
+        np.bincount(bucket, weights=wait_hours, minlength=n_ages + 1), tickets,
+        out=np.arange(n_ages + 1) * 24.0, where=tickets > 0
+    )
+    return age_frame(counts['solved'], counts['open'], mean_wait)
+
+
+def age_summary(distribution, sla_hours=24):
+    """
+    Headline numbers of an ``age_frame``.
+
+    Returns:
+    --------
+    dict
+        ``P50``/``P90``/``P99`` ticket age in hours over solved and open
+        tickets, ``sla_breaches``: solved tickets that waited longer than
+        ``sla_hours``, and ``open_over_sla``: open tickets already older.
+    """
+    values = distribution['Wait Time (Hours)'].to_numpy()
+    counts = (distribution['Solved'] + distribution['Open']).to_numpy()
+    summary = {
+        _percentile_label(percentile): float(value)
+        for percentile, value in zip(AGE_PERCENTILES, age_percentiles(values, counts, AGE_PERCENTILES))
+    }
+    over_sla = distribution['Wait Time (Hours)'] > sla_hours
+    summary['sla_breaches'] = float(distribution.loc[over_sla, 'Solved'].sum())
+    summary['open_over_sla'] = float(distribution.loc[over_sla, 'Open'].sum())
+    return summary
@@ -0,0 +1,225 @@
+"""
+Paired comparison of N staffing scenarios in one batched run.
+
+``run_comparison`` simulates every scenario over the same Monte Carlo
+replications with common random numbers: the draws are generated once and
+each scenario maps them onto its own team. Capacity, queue and metrics then
+run as a single (scenarios x replications, days) array pass, with the
+per-scenario efficiency, part-time hours and automation rate as one value
+per row (one value per day and row for a parameter that varies by day).
+Replication r of every scenario sees the same inbound noise and
+absence uniforms, so KPIs are paired across scenarios and the differences to
+a baseline scenario come with confidence intervals over replications.
+"""
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from absence import UniformAbsences
+from cohorts import age_frame
+from profiling import section
+from random_streams import CommonRandomNumbers
+from schedules import resolve_params
+from simulation import (
+    AGES_STAGE,
+    HOURS_PER_DAY,
+    SIMULATION_STAGES,
+    _agent_rows,
+    _draw_stage,
+    _monte_carlo_params,
+    _monte_carlo_result,
+    _timed_stage,
+)
+
+# Parameters a scenario may set; all others are shared. Draw parameters are
+# applied per scenario, ROW_PARAMS vary per row of the batched arrays.
+ROW_PARAMS = ('agent_efficiency', 'part_time_hours', 'automation_rate')
+SCENARIO_PARAMS = tuple(name for name in SIMULATION_STAGES[0][2] if name not in ('days', 'rng')) + ROW_PARAMS
+
+# KPIs with paired differences, in report order
+COMPARISON_KPIS = (
+    'Avg Wait Time (Hours)', 'P95 Wait Time (Hours)', 'P90 Ticket Age (Hours)', 'Max Backlog',
+    'Clearance Rate (%)', 'Staff Hours',
+)
+
+
+@dataclass(frozen=True)
+class ScenarioComparison:
+    """
+    Outcome of ``run_comparison``.
+
+    Attributes:
+    -----------
+    results : dict of str to MonteCarloResult
+        Daily bands and per-replication KPIs (including ``Staff Hours``) per
+        scenario, in input order. Row r of every ``kpis`` table is the same
+        replication.
+    differences : pd.DataFrame
+        One row per scenario and entry of ``COMPARISON_KPIS``: ``Scenario``,
+        ``KPI``, ``Mean``, the mean paired ``Difference`` to the baseline,
+        its confidence interval ``CI Low`` / ``CI High`` and ``Significant``
+        (the interval excludes 0). The baseline's own rows have difference 0.
+    ages : dict of str to pd.DataFrame
+        Ticket age distribution (``age_frame``) per scenario, pooled over
+        all replications
+    baseline : str
+        Scenario the differences refer to
+    confidence : float
+        Confidence level of the intervals
+    """
+    results: dict
+    differences: 'pd.DataFrame'
+    ages: dict
+    baseline: str
+    confidence: float
+
+    @property
+    def scenarios(self):
+        return list(self.results)
+
+    def kpi_summary(self, percentile=50):
+        """One row per scenario with the ``percentile`` of each KPI across replications."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {name: result.kpis.quantile(percentile / 100.0) for name, result in self.results.items()}
+        ).T
+
+
+def run_comparison(scenarios, n_replications=500, seed=None, baseline=None, confidence=0.95,
+                   percentiles=(5, 50, 95), **shared):
+    """
+    Simulates N scenarios in one batched, paired Monte Carlo run.
+
+    Parameters:
+    -----------
+    scenarios : dict of str to dict
+        Scenario name -> parameters that differ from ``shared``; only
+        ``SCENARIO_PARAMS`` may differ
+    n_replications : int
+        Replications per scenario, at least 2
+    seed : int or np.random.SeedSequence, optional
+        Seed of the common random numbers; fresh entropy if omitted
+    baseline : str, optional
+        Scenario the differences refer to; the first one by default
+    confidence : float
+        Confidence level of the paired intervals (normal approximation)
+    percentiles : tuple of float
+        Percentiles of the daily bands, as in ``run_monte_carlo``
+    **shared
+        ``run_simulation`` parameters of all scenarios (except ``rng``)
+
+    Returns:
+    --------
+    ScenarioComparison
+    """
+    import pandas as pd
+
+    if 'rng' in shared:
+        raise TypeError("run_comparison() draws its own common random numbers, pass seed instead of rng")
+    names = list(scenarios)
+    if not names:
+        raise ValueError("run_comparison() needs at least one scenario")
+    if n_replications < 2:
+        raise ValueError("Paired confidence intervals need n_replications >= 2")
+    baseline = names[0] if baseline is None else baseline
+    if baseline not in scenarios:
+        raise ValueError(f"Unknown baseline scenario {baseline!r}")
+
+    p = resolve_params(_monte_carlo_params('run_comparison', shared))
+    if p['queue_policy'] is not None or p['priority_mix'] is not None:
+        raise ValueError("run_comparison() does not support queue_policy or priority_mix")
+    if p['resolution'] != 'day':
+        raise ValueError("run_comparison() requires resolution='day'")
+    scenario_params = []
+    for name in names:
+        fixed = set(scenarios[name]) - set(SCENARIO_PARAMS)
+        if fixed:
+            raise ValueError(f"Scenario {name!r} cannot set shared parameters {sorted(fixed)}")
+        scenario_params.append(resolve_params({**p, **scenarios[name]}))
+
+    # One set of draws, large enough for the biggest team
+    crn = CommonRandomNumbers(p['days'], n_replications, seed)
+    crn.reserve(max(
+        (q['absence_model'] or UniformAbsences()).n_draws(sum(_agent_rows(q)), q['days'], q['vacation_rate'])
+        for q in scenario_params
+    ))
+
+    # Draws per scenario (each maps the shared draws onto its own team), stacked
+    # scenario-major into (scenarios x replications, days)
+    with section('stage: draws'):
+        draws = [_draw_stage({}, {**q, 'rng': crn}, n_replications) for q in scenario_params]
+    paths = {key: np.concatenate([draw[key] for draw in draws]) for key in draws[0]}
+    rows = {name: _row_values([q[name] for q in scenario_params], n_replications, p['days']) for name in ROW_PARAMS}
+    batch = {**p, **rows}
+    for name, stage, _ in SIMULATION_STAGES[1:] + (AGES_STAGE,):
+        paths = {**paths, **_timed_stage(name, stage, paths, batch, len(names) * n_replications)}
+
+    staff_hours = (
+        paths['ft_agents_available'].sum(axis=-1) * HOURS_PER_DAY +
+        (paths['pt_agents_available'] * rows['part_time_hours']).sum(axis=-1)
+    )
+    results, ages = {}, {}
+    for i, name in enumerate(names):
+        scenario_rows = slice(i * n_replications, (i + 1) * n_replications)
+        scenario_paths = {
+            key: value[scenario_rows] if np.ndim(value) > 1 and len(value) == len(staff_hours) else value
+            for key, value in paths.items()
+        }
+        results[name] = _monte_carlo_result(scenario_paths, percentiles, p['start_date'])
+        results[name].kpis['Staff Hours'] = staff_hours[scenario_rows]
+        ages[name] = _pooled_ages(scenario_paths)
+
+    return ScenarioComparison(
+        results=results,
+        differences=pd.DataFrame(_paired_differences(results, baseline, confidence)),
+        ages=ages,
+        baseline=baseline,
+        confidence=confidence,
+    )
+
+
+def _row_values(values, n_replications, days):
+    """
+    One scenario parameter per row of the batch: shape (rows, 1), or
+    (rows, days) if any scenario's value varies by day.
+    """
+    if all(np.ndim(value) == 0 for value in values):
+        return np.repeat([float(value) for value in values], n_replications)[:, None]
+    return np.repeat([np.broadcast_to(np.asarray(value, dtype=float), (days,)) for value in values], n_replications, axis=0)
+
+
+def _paired_differences(results, baseline, confidence):
+    """Mean differences per replication to ``baseline`` with normal confidence intervals."""
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rows = []
+    for name, result in results.items():
+        for kpi in COMPARISON_KPIS:
+            values = result.kpis[kpi].to_numpy(dtype=float)
+            differences = values - results[baseline].kpis[kpi].to_numpy(dtype=float)
+            # Replications without inbound have no clearance rate
+            differences = differences[np.isfinite(differences)]
+            mean = differences.mean() if len(differences) else np.nan
+            half_width = z * differences.std(ddof=1) / np.sqrt(len(differences)) if len(differences) > 1 else np.nan
+            rows.append({
+                'Scenario': name,
+                'KPI': kpi,
+                'Mean': np.nanmean(values),
+                'Difference': mean,
+                'CI Low': mean - half_width,
+                'CI High': mean + half_width,
+                'Significant': bool(mean - half_width > 0 or mean + half_width < 0),
+            })
+    return rows
+
+
+def _pooled_ages(paths):
+    """``age_frame`` over all replications; each bucket's wait is weighted by its tickets."""
+    tickets = paths['solved_by_age'] + paths['open_by_age']
+    total = tickets.sum(axis=0)
+    wait_hours = np.divide(
+        (paths['age_hours'] * tickets).sum(axis=0), total,
+        out=paths['age_hours'].mean(axis=0), where=total > 0
+    )
+    return age_frame(paths['solved_by_age'].sum(axis=0), paths['open_by_age'].sum(axis=0), wait_hours)
@@ -0,0 +1,304 @@
+"""
+Ticket-level discrete-event engine (``run_simulation(engine="event")``).
+
+The daily model treats capacity as a fluid: agents solve fractional
+tickets at the average complexity, in FIFO order over the whole day. This
+engine instead draws individual tickets, each with its own arrival time and
+complexity, and hands them to individual agents:
+
+- Time is measured in calendar hours from the start of the first day.
+  Tickets arrive uniformly within the operating hours of their day and
+  become workable after ``REACTION_TIME_HOURS``.
+- Full-time agents work the first ``HOURS_PER_DAY`` hours of each day,
+  part-time agents the first ``part_time_hours``; absent days are skipped.
+  A ticket that does not fit into the rest of a shift is continued in the
+  agent's next shift.
+- Tickets are served first come, first served by the agent who can start
+  earliest. Agents sit in a heap keyed by the next time they can work.
+- Work stops at the end of the horizon; tickets still open then stay in
+  the backlog.
+
+Tickets live in flat NumPy arrays (``TicketLog``), not Python objects, so a
+million tickets take a few seconds.
+"""
+import heapq
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from absence import AbsenceSchedule, UniformAbsences
+from random_streams import ticket_uniforms
+from simulation import (
+    EVENT_EXCLUDED_PARAMS,
+    HOURS_PER_DAY,
+    REACTION_TIME_HOURS,
+    _avg_complexity_factor,
+    _draw_inbound,
+    _resolve_run_rng,
+    _round,
+    _simulation_dates,
+    simulation_defaults,
+)
+
+HOURS_PER_CALENDAR_DAY = 24
+
+# Deflection, arrival time within the day and complexity level
+UNIFORMS_PER_TICKET = 3
+
+
+@dataclass
+class TicketLog:
+    """
+    Every ticket of an event-engine run, sorted by arrival.
+
+    Attributes:
+    -----------
+    arrival : np.ndarray
+        Arrival time in hours since the start of the first day (float64)
+    resolved : np.ndarray
+        Resolution time in hours; ``inf`` if still open at the horizon
+    complexity : np.ndarray
+        Index into ``levels`` (int8)
+    agent : np.ndarray
+        Agent that solved the ticket, -1 if still open (int32). Full-time
+        agents come first, then part-time agents.
+    levels : tuple
+        Complexity level names, e.g. ('Low', 'Medium', 'High')
+    days : int
+        Simulated days
+    daily : dict of np.ndarray
+        Per-day inputs: ``raw_inbound`` tickets before deflection,
+        ``ft_agents_available``, ``pt_agents_available`` and nominal
+        ``daily_capacity_tickets``
+    """
+    arrival: np.ndarray
+    resolved: np.ndarray
+    complexity: np.ndarray
+    agent: np.ndarray
+    levels: tuple
+    days: int
+    daily: dict
+
+    @property
+    def wait_hours(self):
+        """Arrival-to-resolution time per ticket; open tickets count up to the horizon."""
+        return np.minimum(self.resolved, self.days * HOURS_PER_CALENDAR_DAY) - self.arrival
+
+    def daily_frame(self, start_date=None):
+        """Rolls tickets up into the ``run_simulation`` column schema."""
+        days = self.days
+        arrival_day = (self.arrival // HOURS_PER_CALENDAR_DAY).astype(np.int64)
+        net_inbound = np.bincount(arrival_day, minlength=days)
+        is_solved = self.resolved < days * HOURS_PER_CALENDAR_DAY
+        solved = np.bincount(
+            (self.resolved[is_solved] // HOURS_PER_CALENDAR_DAY).astype(np.int64), minlength=days
+        )
+        backlog = np.cumsum(net_inbound) - np.cumsum(solved)
+
+        # Mean wait of the tickets arriving each day
+        wait_sum = np.bincount(arrival_day, weights=self.wait_hours, minlength=days)
+        wait_hours = np.divide(wait_sum, net_inbound, out=np.zeros(days), where=net_inbound > 0)
+
+        return pd.DataFrame({
+            'Date': _simulation_dates(days, start_date),
+            'Inbound (Raw)': self.daily['raw_inbound'],
+            'Inbound (Net)': net_inbound.astype(np.int64),
+            'Capacity (Tickets)': np.rint(self.daily['daily_capacity_tickets']).astype(np.int64),
+            'Solved': solved.astype(np.int64),
+            'Backlog (End of Day)': backlog.astype(np.int64),
+            'Est. Wait Time (Days)': _round(wait_hours / HOURS_PER_CALENDAR_DAY, 3),
+            'Est. Wait Time (Hours)': _round(wait_hours, 2),
+            'Staff Available (FT)': self.daily['ft_agents_available'].astype(np.int64),
+            'Staff Available (PT)': self.daily['pt_agents_available'].astype(np.int64)
+        }, copy=False)
+
+
+def _next_present_days(present):
+    """
+    For every agent and day, the first day on or after it the agent is present.
+
+    Has one extra column; ``days`` stands for "never again".
+    """
+    n_agents, days = present.shape
+    day_index = np.where(present, np.arange(days), days)
+    next_present = np.minimum.accumulate(day_index[:, ::-1], axis=1)[:, ::-1]
+    return np.hstack([next_present, np.full((n_agents, 1), days)])
+
+
+def _serve_tickets(ready, duration, shift_hours, next_present, days):
+    """
+    First come, first served over individual agents with shifts and absences.
+
+    Parameters:
+    -----------
+    ready : list of float
+        Time each ticket becomes workable, ascending
+    duration : list of float
+        Working hours each ticket needs
+    shift_hours : list of float
+        Daily shift length per agent, starting at the beginning of the day
+    next_present : list of list of int
+        ``_next_present_days`` per agent
+    days : int
+        Horizon; agents do not work after it
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (resolved, agent) per ticket; ``inf`` and -1 for open tickets.
+    """
+    n_tickets = len(ready)
+    resolved = np.full(n_tickets, np.inf)
+    assigned = np.full(n_tickets, -1, dtype=np.int32)
+    if n_tickets == 0:
+        return resolved, assigned
+
+    inf = float('inf')
+    day_hours = HOURS_PER_CALENDAR_DAY
+
+    def next_work_time(agent, t):
+        # Earliest time >= t at which the agent is on shift
+        day = int(t // day_hours)
+        if day >= days:
+            return inf
+        present_from = next_present[agent]
+        if present_from[day] == day and t - day * day_hours < shift_hours[agent]:
+            return t
+        day = present_from[day + 1]
+        return day * day_hours if day < days else inf
+
+    # Heap of (next time the agent can work, agent)
+    heap = [(next_work_time(agent, 0.0), agent) for agent in range(len(shift_hours)) if shift_hours[agent] > 0]
+    if not heap:
+        return resolved, assigned
+    heapq.heapify(heap)
+    resolved_out = resolved.tolist()
+    assigned_out = assigned.tolist()
+
+    for i in range(n_tickets):
+        t_ready = ready[i]
+        # Agent who can start earliest; idle agents that are off shift at
+        # t_ready are re-keyed to their next shift first
+        while True:
+            free_at, agent = heap[0]
+            if free_at >= t_ready:
+                start = free_at
+                break
+            start = next_work_time(agent, t_ready)
+            if start == t_ready:
+                break
+            heapq.heapreplace(heap, (start, agent))
+        if start == inf:
+            # Nobody can work on this or any later ticket within the horizon
+            break
+
+        # Work through shifts until the ticket is done
+        remaining = duration[i]
+        t = start
+        while True:
+            shift_end = (t // day_hours) * day_hours + shift_hours[agent]
+            if remaining <= shift_end - t:
+                t += remaining
+                break
+            remaining -= shift_end - t
+            t = next_work_time(agent, shift_end)
+            if t == inf:
+                break
+
+        if t != inf:
+            resolved_out[i] = t
+            assigned_out[i] = agent
+        heapq.heapreplace(heap, (next_work_time(agent, t) if t != inf else inf, agent))
+
+    return np.array(resolved_out), np.array(assigned_out, dtype=np.int32)
+
+
+def simulate_tickets(**params):
+    """
+    Simulates individual tickets with the discrete-event engine.
+
+    Parameters:
+    -----------
+    **params
+        Any keyword argument accepted by ``run_simulation`` except
+        ``engine`` and the multi-class queue options; omitted ones use the
+        same defaults.
+
+    Returns:
+    --------
+    TicketLog
+        Per-ticket arrival, resolution, complexity and agent.
+    """
+    defaults = simulation_defaults()
+    unknown = set(params) - set(defaults) | (set(EVENT_EXCLUDED_PARAMS) & set(params))
+    if unknown:
+        raise TypeError(f"simulate_tickets() got unexpected parameters: {sorted(unknown)}")
+    p = {**defaults, **params}
+    days = p['days']
+    full_time_agents, part_time_agents = p['full_time_agents'], p['part_time_agents']
+    rng = _resolve_run_rng(p['rng'], days, 1)
+
+    # Same draw order as the daily model: absences, then daily inbound
+    total_agents = full_time_agents + part_time_agents
+    absence_model = p['absence_model'] or UniformAbsences()
+    absent = AbsenceSchedule.from_keys(
+        absence_model.draw_keys(total_agents, days, p['vacation_rate'], rng=rng), total_agents, days
+    ).to_dense()
+    raw_inbound = np.rint(_draw_inbound(days, p['avg_daily_tickets'], p['volatility'], rng=rng)).astype(np.int64)
+
+    # Individual tickets: deflection, arrival within operating hours, complexity
+    uniforms = ticket_uniforms(rng, int(raw_inbound.sum()), UNIFORMS_PER_TICKET)
+    ticket_day = np.repeat(np.arange(days), raw_inbound)
+    kept = uniforms[:, 0] >= p['automation_rate']
+    arrival = ticket_day[kept] * HOURS_PER_CALENDAR_DAY + uniforms[kept, 1] * HOURS_PER_DAY
+
+    levels = tuple(p['complexity_mix'])
+    shares = np.array([p['complexity_mix'][level] for level in levels], dtype=float)
+    cumulative = np.cumsum(shares)
+    complexity = np.minimum(
+        np.searchsorted(cumulative, uniforms[kept, 2] * cumulative[-1], side='right'), len(levels) - 1
+    ).astype(np.int8)
+
+    order = np.argsort(arrival, kind='stable')
+    arrival, complexity = arrival[order], complexity[order]
+
+    factors = np.array([p['complexity_factors'][level] for level in levels], dtype=float)
+    if p['agent_efficiency'] > 0:
+        duration = factors[complexity] / p['agent_efficiency']
+    else:
+        duration = np.full(len(arrival), np.inf)
+
+    shift_hours = [float(HOURS_PER_DAY)] * full_time_agents + [float(p['part_time_hours'])] * part_time_agents
+    resolved, agent = _serve_tickets(
+        (arrival + REACTION_TIME_HOURS).tolist(),
+        duration.tolist(),
+        shift_hours,
+        _next_present_days(~absent).tolist(),
+        days
+    )
+
+    # Nominal capacity as in the daily model, for the Pulse chart
+    ft_available = full_time_agents - absent[:full_time_agents].sum(axis=0)
+    pt_available = part_time_agents - absent[full_time_agents:].sum(axis=0)
+    avg_complexity_factor = _avg_complexity_factor(p['complexity_mix'], p['complexity_factors'])
+    total_hours = ft_available * HOURS_PER_DAY + pt_available * p['part_time_hours']
+    if avg_complexity_factor > 0:
+        capacity = total_hours * p['agent_efficiency'] / avg_complexity_factor
+    else:
+        capacity = np.zeros(days)
+
+    return TicketLog(
+        arrival=arrival,
+        resolved=resolved,
+        complexity=complexity,
+        agent=agent,
+        levels=levels,
+        days=days,
+        daily={
+            'raw_inbound': raw_inbound,
+            'ft_agents_available': ft_available,
+            'pt_agents_available': pt_available,
+            'daily_capacity_tickets': capacity,
+        }
+    )
@@ -0,0 +1,186 @@
+"""
+Hourly intraday mode (``run_simulation(engine="hourly")``).
+
+The daily model lumps all operating hours into one bucket. Here each day is
+split into 24 hourly buckets:
+
+- ``arrival_curve`` spreads each day's inbound over the hours, optionally
+  per weekday, e.g. a Monday-morning surge
+- ``shift_coverage`` gives the share of present FT and PT agents working
+  in each hour, e.g. a lunch-hour gap
+
+Inbound and absences are drawn exactly as in the daily model. Capacity,
+the backlog recursion and FIFO wait times then run as array operations
+over the flattened (days x 24) series, and the results roll up into the
+daily columns. ``resolution="hour"`` returns the hourly series instead.
+"""
+import numpy as np
+import pandas as pd
+
+from simulation import (
+    REACTION_TIME_HOURS,
+    _avg_complexity_factor,
+    _draw_stage,
+    _process_queue,
+    _round,
+    _simulation_dates,
+)
+
+HOURS = 24
+
+# Share of a day's tickets arriving in each hour: business hours with a
+# morning peak, a lunch dip and a light evening/overnight trickle
+DEFAULT_ARRIVAL_CURVE = np.array([
+    0.5, 0.3, 0.2, 0.2, 0.2, 0.3, 0.6, 1.5,    # 00-07
+    4.0, 5.0, 4.5, 4.0, 2.5, 3.5, 4.0, 3.5,    # 08-15
+    3.0, 2.0, 1.2, 0.9, 0.8, 0.7, 0.6, 0.5,    # 16-23
+])
+
+# Full-time shift 08-12 and 13-17 (8 hours with a lunch break)
+DEFAULT_FT_COVERAGE = np.array([0] * 8 + [1] * 4 + [0] + [1] * 4 + [0] * 7, dtype=float)
+
+# Part-time shifts start at 09:00
+PART_TIME_START_HOUR = 9
+
+
+def default_shift_coverage(part_time_hours):
+    """Default ``shift_coverage``: FT 08-17 with lunch, PT from 09:00 for ``part_time_hours``."""
+    hours = np.arange(HOURS)
+    pt_coverage = np.clip(PART_TIME_START_HOUR + part_time_hours - hours, 0, 1) * (hours >= PART_TIME_START_HOUR)
+    return {'FT': DEFAULT_FT_COVERAGE.copy(), 'PT': pt_coverage}
+
+
+def _daily_arrival_shares(arrival_curve, dates):
+    """(days, 24) share of each day's inbound per hour; weekday rows follow ``dates``."""
+    curve = np.asarray(DEFAULT_ARRIVAL_CURVE if arrival_curve is None else arrival_curve, dtype=float)
+    if curve.shape not in ((HOURS,), (7, HOURS)):
+        raise ValueError(f"arrival_curve must have shape (24,) or (7, 24), got {curve.shape}")
+    if (curve < 0).any() or (curve.sum(axis=-1) <= 0).any():
+        raise ValueError("arrival_curve must be non-negative with a positive total per day")
+    shares = curve / curve.sum(axis=-1, keepdims=True)
+    if shares.ndim == 1:
+        return np.broadcast_to(shares, (len(dates), HOURS))
+    return shares[dates.weekday]
+
+
+def _coverage(shift_coverage, part_time_hours):
+    coverage = default_shift_coverage(part_time_hours) if shift_coverage is None else shift_coverage
+    ft, pt = (np.asarray(coverage[kind], dtype=float) for kind in ('FT', 'PT'))
+    if ft.shape != (HOURS,) or pt.shape != (HOURS,):
+        raise ValueError("shift_coverage['FT'] and ['PT'] must have 24 entries")
+    return ft, pt
+
+
+def _fifo_wait_hours(inbound, solved):
+    """
+    Queueing delay of the fluid arriving in each hour, served first in, first out.
+
+    Work arriving in hour ``h`` is represented by its midpoint on the
+    cumulative arrival curve; it leaves when the cumulative departure curve
+    (linear within each hour) reaches that level. Work still queued at the
+    horizon counts until the horizon.
+    """
+    n_hours = len(inbound)
+    cumulative_in = np.concatenate([[0.0], np.cumsum(inbound)])
+    cumulative_out = np.concatenate([[0.0], np.cumsum(solved)])
+    level = cumulative_in[:-1] + inbound / 2
+
+    # Hour in which the departure curve reaches ``level``, then interpolate
+    hour = np.clip(np.searchsorted(cumulative_out, level, side='left') - 1, 0, n_hours - 1)
+    served_in_hour = solved[hour]
+    fraction = np.divide(
+        level - cumulative_out[hour], served_in_hour,
+        out=np.zeros(n_hours), where=served_in_hour > 0
+    )
+    departure = np.where(level <= cumulative_out[-1], hour + np.clip(fraction, 0, 1), n_hours)
+    return np.maximum(departure - (np.arange(n_hours) + 0.5), 0.0)
+
+
+def simulate_hours(p):
+    """
+    Runs the hourly model for the full ``run_simulation`` parameter dict ``p``.
+
+    Returns:
+    --------
+    dict
+        ``dates`` plus daily draws (``raw_inbound``, ``ft_agents_available``,
+        ``pt_agents_available``) and flattened hourly arrays
+        ``actual_inbound``, ``capacity``, ``solved``, ``backlog`` and
+        ``wait_hours``.
+    """
+    days = p['days']
+    dates = _simulation_dates(days, p['start_date'])
+    draws = _draw_stage({}, p, None)
+
+    # Hourly inbound after deflection
+    shares = _daily_arrival_shares(p['arrival_curve'], dates)
+    actual_inbound = (draws['raw_inbound'][:, None] * (1 - p['automation_rate']) * shares).ravel()
+
+    # Hourly capacity from the agents on duty
+    ft_coverage, pt_coverage = _coverage(p['shift_coverage'], p['part_time_hours'])
+    agent_hours = (
+        draws['ft_agents_available'][:, None] * ft_coverage
+        + draws['pt_agents_available'][:, None] * pt_coverage
+    ).ravel()
+    avg_complexity_factor = _avg_complexity_factor(p['complexity_mix'], p['complexity_factors'])
+    if avg_complexity_factor > 0:
+        capacity = agent_hours * p['agent_efficiency'] / avg_complexity_factor
+    else:
+        capacity = np.zeros(days * HOURS)
+
+    solved, backlog = _process_queue(actual_inbound, capacity)
+
+    processing_hours = avg_complexity_factor / p['agent_efficiency'] if p['agent_efficiency'] > 0 else 0
+    wait_hours = _fifo_wait_hours(actual_inbound, solved) + processing_hours + REACTION_TIME_HOURS
+
+    return {
+        'dates': dates,
+        **draws,
+        'actual_inbound': actual_inbound,
+        'capacity': capacity,
+        'solved': solved,
+        'backlog': backlog,
+        'wait_hours': wait_hours,
+    }
+
+
+def hourly_frame(hours):
+    """One row per simulated hour."""
+    return pd.DataFrame({
+        'Time': (hours['dates'].values[:, None] + np.arange(HOURS) * np.timedelta64(1, 'h')).ravel(),
+        'Inbound (Net)': _round(hours['actual_inbound'], 2),
+        'Capacity (Tickets)': _round(hours['capacity'], 2),
+        'Solved': _round(hours['solved'], 2),
+        'Backlog (End of Hour)': _round(hours['backlog'], 2),
+        'Est. Wait Time (Hours)': _round(hours['wait_hours'], 2),
+    }, copy=False)
+
+
+def daily_frame(hours):
+    """Rolls the hourly series up into the ``run_simulation`` columns."""
+    days = len(hours['dates'])
+
+    def by_day(values):
+        return values.reshape(days, HOURS)
+
+    inbound = by_day(hours['actual_inbound'])
+    daily_inbound = inbound.sum(axis=1)
+
+    # Wait of the day's tickets, weighted by when they arrived
+    wait_hours = np.divide(
+        (by_day(hours['wait_hours']) * inbound).sum(axis=1), daily_inbound,
+        out=by_day(hours['wait_hours']).min(axis=1), where=daily_inbound > 0
+    )
+
+    return pd.DataFrame({
+        'Date': hours['dates'],
+        'Inbound (Raw)': np.rint(hours['raw_inbound']).astype(np.int64),
+        'Inbound (Net)': np.rint(daily_inbound).astype(np.int64),
+        'Capacity (Tickets)': np.rint(by_day(hours['capacity']).sum(axis=1)).astype(np.int64),
+        'Solved': np.rint(by_day(hours['solved']).sum(axis=1)).astype(np.int64),
+        'Backlog (End of Day)': np.rint(by_day(hours['backlog'])[:, -1]).astype(np.int64),
+        'Est. Wait Time (Days)': _round(wait_hours / HOURS, 3),
+        'Est. Wait Time (Hours)': _round(wait_hours, 2),
+        'Staff Available (FT)': hours['ft_agents_available'].astype(np.int64),
+        'Staff Available (PT)': hours['pt_agents_available'].astype(np.int64)
+    }, copy=False)
@@ -1,10 +1,9 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
-from simulation import run_simulation
-from translations import TRANSLATIONS, render_language_selector
+from charts import box, cached_figure, cdf, downsample, label_figure, result_hash, scatter
+from comparison import COMPARISON_KPIS
+from result_cache import cached_run_comparison
+from translations import TRANSLATIONS, render_cache_stats, render_language_selector
 
 # Ensure language is set (if user lands directly here)
 if 'language' not in st.session_state:
@@ -52,133 +51,183 @@ else:
 
 automation_rate = st.sidebar.slider(t['automation'], 0, 100, 10) / 100.0
 
-# --- Staffing Scenarios (Main Area) ---
-col_a, col_b = st.columns(2)
-
-with col_a:
-    st.header(t['header_scen_a'])
-    with st.expander(t['config_a'], expanded=True):
-        ft_a = st.slider(t['ft_agents_a'], 0, 20, 5, key="ft_a", help=t['help_ft'])
-        pt_a = st.slider(t['pt_agents_a'], 0, 10, 0, key="pt_a", help=t['help_pt'])
-        pt_hours_a = st.slider("🔵 PT Hours/Day (A)", 1, 8, 4, key="pt_hours_a")
-        eff_a = st.slider(t['eff_a'], 1, 20, 2, key="eff_a", help=t['help_eff'])
-        vac_a = st.slider(t['absent_a'], 0, 50, 5, key="vac_a", help=t['help_absent']) / 100.0
-
-with col_b:
-    st.header(t['header_scen_b'])
-    with st.expander(t['config_b'], expanded=True):
-        ft_b = st.slider(t['ft_agents_b'], 0, 20, 5, key="ft_b", help=t['help_ft'])
-        pt_b = st.slider(t['pt_agents_b'], 0, 10, 0, key="pt_b", help=t['help_pt'])
-        pt_hours_b = st.slider("🟠 PT Hours/Day (B)", 1, 8, 4, key="pt_hours_b")
-        eff_b = st.slider(t['eff_b'], 1, 20, 5, key="eff_b", help=t['help_eff'])
-        vac_b = st.slider(t['absent_b'], 0, 50, 15, key="vac_b", help=t['help_absent']) / 100.0
-
-# --- Run Simulations ---
-seed = 42
+# Monte Carlo: every scenario runs on the same replications, so differences are paired
+st.sidebar.subheader(t['header_mc'])
+n_replications = st.sidebar.selectbox(t['mc_replications'], [100, 500, 1000], index=1, format_func=lambda n: f"{n:,}")
+seed = st.sidebar.number_input(t['seed'], 0, 2**31 - 1, 42, help=t['help_seed'])
 
-np.random.seed(seed)
-df_a = run_simulation(
-    days=60,
-    avg_daily_tickets=avg_daily_tickets,
-    volatility=volatility,
-    full_time_agents=ft_a,
-    part_time_agents=pt_a,
-    part_time_hours=pt_hours_a,
-    agent_efficiency=eff_a,
-    vacation_rate=vac_a,
-    complexity_mix={'Low': comp_low, 'Medium': comp_med, 'High': comp_high},
-    automation_rate=automation_rate
+# --- Staffing Scenarios (Main Area) ---
+MAX_SCENARIOS = 10
+DEFAULT_SCENARIOS = [
+    {'Scenario': 'A', 'FT': 5, 'PT': 0, 'PT Hours': 4, 'Efficiency': 2, 'Absent %': 5},
+    {'Scenario': 'B', 'FT': 5, 'PT': 0, 'PT Hours': 4, 'Efficiency': 5, 'Absent %': 15},
+]
+
+st.subheader(t['header_scenarios'])
+st.caption(t['scenarios_desc'].format(max=MAX_SCENARIOS))
+rows = st.data_editor(
+    DEFAULT_SCENARIOS,
+    num_rows='dynamic',
+    hide_index=True,
+    width='stretch',
+    key='scenario_table',
+    column_config={
+        'Scenario': st.column_config.TextColumn(t['col_scenario'], max_chars=30),
+        'FT': st.column_config.NumberColumn(t['ft_agents'], min_value=0, max_value=200, step=1, default=5, help=t['help_ft']),
+        'PT': st.column_config.NumberColumn(t['pt_agents'], min_value=0, max_value=100, step=1, default=0, help=t['help_pt']),
+        'PT Hours': st.column_config.NumberColumn(t['pt_hours'], min_value=1, max_value=8, step=1, default=4),
+        'Efficiency': st.column_config.NumberColumn(t['efficiency'], min_value=1, max_value=20, step=1, default=5, help=t['help_eff']),
+        'Absent %': st.column_config.NumberColumn(t['absenteeism'], min_value=0, max_value=50, step=1, default=5, help=t['help_absent']),
+    },
 )
 
-np.random.seed(seed) # RESET SEED for Scenario B
-df_b = run_simulation(
+# Complete rows only; unnamed rows are numbered and duplicate names get a suffix
+scenarios = {}
+for number, row in enumerate(rows, start=1):
+    if any(row.get(column) is None for column in ('FT', 'PT', 'PT Hours', 'Efficiency', 'Absent %')):
+        continue
+    name = str(row.get('Scenario') or '').strip() or f"#{number}"
+    while name in scenarios:
+        name += "'"
+    scenarios[name] = dict(
+        full_time_agents=int(row['FT']),
+        part_time_agents=int(row['PT']),
+        part_time_hours=int(row['PT Hours']),
+        agent_efficiency=float(row['Efficiency']),
+        vacation_rate=row['Absent %'] / 100.0,
+    )
+if len(scenarios) > MAX_SCENARIOS:
+    st.warning(t['scenarios_max'].format(max=MAX_SCENARIOS))
+    scenarios = dict(list(scenarios.items())[:MAX_SCENARIOS])
+if not scenarios:
+    st.info(t['scenarios_empty'])
+    st.stop()
+names = list(scenarios)
+baseline = st.selectbox(t['baseline'], names, help=t['help_baseline'])
+
+# --- Run Simulations ---
+# One batched run: all scenarios share the random draws of every replication
+comparison = cached_run_comparison(
+    scenarios,
+    n_replications=n_replications,
+    seed=int(seed),
+    baseline=baseline,
     days=60,
     avg_daily_tickets=avg_daily_tickets,
     volatility=volatility,
-    full_time_agents=ft_b,
-    part_time_agents=pt_b,
-    part_time_hours=pt_hours_b,
-    agent_efficiency=eff_b,
-    vacation_rate=vac_b,
     complexity_mix={'Low': comp_low, 'Medium': comp_med, 'High': comp_high},
-    automation_rate=automation_rate
+    automation_rate=automation_rate,
 )
 
-df_a['Scenario'] = 'A'
-df_b['Scenario'] = 'B'
-df_combined = pd.concat([df_a, df_b])
-
 # --- Comparison Visualizations ---
 
 st.divider()
 
-# 1. KPI Comparison
+# 1. KPI Comparison: medians over replications
 st.subheader(t['kpi_compare'])
-kpi_col1, kpi_col2, kpi_col3 = st.columns(3)
+st.dataframe(comparison.kpi_summary()[list(COMPARISON_KPIS)].round(1), width="stretch")
+
+# 2. Paired differences to the baseline with confidence intervals
+st.subheader(t['diff_title'])
+st.caption(t['diff_desc'].format(
+    baseline=baseline, confidence=comparison.confidence * 100, replications=n_replications
+))
+others = comparison.differences[comparison.differences['Scenario'] != baseline]
+if len(others):
+    kpi = st.selectbox(t['diff_kpi'], COMPARISON_KPIS)
+    selected = others[others['KPI'] == kpi]
+
+    def difference_figure():
+        # Imported here: plotly is only loaded once a figure is built, not on a cache hit
+        import plotly.graph_objects as go
+
+        fig = go.Figure(go.Scatter(
+            x=selected['Difference'], y=selected['Scenario'], mode='markers',
+            marker=dict(size=10, color=np.where(selected['Significant'], '#d62728', '#7f7f7f')),
+            error_x=dict(
+                type='data', symmetric=False,
+                array=selected['CI High'] - selected['Difference'],
+                arrayminus=selected['Difference'] - selected['CI Low']
+            ),
+        ))
+        fig.add_vline(x=0, line=dict(color='black', dash='dot'))
+        fig.update_layout(yaxis=dict(autorange='reversed'), height=120 + 40 * len(selected))
+        return fig
+
+    difference_key = result_hash(*(selected[column] for column in ('Scenario', 'Difference', 'CI Low', 'CI High')))
+    fig_diff = label_figure(
+        cached_figure(('differences', difference_key), difference_figure),
+        xaxis_title=t['axis_difference'].format(kpi=kpi, baseline=baseline)
+    )
+    st.plotly_chart(fig_diff, width="stretch")
+    with st.expander(t['diff_table']):
+        st.dataframe(others.round(2), hide_index=True, width="stretch")
+
+# 3. Comparative Pulse: median backlog of every scenario
+st.subheader(t['pulse_compare'])
+backlogs = {name: result.bands['Backlog (End of Day) P50'] for name, result in comparison.results.items()}
+dates = comparison.results[baseline].bands['Date']
 
-wait_a = df_a['Est. Wait Time (Hours)'].mean()
-wait_b = df_b['Est. Wait Time (Hours)'].mean()
-delta_wait = wait_b - wait_a
 
-backlog_a = df_a['Backlog (End of Day)'].max()
-backlog_b = df_b['Backlog (End of Day)'].max()
-delta_backlog = backlog_b - backlog_a
+def pulse_figure():
+    import plotly.graph_objects as go
 
-kpi_col1.metric(t['kpi_wait_a'], f"{wait_a:.1f} Hours")
-kpi_col1.metric(t['kpi_wait_b'], f"{wait_b:.1f} Hours", delta=f"{delta_wait:.1f} Hours", delta_color="inverse")
+    # All scenarios share the dates, so one set of downsampled points keeps their lines aligned
+    keep = downsample(dates, *backlogs.values())
+    fig = go.Figure([
+        scatter(dates.to_numpy()[keep], backlog.to_numpy()[keep], name=name) for name, backlog in backlogs.items()
+    ])
+    fig.update_layout(legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    return fig
 
-kpi_col2.metric(t['kpi_backlog_a'], f"{int(backlog_a)} Tickets")
-kpi_col2.metric(t['kpi_backlog_b'], f"{int(backlog_b)} Tickets", delta=f"{int(delta_backlog)} Tickets", delta_color="inverse")
 
-# Cost/Hours proxy - use the actual pt_hours values from the configuration
-hours_a = (df_a['Staff Available (FT)'].sum() * 8) + (df_a['Staff Available (PT)'].sum() * pt_hours_a)
-hours_b = (df_b['Staff Available (FT)'].sum() * 8) + (df_b['Staff Available (PT)'].sum() * pt_hours_b)
-delta_hours = hours_b - hours_a
-kpi_col3.metric(t['kpi_hours_a'], f"{int(hours_a)}")
-kpi_col3.metric(t['kpi_hours_b'], f"{int(hours_b)}", delta=f"{int(delta_hours)}", delta_color="inverse")
+fig_pulse = label_figure(
+    cached_figure(('pulse', tuple(backlogs), result_hash(dates, *backlogs.values())), pulse_figure),
+    yaxis_title=t['legend_backlog']
+)
+st.plotly_chart(fig_pulse, width="stretch")
 
-# 2. Comparative Pulse (Side-by-Side)
-st.subheader(t['pulse_compare'])
-pulse_col1, pulse_col2 = st.columns(2)
-
-with pulse_col1:
-    st.markdown(f"### {t['pulse_a']}")
-    fig_pulse_a = go.Figure()
-    fig_pulse_a.add_trace(go.Scatter(x=df_a['Date'], y=df_a['Inbound (Net)'], name=t['legend_inbound'], line=dict(color='gray', dash='dot')))
-    fig_pulse_a.add_trace(go.Scatter(x=df_a['Date'], y=df_a['Capacity (Tickets)'], name=t['legend_capacity'], line=dict(color='green')))
-    fig_pulse_a.add_trace(go.Scatter(x=df_a['Date'], y=df_a['Backlog (End of Day)'], name=t['legend_backlog'], fill='tozeroy', line=dict(color='#1f77b4')))
-    fig_pulse_a.update_layout(legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
-    st.plotly_chart(fig_pulse_a, width="stretch")
-
-with pulse_col2:
-    st.markdown(f"### {t['pulse_b']}")
-    fig_pulse_b = go.Figure()
-    fig_pulse_b.add_trace(go.Scatter(x=df_b['Date'], y=df_b['Inbound (Net)'], name=t['legend_inbound'], line=dict(color='gray', dash='dot')))
-    fig_pulse_b.add_trace(go.Scatter(x=df_b['Date'], y=df_b['Capacity (Tickets)'], name=t['legend_capacity'], line=dict(color='green')))
-    fig_pulse_b.add_trace(go.Scatter(x=df_b['Date'], y=df_b['Backlog (End of Day)'], name=t['legend_backlog'], fill='tozeroy', line=dict(color='#ff7f0e')))
-    fig_pulse_b.update_layout(legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
-    st.plotly_chart(fig_pulse_b, width="stretch")
-
-# 3. Boxplot & CDF
+# 4. Boxplot & CDF
 col_viz1, col_viz2 = st.columns(2)
 
 with col_viz1:
     st.subheader(t['box_title'])
-    fig_box = px.box(df_combined, x='Scenario', y='Est. Wait Time (Hours)', color='Scenario', 
-                     color_discrete_map={'A': '#1f77b4', 'B': '#ff7f0e'})
+    # Quartiles and fences are computed here; the replications are not sent to the browser
+    waits = {name: result.kpis['Avg Wait Time (Hours)'] for name, result in comparison.results.items()}
+
+    def box_figure():
+        import plotly.graph_objects as go
+
+        return go.Figure([box(wait, name) for name, wait in waits.items()], layout=dict(showlegend=False))
+
+    fig_box = label_figure(
+        cached_figure(('box', tuple(waits), result_hash(*waits.values())), box_figure),
+        yaxis_title=t['axis_wait']
+    )
     st.plotly_chart(fig_box, width="stretch")
 
 with col_viz2:
     st.subheader(t['cdf_title'])
-    # Calculate CDF manually for cleaner plot
-    # Sort data
-    sorted_a = np.sort(df_a['Est. Wait Time (Hours)'])
-    sorted_b = np.sort(df_b['Est. Wait Time (Hours)'])
-    y_a = np.arange(1, len(sorted_a) + 1) / len(sorted_a)
-    y_b = np.arange(1, len(sorted_b) + 1) / len(sorted_b)
-    
-    fig_cdf = go.Figure()
-    fig_cdf.add_trace(go.Scatter(x=sorted_a, y=y_a, name=t['header_scen_a'], line=dict(color='#1f77b4')))
-    fig_cdf.add_trace(go.Scatter(x=sorted_b, y=y_b, name=t['header_scen_b'], line=dict(color='#ff7f0e')))
-    fig_cdf.update_layout(xaxis_title=t['axis_wait'], yaxis_title=t['axis_prob'], title=t['title_cdf'])
+    # CDF over tickets: real ticket ages from first-in, first-out cohorts, pooled over replications
+    distributions = {
+        name: cdf(ages['Wait Time (Hours)'], ages['Solved'] + ages['Open']) for name, ages in comparison.ages.items()
+    }
+
+    def cdf_figure():
+        import plotly.graph_objects as go
+
+        return go.Figure([
+            scatter(wait_hours, probability, name=name, line=dict(shape='hv'))
+            for name, (wait_hours, probability) in distributions.items()
+        ])
+
+    fig_cdf = label_figure(
+        cached_figure(
+            ('cdf', tuple(distributions), result_hash(*(column for pair in distributions.values() for column in pair))),
+            cdf_figure
+        ),
+        xaxis_title=t['axis_wait'], yaxis_title=t['axis_prob'], title=t['title_cdf']
+    )
     st.plotly_chart(fig_cdf, width="stretch")
+
+render_cache_stats()
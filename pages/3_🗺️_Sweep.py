@@ -0,0 +1,127 @@
+import streamlit as st
+from absence import ClusteredAbsences
+from sweep import SWEEP_KPIS, parameter_grid, run_sweep
+from translations import TRANSLATIONS, render_language_selector
+
+# Ensure language is set (if user lands directly here)
+if 'language' not in st.session_state:
+    st.session_state['language'] = 'DE'
+
+def get_text():
+    return TRANSLATIONS[st.session_state['language']]
+
+t = get_text()
+
+st.set_page_config(page_title=t['page_title_sweep'], layout="wide", page_icon="🗺️")
+
+# Language Selector
+render_language_selector()
+
+st.title(t['sweep_title'])
+st.markdown(t['sweep_desc'])
+
+# --- Shared Parameters (Sidebar) ---
+st.sidebar.header(t['header_shared'])
+
+st.sidebar.subheader(t['header_inbound'])
+avg_daily_tickets = st.sidebar.slider(t['avg_inbound'], 10, 1000, 100)
+volatility = st.sidebar.slider(t['volatility'], 0, 100, 20, help=t['help_volatility']) / 100.0
+
+st.sidebar.subheader(t['header_props'])
+col1, col2, col3 = st.sidebar.columns(3)
+comp_low = col1.number_input(t['comp_low'], 0, 100, 50)
+comp_med = col2.number_input(t['comp_med'], 0, 100, 30)
+comp_high = col3.number_input(t['comp_high'], 0, 100, 20)
+
+# Normalize complexity
+total_comp = max(comp_low + comp_med + comp_high, 1)
+complexity_mix = {'Low': comp_low / total_comp, 'Medium': comp_med / total_comp, 'High': comp_high / total_comp}
+
+part_time_hours = st.sidebar.slider(t['pt_hours'], 1, 8, 4)
+vacation_rate = st.sidebar.slider(t['absenteeism'], 0, 50, 5, help=t['help_absent']) / 100.0
+clustered_absences = st.sidebar.checkbox(t['absence_clustered'], value=False, help=t['help_clustered'])
+
+# --- Sweep Grid (Main Area) ---
+st.header(t['header_grid'])
+grid_col1, grid_col2 = st.columns(2)
+with grid_col1:
+    ft_range = st.slider(t['sweep_ft_range'], 0, 30, (2, 12))
+    pt_range = st.slider(t['sweep_pt_range'], 0, 20, (0, 6))
+    days = st.slider(t['sweep_days'], 30, 365, 60)
+with grid_col2:
+    efficiencies = st.multiselect(t['sweep_efficiencies'], list(range(1, 21)), default=[3, 5])
+    automation_pcts = st.multiselect(t['sweep_automation_rates'], list(range(0, 101, 5)), default=[10, 20])
+    n_replications = st.selectbox(t['mc_replications'], [50, 100, 200, 500], index=2, help=t['help_mc'])
+
+grid = {
+    'agent_efficiency': sorted(efficiencies),
+    'automation_rate': [pct / 100.0 for pct in sorted(automation_pcts)],
+    'full_time_agents': list(range(ft_range[0], ft_range[1] + 1)),
+    'part_time_agents': list(range(pt_range[0], pt_range[1] + 1)),
+}
+n_points = len(parameter_grid(grid))
+st.caption(t['sweep_points'].format(points=n_points, replications=n_replications))
+
+if st.button(t['sweep_run'], type="primary", disabled=n_points == 0):
+    with st.spinner(t['sweep_running']):
+        st.session_state['sweep_result'] = run_sweep(
+            grid,
+            n_replications=n_replications,
+            seed=42,
+            days=days,
+            avg_daily_tickets=avg_daily_tickets,
+            volatility=volatility,
+            part_time_hours=part_time_hours,
+            vacation_rate=vacation_rate,
+            complexity_mix=complexity_mix,
+            absence_model=ClusteredAbsences() if clustered_absences else None
+        )
+
+if n_points == 0:
+    st.warning(t['sweep_empty'])
+
+result = st.session_state.get('sweep_result')
+if result is None or result.empty:
+    st.info(t['sweep_hint'])
+    st.stop()
+
+# --- Heatmap ---
+st.divider()
+sel_col1, sel_col2, sel_col3 = st.columns(3)
+kpi = sel_col1.selectbox(t['sweep_kpi'], list(SWEEP_KPIS))
+efficiency = sel_col2.selectbox(t['sweep_slice_eff'], sorted(result['agent_efficiency'].unique()))
+automation = sel_col3.selectbox(
+    t['sweep_slice_auto'], sorted(result['automation_rate'].unique()),
+    format_func=lambda rate: f"{rate * 100:.0f}"
+)
+
+slice_df = result[(result['agent_efficiency'] == efficiency) & (result['automation_rate'] == automation)]
+matrix = slice_df.pivot(index='part_time_agents', columns='full_time_agents', values=kpi)
+
+# Clearance is good when high, the other KPIs when low
+colorscale = 'RdYlGn' if kpi == 'Clearance Rate (%)' else 'RdYlGn_r'
+
+
+
+def heatmap_figure():
+    # Imported here: plotly is only loaded once there is a sweep to plot
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Heatmap(
+        z=matrix.values,
+        x=matrix.columns,
+        y=matrix.index,
+        colorscale=colorscale,
+        text=matrix.round(1).values,
+        texttemplate="%{text}",
+        colorbar=dict(title=kpi)
+    ))
+    fig.update_layout(xaxis_title=t['axis_ft'], yaxis_title=t['axis_pt'], xaxis=dict(dtick=1), yaxis=dict(dtick=1))
+    return fig
+
+
+st.subheader(t['sweep_heatmap'].format(kpi=kpi))
+st.plotly_chart(heatmap_figure(), width="stretch")
+
+with st.expander(t['sweep_table']):
+    st.dataframe(result.round(2), width="stretch")
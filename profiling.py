@@ -0,0 +1,164 @@
+"""
+Low-overhead timing hooks for the engine and the pages.
+
+The engine wraps its stages in ``section(name)`` and pages mark progress
+with ``checkpoint(name)``. Both do nothing unless a ``Profiler`` is active
+in the current context, so they cost one context-variable lookup by
+default. Nested sections are recorded by path, e.g.
+``stage: draws / absences``; a parent's time includes its children.
+
+Profiling is switched on by the ``TICKETSIM_PROFILE`` environment variable
+or the ``?profile=`` query parameter of a page (see ``profile_mode``):
+``1`` records section timings, ``cprofile`` additionally runs
+``cProfile`` over the whole script. Results export as JSON or as a
+``pstats`` dump.
+"""
+import contextlib
+import contextvars
+import cProfile
+import json
+import marshal
+import os
+import time
+
+PROFILE_ENV = 'TICKETSIM_PROFILE'
+
+PROFILE_MODES = ('timings', 'cprofile')
+
+_active = contextvars.ContextVar('profiler', default=None)
+_no_section = contextlib.nullcontext()
+
+
+def profile_mode(value=None):
+    """
+    Profiling mode for ``value``, or for ``TICKETSIM_PROFILE`` if None.
+
+    Returns:
+    --------
+    str or None
+        ``'timings'`` for ``1``/``true``/``on``/``timings``, ``'cprofile'``
+        for ``cprofile``, None (off) otherwise.
+    """
+    value = os.environ.get(PROFILE_ENV, '') if value is None else str(value)
+    value = value.strip().lower()
+    if value == 'cprofile':
+        return 'cprofile'
+    if value in ('1', 'true', 'on', 'yes', 'timings'):
+        return 'timings'
+    return None
+
+
+def section(name):
+    """Times the enclosed block under ``name`` if a profiler is active."""
+    profiler = _active.get()
+    return _no_section if profiler is None else profiler.section(name)
+
+
+def checkpoint(name):
+    """Records the time since the previous checkpoint as ``name`` if a profiler is active."""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.checkpoint(name)
+
+
+class Profiler:
+    """
+    Collects section timings between ``start()`` and ``stop()``.
+
+    Parameters:
+    -----------
+    mode : {'timings', 'cprofile'}
+        ``'cprofile'`` also records a ``cProfile`` profile.
+    """
+
+    def __init__(self, mode='timings'):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}, expected one of {PROFILE_MODES}")
+        self.mode = mode
+        self.records = []
+        self.wall_seconds = None
+        self._path = []
+        self._token = None
+        self._cprofile = cProfile.Profile() if mode == 'cprofile' else None
+
+    def start(self):
+        """
+        Makes this the active profiler of the current context.
+
+        Only one ``cProfile`` can run per process: if another one is active,
+        e.g. in a second session, this profiler records timings only.
+        """
+        if self._cprofile is not None:
+            try:
+                self._cprofile.enable()
+            except ValueError:
+                self._cprofile = None
+                self.mode = 'timings'
+        self._token = _active.set(self)
+        self._started = self._last_checkpoint = time.perf_counter()
+        return self
+
+    def stop(self):
+        """Deactivates the profiler; further hooks in this context are no-ops again."""
+        if self._token is None:
+            return self
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        self.wall_seconds = time.perf_counter() - self._started
+        _active.reset(self._token)
+        self._token = None
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @contextlib.contextmanager
+    def section(self, name):
+        self._path.append(name)
+        path = ' / '.join(self._path)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append((path, time.perf_counter() - start))
+            self._path.pop()
+
+    def checkpoint(self, name):
+        now = time.perf_counter()
+        self.records.append((name, now - self._last_checkpoint))
+        self._last_checkpoint = now
+
+    def summary(self):
+        """
+        Timings per section path, in order of first occurrence.
+
+        Returns:
+        --------
+        list of dict
+            ``section``, ``calls`` and total ``seconds`` per path.
+        """
+        totals = {}
+        for path, seconds in self.records:
+            entry = totals.setdefault(path, {'section': path, 'calls': 0, 'seconds': 0.0})
+            entry['calls'] += 1
+            entry['seconds'] += seconds
+        return list(totals.values())
+
+    def to_json(self):
+        return json.dumps({'mode': self.mode, 'wall_seconds': self.wall_seconds, 'sections': self.summary()}, indent=2)
+
+    def pstats_bytes(self):
+        """The ``cProfile`` results in the ``pstats`` file format, None without cProfile."""
+        if self._cprofile is None:
+            return None
+        self._cprofile.create_stats()
+        return marshal.dumps(self._cprofile.stats)
+
+    def dump_stats(self, path):
+        """Writes the ``cProfile`` results for ``pstats.Stats(path)`` or snakeviz."""
+        if self._cprofile is None:
+            raise ValueError("dump_stats() needs mode='cprofile'")
+        self._cprofile.dump_stats(path)
@@ -0,0 +1,288 @@
+"""
+Multi-class queues (``run_simulation(queue_policy=...)``).
+
+By default the daily model keeps one backlog of "average" tickets. With a
+queue policy the backlog is split into classes, one per complexity level,
+or one per (priority, complexity) pair if ``priority_mix`` is given. Queue
+state is kept as (classes x days) arrays, or (replications x classes x days)
+for Monte Carlo.
+
+Capacity is shared in work units: one unit is the time a ticket with
+complexity factor 1.0 takes, so a day offers ``agent hours *
+agent_efficiency`` units and a ticket of class ``c`` needs its complexity
+factor in units. The policy decides how each day's units are split:
+
+- ``FifoPolicy``: one shared queue, first in, first out, so totals match
+  the single-queue model. Each day's work is split over the classes in the
+  mix of the arrival days it reaches; with a fixed mix that is simply the
+  inbound share of each class.
+- ``StrictPriority``: classes are served in ``order``; a class only gets
+  what the classes before it leave over. One backlog recursion per class.
+- ``WeightedFairShare``: classes with open work share the capacity in
+  proportion to their weights; what a class cannot use goes to the others.
+"""
+import numpy as np
+
+from simulation import _process_queue
+
+
+def queue_classes(complexity_mix, complexity_factors, priority_mix=None):
+    """
+    Queue classes in default service order.
+
+    Parameters:
+    -----------
+    complexity_mix : dict
+        Share of each complexity level
+    complexity_factors : dict
+        Time multiplier of each complexity level
+    priority_mix : dict, optional
+        Share of each priority level, most urgent first. Priority and
+        complexity are independent, so a class gets the product of shares.
+
+    Returns:
+    --------
+    tuple
+        (labels, shares, factors): class labels such as ``'High'`` or
+        ``'Urgent High'``, inbound shares summing to 1 and complexity factors.
+        Shares have shape (classes,), or (classes, days) when the complexity
+        mix varies by day.
+    """
+    priorities = {None: 1.0} if priority_mix is None else priority_mix
+    labels, shares, factors = [], [], []
+    for priority, priority_share in priorities.items():
+        for level, level_share in complexity_mix.items():
+            labels.append(level if priority is None else f"{priority} {level}")
+            shares.append(priority_share * level_share)
+            factors.append(complexity_factors[level])
+    shares = np.array(np.broadcast_arrays(*shares), dtype=float)
+    if (shares < 0).any() or (shares.sum(axis=0) <= 0).any():
+        raise ValueError("Class shares must be non-negative with a positive total")
+    return tuple(labels), shares / shares.sum(axis=0), np.array(factors, dtype=float)
+
+
+class FifoPolicy:
+    """All classes in one queue, served first in, first out."""
+
+    def serve(self, inbound, capacity, labels):
+        """
+        Splits ``capacity`` over the class queues.
+
+        Parameters:
+        -----------
+        inbound : np.ndarray
+            Work arriving per class and day, shape (..., classes, days)
+        capacity : np.ndarray
+            Work units available per day, shape (..., days)
+        labels : tuple
+            Class labels along the class axis
+
+        Returns:
+        --------
+        tuple of np.ndarray
+            (solved, backlog) work per class and day, shaped like ``inbound``.
+        """
+        total_inbound = inbound.sum(axis=-2)
+        solved, backlog = _process_queue(total_inbound, capacity)
+
+        class_totals = inbound.sum(axis=-1, keepdims=True)
+        share = np.divide(
+            class_totals, class_totals.sum(axis=-2, keepdims=True),
+            out=np.zeros_like(class_totals), where=class_totals > 0
+        )
+        if np.allclose(inbound, total_inbound[..., None, :] * share, rtol=1e-12, atol=0.0):
+            # Classes arrive in fixed proportions, so FIFO keeps them in the queue
+            return solved[..., None, :] * share, backlog[..., None, :] * share
+        return _fifo_classes(inbound, solved)
+
+
+class StrictPriority:
+    """
+    Serves classes strictly in ``order``, most urgent first.
+
+    Parameters:
+    -----------
+    order : sequence of str, optional
+        Every class label once. Defaults to the class order, i.e. priority
+        levels in ``priority_mix`` order, then complexity levels in
+        ``complexity_mix`` order.
+    """
+
+    def __init__(self, order=None):
+        self.order = None if order is None else tuple(order)
+
+    def serve(self, inbound, capacity, labels):
+        """Same contract as ``FifoPolicy.serve``."""
+        order = labels if self.order is None else self.order
+        if sorted(order) != sorted(labels):
+            raise ValueError(f"StrictPriority order {list(order)} must list each class once: {list(labels)}")
+
+        solved = np.zeros_like(inbound)
+        backlog = np.zeros_like(inbound)
+        remaining = capacity
+        for label in order:
+            c = labels.index(label)
+            solved[..., c, :], backlog[..., c, :] = _process_queue(inbound[..., c, :], remaining)
+            remaining = remaining - solved[..., c, :]
+        return solved, backlog
+
+
+class WeightedFairShare:
+    """
+    Shares each day's capacity between classes with open work by weight.
+
+    The split is work conserving: capacity a class cannot use (its queue is
+    empty) is redistributed to the others by their weights. A day's split
+    depends on the backlog the split of the day before leaves, so the days
+    are solved by iteration (see ``_fair_share``).
+
+    Parameters:
+    -----------
+    weights : dict, optional
+        Weight per class label. Defaults to equal weights.
+    """
+
+    def __init__(self, weights=None):
+        self.weights = None if weights is None else dict(weights)
+
+    def serve(self, inbound, capacity, labels):
+        """Same contract as ``FifoPolicy.serve``."""
+        if self.weights is None:
+            weights = np.ones(len(labels))
+        else:
+            missing = set(labels) - set(self.weights)
+            if missing:
+                raise ValueError(f"WeightedFairShare weights missing for classes {sorted(missing)}")
+            weights = np.array([self.weights[label] for label in labels], dtype=float)
+        if (weights <= 0).any():
+            raise ValueError("WeightedFairShare weights must be positive")
+
+        return _fair_share(inbound, capacity, weights)
+
+
+def _fifo_classes(inbound, solved):
+    """
+    Per-class (solved, backlog) of one FIFO queue whose total ``solved``
+    work per day is known, for classes arriving in a mix that varies by day.
+
+    By the end of day t the queue has served the first ``D(t)`` units of
+    the cumulative arrival curve ``A``. They reach into arrival day k with
+    ``A(k - 1) <= D(t) < A(k)``; every class has all of its work of the
+    days before k served and the same fraction of day k's work.
+    """
+    days = inbound.shape[-1]
+    arrived = np.cumsum(inbound, axis=-1)
+    total_arrived = arrived.sum(axis=-2).reshape(-1, days)
+    departed = np.cumsum(solved, axis=-1).reshape(-1, days)
+
+    # One sorted search for all rows: row r's curve is scaled into [r, r + 1)
+    rows = np.arange(len(total_arrived))[:, None]
+    scale = total_arrived[:, -1:] + 1.0
+    k = np.searchsorted((total_arrived / scale + rows).ravel(), (departed / scale + rows).ravel(), side='right')
+    k = np.minimum(k.reshape(departed.shape) - rows * days, days - 1)
+
+    day_inbound = np.take_along_axis(inbound.reshape(len(rows), -1, days), k[:, None, :], axis=-1)
+    day_total = day_inbound.sum(axis=-2)
+    reached = departed - (np.take_along_axis(total_arrived, k, axis=-1) - day_total)
+    fraction = np.clip(np.divide(reached, day_total, out=np.ones_like(reached), where=day_total > 0), 0.0, 1.0)
+    class_departed = (
+        np.take_along_axis(arrived.reshape(len(rows), -1, days), k[:, None, :], axis=-1) - day_inbound +
+        fraction[:, None, :] * day_inbound
+    ).reshape(inbound.shape)
+    class_departed = np.minimum(class_departed, arrived)
+    class_solved = np.diff(class_departed, axis=-1, prepend=0.0)
+    return class_solved, arrived - class_departed
+
+
+# Above this many replications, stepping through the days is cheaper than
+# re-running the whole horizon until the fair levels settle
+_FIXED_POINT_ROWS = 64
+
+
+def _fair_share(inbound, capacity, weights):
+    """
+    (solved, backlog) of ``WeightedFairShare`` for inbound (..., classes, days).
+
+    Each day's split is a fair level ``L``: class ``c`` is served
+    ``min(demand, weights[c] * L)``. Given the levels of all days, every
+    class is an independent queue with capacity ``weights[c] * L``, solved by
+    one ``_process_queue`` call. Small batches therefore iterate on the
+    levels of the whole horizon: serve, recompute each day's level from the
+    resulting demand, repeat until no level moves. Day t is exact after t + 1
+    rounds, but in practice two to four rounds settle all days. Large batches
+    step through the days instead, each step on arrays of all replications.
+    """
+    shape = inbound.shape
+    classes, days = shape[-2:]
+    # Class-major (classes, rows, days) so that each class is a contiguous block
+    inbound = np.ascontiguousarray(np.moveaxis(inbound.reshape(-1, classes, days), 1, 0))
+    capacity = np.broadcast_to(np.asarray(capacity, dtype=float), shape[:-2] + (days,)).reshape(-1, days)
+    if capacity.shape[0] <= _FIXED_POINT_ROWS:
+        solved, backlog = _fair_share_fixed_point(inbound, capacity, weights)
+    else:
+        solved, backlog = _fair_share_by_day(inbound, capacity, weights)
+    return np.moveaxis(solved, 0, 1).reshape(shape), np.moveaxis(backlog, 0, 1).reshape(shape)
+
+
+def _fair_share_fixed_point(inbound, capacity, weights):
+    class_weights = weights[:, None, None]
+    tolerance = 1e-9 * (capacity.max(initial=0.0) + 1.0)
+    level = capacity / weights.sum()
+    for _ in range(inbound.shape[-1] + 1):
+        solved, backlog = _process_queue(inbound, class_weights * level)
+        demand = inbound.copy()
+        demand[..., 1:] += backlog[..., :-1]
+        new_level = _fair_level(demand, capacity, weights)
+        settled = np.allclose(new_level, level, rtol=0.0, atol=tolerance)
+        level = new_level
+        if settled:
+            break
+    return solved, backlog
+
+
+def _fair_share_by_day(inbound, capacity, weights):
+    # Day-major copies keep each step's (classes, rows) arrays contiguous
+    day_inbound = np.ascontiguousarray(np.moveaxis(inbound, -1, 0))
+    day_capacity = np.ascontiguousarray(capacity.T)
+    solved = np.empty_like(day_inbound)
+    backlog = np.empty_like(day_inbound)
+    class_weights = weights[:, None]
+    previous = np.zeros(day_inbound.shape[1:])
+    for day in range(len(day_inbound)):
+        demand = previous + day_inbound[day]
+        level = _fair_level(demand, day_capacity[day], weights)
+        np.minimum(demand, class_weights * level, out=solved[day])
+        previous = backlog[day] = demand - solved[day]
+    return np.moveaxis(solved, 0, -1), np.moveaxis(backlog, 0, -1)
+
+
+def _fair_level(demand, capacity, weights):
+    """
+    Weighted max-min fair level of ``capacity`` over ``demand`` (classes, ...).
+
+    Serving ``min(demand[c], weights[c] * L)`` uses up ``capacity`` at the
+    level ``L`` found between the demand ratios ``demand[c] / weights[c]``:
+    classes below it are served in full and the others share the rest by
+    weight. Without enough demand to use up the capacity the level is the
+    largest ratio, so every class is served in full.
+    """
+    classes = range(len(weights))
+    ratio = demand / weights.reshape((-1,) + (1,) * capacity.ndim)
+    # Smallest ratio at which the classes would need all of the capacity
+    bound = np.full(capacity.shape, np.inf)
+    need = np.empty_like(capacity)
+    share = np.empty_like(capacity)
+    for k in classes:
+        need[...] = 0.0
+        for c in classes:
+            np.multiply(ratio[k], weights[c], out=share)
+            need += np.minimum(share, demand[c], out=share)
+        np.copyto(bound, np.minimum(bound, ratio[k]), where=need >= capacity)
+
+    served = np.zeros_like(capacity)
+    rest = np.zeros_like(capacity)
+    for c in classes:
+        full = ratio[c] < bound
+        served += demand[c] * full
+        rest += weights[c] * ~full
+    return np.divide(capacity - served, rest, out=ratio.max(axis=0), where=rest > 0)
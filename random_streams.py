@@ -0,0 +1,178 @@
+"""
+Random number plumbing for the ticket simulation.
+
+Every simulation entry point takes an ``rng`` argument:
+
+- ``None``: the global ``np.random`` state (legacy behaviour, reproducible
+  with ``np.random.seed``)
+- an int or ``np.random.SeedSequence``: a fresh ``np.random.Generator``
+- a ``np.random.Generator`` or ``np.random.RandomState``: used as is
+- a ``CommonRandomNumbers`` instance: standardized draws generated once and
+  shared by several scenarios
+
+Generators and common random numbers work on standardized draws (standard
+normals for inbound, uniforms for absences) that each scenario transforms
+with its own parameters. That is what makes paired comparisons possible.
+"""
+import threading
+
+import numpy as np
+
+# Uniforms reserved per absence draw; enough for every model in absence.py
+ABSENCE_UNIFORMS_PER_DRAW = 4
+
+
+def resolve_rng(rng=None):
+    """Turns an int or SeedSequence into a Generator; other values pass through."""
+    if isinstance(rng, (int, np.integer, np.random.SeedSequence)):
+        return np.random.default_rng(rng)
+    return rng
+
+
+def legacy_state(rng):
+    """The legacy ``RandomState`` interface for ``rng`` (the global state for None)."""
+    return np.random if rng is None else rng
+
+
+def spawn_rngs(seed, n):
+    """
+    Independent Generators for ``n`` parallel workers.
+
+    The children of one ``SeedSequence`` are statistically independent, so
+    each worker can draw without coordination and the overall result only
+    depends on ``seed``.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed.spawn(n)]
+
+
+class CommonRandomNumbers:
+    """
+    Inbound and absence draws generated once and reused across scenarios.
+
+    Scenarios that share one instance see the same standardized inbound
+    noise and the same absence uniforms, so differences between them come
+    from their parameters rather than from sampling noise. Paired
+    comparisons therefore need far fewer replications for the same precision.
+
+    Parameters:
+    -----------
+    days : int
+        Simulation horizon; every scenario must use the same number of days
+    n_replications : int
+        Number of replications (1 for ``run_simulation``)
+    seed : int or np.random.SeedSequence, optional
+        Seed for the draws; fresh entropy if omitted
+
+    Absence uniforms grow on demand, as scenarios with more agents or higher
+    absence rates need more draws. Extensions append to the same stream, so a
+    scenario sees the same values no matter which scenario ran first.
+    """
+
+    def __init__(self, days, n_replications=1, seed=None):
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        inbound_seed, absence_seed = seed.spawn(2)
+        self.seed = seed
+        self.days = days
+        self.n_replications = n_replications
+        self.inbound_z = np.random.default_rng(inbound_seed).standard_normal((n_replications, days))
+        self._absence_rng = np.random.default_rng(absence_seed)
+        self._absence_uniforms = np.empty((0, n_replications, ABSENCE_UNIFORMS_PER_DRAW))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_arrays(cls, inbound_z, absence_uniforms):
+        """
+        Wraps existing draws without copying, e.g. views into shared memory.
+
+        ``inbound_z`` has shape (n_replications, days) and ``absence_uniforms``
+        shape (n_draws, n_replications, ABSENCE_UNIFORMS_PER_DRAW). The
+        instance cannot grow: reserve enough absence draws before exporting.
+        """
+        crn = cls.__new__(cls)
+        crn.seed = None
+        crn.n_replications, crn.days = inbound_z.shape
+        crn.inbound_z = inbound_z
+        crn._absence_rng = None
+        crn._absence_uniforms = absence_uniforms
+        crn._lock = threading.Lock()
+        return crn
+
+    def first_days(self, days):
+        """
+        The draws of the first ``days`` days, sharing the absence uniforms,
+        for a shorter run next to the longest one (e.g. a sweep over ``days``).
+        """
+        if days == self.days:
+            return self
+        if days > self.days:
+            raise ValueError(f"Common random numbers were drawn for {self.days} days, got {days}")
+        return CommonRandomNumbers.from_arrays(self.inbound_z[:, :days], self._absence_uniforms)
+
+    @property
+    def absence_uniforms_array(self):
+        """All absence uniforms drawn so far, shape (n_draws, n_replications, 4)."""
+        return self._absence_uniforms
+
+    def reserve(self, n_draws):
+        """Draws absence uniforms up front so at least ``n_draws`` are available."""
+        self.absence_uniforms(n_draws, ABSENCE_UNIFORMS_PER_DRAW)
+
+    def ticket_rng(self):
+        """
+        Generator for ticket-level draws of the event engine.
+
+        Derived from the seed as a third child next to the inbound and
+        absence streams, so every call starts the same stream.
+        """
+        if self.seed is None:
+            raise ValueError("Common random numbers built from arrays have no ticket stream")
+        return np.random.default_rng(np.random.SeedSequence(self.seed.entropy, spawn_key=(*self.seed.spawn_key, 2)))
+
+    def check(self, days, n_replications):
+        """Raises ValueError if a run does not fit these draws."""
+        if days != self.days or n_replications != self.n_replications:
+            raise ValueError(
+                f"Common random numbers were drawn for {self.n_replications} replications x "
+                f"{self.days} days, got {n_replications} x {days}"
+            )
+
+    def absence_uniforms(self, n_draws, uniforms_per_draw):
+        """Uniforms of shape (n_replications, n_draws, uniforms_per_draw)."""
+        with self._lock:
+            missing = n_draws - len(self._absence_uniforms)
+            if missing > 0 and self._absence_rng is None:
+                raise ValueError(f"Only {len(self._absence_uniforms)} absence draws available, {n_draws} needed")
+            if missing > 0:
+                extra = self._absence_rng.random((missing, self.n_replications, ABSENCE_UNIFORMS_PER_DRAW))
+                self._absence_uniforms = np.concatenate([self._absence_uniforms, extra])
+            uniforms = self._absence_uniforms[:n_draws, :, :uniforms_per_draw]
+        return uniforms.transpose(1, 0, 2)
+
+
+def standard_normals(rng, shape):
+    """Standard normal inbound noise of ``shape`` from a Generator or common random numbers."""
+    if isinstance(rng, CommonRandomNumbers):
+        return rng.inbound_z.reshape(shape)
+    return rng.standard_normal(shape)
+
+
+def absence_uniforms(rng, n_replications, n_draws, uniforms_per_draw):
+    """Absence uniforms of shape (n_replications, n_draws, uniforms_per_draw) from any ``rng``."""
+    if isinstance(rng, CommonRandomNumbers):
+        return rng.absence_uniforms(n_draws, uniforms_per_draw)
+    return (np.random if rng is None else rng).random((n_replications, n_draws, uniforms_per_draw))
+
+
+def ticket_uniforms(rng, n_tickets, uniforms_per_ticket):
+    """Per-ticket uniforms of shape (n_tickets, uniforms_per_ticket) from any ``rng``."""
+    if isinstance(rng, CommonRandomNumbers):
+        rng = rng.ticket_rng()
+    return (np.random if rng is None else rng).random((n_tickets, uniforms_per_ticket))
+
+
+def is_standardized(rng):
+    """True if ``rng`` draws standardized values (Generator or common random numbers)."""
+    return isinstance(rng, (np.random.Generator, CommonRandomNumbers))
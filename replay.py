@@ -0,0 +1,161 @@
+"""
+Trace replay: recorded inbound and staffing through the daily model (``run_replay``).
+
+``run_simulation`` draws inbound from a lognormal generator and absences
+from an absence model. ``run_replay`` takes both from recorded series
+instead, e.g. last quarter's tickets and rosters, and runs the remaining
+``SIMULATION_STAGES`` (capacity, queue and metrics) unchanged. Results have
+the ``run_simulation`` columns and KPIs.
+
+Traces are used where they are:
+
+- ``inbound`` is one value per day;
+- ``availability`` is a per-agent (agents x days) matrix, non-zero where
+  the agent worked that day, or the per-day counts of present FT and PT
+  agents.
+
+Arrays, ``np.memmap`` views and ``.npy`` files (opened memory-mapped) are
+accepted without copying. A per-agent matrix is reduced to per-day counts in
+blocks of agent rows of at most ``block_bytes``, so a ten-year trace of
+thousands of agents is read once from disk and never held in memory as a
+whole, let alone as a table.
+"""
+from pathlib import Path
+
+import numpy as np
+
+from profiling import section
+from schedules import resolve_params
+from simulation import (
+    SIMULATION_STAGES,
+    _simulation_frame,
+    _simulation_result,
+    _timed_stage,
+    simulation_defaults,
+)
+
+# run_simulation parameters that the traces replace, or that only other engines take
+REPLAY_EXCLUDED_PARAMS = (
+    'days', 'avg_daily_tickets', 'volatility', 'full_time_agents', 'part_time_agents', 'vacation_rate',
+    'absence_model', 'rng', 'engine', 'arrival_curve', 'shift_coverage', 'resolution',
+)
+
+# Bytes of a per-agent availability matrix reduced at a time
+DEFAULT_BLOCK_BYTES = 64 * 1024 ** 2
+
+
+def _trace(values):
+    """``values`` as an array without copying; ``.npy`` paths are memory-mapped."""
+    if isinstance(values, (str, Path)):
+        return np.load(values, mmap_mode='r')
+    return np.asarray(values)
+
+
+def available_agents(availability, full_time_agents=None, block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    FT and PT agents present per day.
+
+    Parameters:
+    -----------
+    availability : array-like, path or dict
+        (agents x days) matrix, non-zero where an agent is present. Rows
+        ``[0, full_time_agents)`` are full-time agents, the rest part-time.
+        A dict ``{'FT': ..., 'PT': ...}`` gives the per-day counts directly.
+    full_time_agents : int, optional
+        Full-time rows of the matrix; None counts every row as full-time
+    block_bytes : int
+        Upper bound of the matrix rows reduced at a time
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (ft_available, pt_available), each of shape (days,)
+    """
+    if isinstance(availability, dict):
+        unknown = set(availability) - {'FT', 'PT'}
+        if unknown:
+            raise ValueError(f"Unknown availability groups {sorted(unknown)}, expected 'FT' and 'PT'")
+        ft_available, pt_available = (_trace(availability.get(group, 0)) for group in ('FT', 'PT'))
+        ft_available, pt_available = np.broadcast_arrays(ft_available, pt_available)
+        return ft_available.astype(np.int64, copy=False), pt_available.astype(np.int64, copy=False)
+
+    matrix = _trace(availability)
+    if matrix.ndim != 2:
+        raise ValueError(f"Availability must be an (agents x days) matrix, got shape {matrix.shape}")
+    n_agents, days = matrix.shape
+    full_time_agents = n_agents if full_time_agents is None else full_time_agents
+    if not 0 <= full_time_agents <= n_agents:
+        raise ValueError(f"full_time_agents must be between 0 and {n_agents}, got {full_time_agents}")
+
+    # Contiguous row blocks: each block of a memory-mapped file is read once and released
+    rows_per_block = max(1, block_bytes // max(days * matrix.itemsize, 1))
+    counts = np.zeros((2, days), dtype=np.int64)
+    for group, (start, stop) in enumerate(((0, full_time_agents), (full_time_agents, n_agents))):
+        for block_start in range(start, stop, rows_per_block):
+            block = matrix[block_start:min(block_start + rows_per_block, stop)]
+            counts[group] += np.count_nonzero(block, axis=0)
+    return counts[0], counts[1]
+
+
+def run_replay(inbound, availability, full_time_agents=None, start_date=None, as_frame=True,
+               block_bytes=DEFAULT_BLOCK_BYTES, **params):
+    """
+    Replays recorded inbound and staffing through the daily model.
+
+    Parameters:
+    -----------
+    inbound : array-like or path
+        Raw inbound tickets per day, before automation (use
+        ``automation_rate=0`` for series that are already net); its length
+        sets the horizon
+    availability : array-like, path or dict
+        Per-agent (agents x days) presence or per-day FT/PT counts, see
+        ``available_agents``
+    full_time_agents : int, optional
+        Full-time rows of a per-agent matrix; None counts every row as
+        full-time
+    start_date : date-like, optional
+        Date of the first trace day. Defaults to today.
+    as_frame : bool
+        False returns the compact ``SimulationResult`` instead of the table
+    block_bytes : int
+        Upper bound of the matrix rows reduced at a time
+    **params
+        Other ``run_simulation`` parameters: efficiency, part-time hours,
+        complexity, automation and queue policy, constant or varying by
+        day (see ``schedules.py``). Parameters that the traces replace (see
+        ``REPLAY_EXCLUDED_PARAMS``) are rejected.
+
+    Returns:
+    --------
+    pd.DataFrame or SimulationResult
+        The ``run_simulation`` output for the trace
+    """
+    defaults = simulation_defaults()
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise TypeError(f"run_replay() got unexpected parameters: {sorted(unknown)}")
+    replaced = set(params) & set(REPLAY_EXCLUDED_PARAMS)
+    if replaced:
+        raise TypeError(f"run_replay() takes {sorted(replaced)} from the traces or does not support them")
+
+    raw_inbound = _trace(inbound)
+    if raw_inbound.ndim != 1:
+        raise ValueError(f"Inbound must have one value per day, got shape {raw_inbound.shape}")
+    with section('replay: availability'):
+        ft_available, pt_available = available_agents(availability, full_time_agents, block_bytes)
+    if ft_available.shape != raw_inbound.shape:
+        raise ValueError(f"Availability covers {ft_available.shape[-1]} days, inbound {len(raw_inbound)}")
+
+    p = resolve_params({**defaults, **params, 'days': len(raw_inbound), 'start_date': start_date})
+    paths = {
+        # Floats for the queue stages; a float trace is used as is
+        'raw_inbound': raw_inbound.astype(float, copy=False),
+        'ft_agents_available': ft_available,
+        'pt_agents_available': pt_available,
+    }
+    # Every stage after the draws, as in run_simulation
+    for name, stage, _ in SIMULATION_STAGES[1:]:
+        paths = {**paths, **_timed_stage(name, stage, paths, p, None)}
+    with section('result'):
+        return _simulation_frame(paths, start_date) if as_frame else _simulation_result(paths, start_date)
@@ -0,0 +1,349 @@
+"""
+Result cache for simulation runs.
+
+Streamlit reruns a page script on every widget interaction, e.g. a language
+switch, so pages ask this cache instead of calling the simulation directly.
+Entries are keyed on normalized parameters: the complexity mix is scaled to
+sum to 1 and floats are rounded to ``FLOAT_DECIMALS``, so values that only
+differ by float noise share an entry. A run is cacheable only if it is
+reproducible: ``rng`` must be a seed or seeded common random numbers, and
+the start date is fixed (today if not given).
+
+Final results and the intermediate outputs of every pipeline stage
+(``SIMULATION_STAGES``: draws, capacity, queue, metrics, and ages where
+they are reported) are stored
+separately. A slider that only feeds a later stage, e.g. agent efficiency,
+reuses the stored random draws and recomputes only from its own stage on.
+
+``iter_cached_monte_carlo`` yields Monte Carlo results for growing
+replication counts, for pages that show partial results while a background
+job refines them.
+
+The cache lives at module level, so it is shared by all pages and sessions
+of one Streamlit server. Least recently used entries are evicted once the
+stored results exceed ``max_bytes``.
+"""
+import dataclasses
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+from cohorts import age_frame, ticket_age_distribution
+from comparison import ScenarioComparison, run_comparison
+from random_streams import CommonRandomNumbers
+from schedules import resolve_params
+from simulation import (
+    MonteCarloResult,
+    SimulationResult,
+    _monte_carlo_result,
+    _read_only,
+    _run_stages,
+    _simulation_frame,
+    _simulation_result,
+    _start_timestamp,
+    run_monte_carlo,
+    run_simulation,
+    simulation_defaults,
+)
+
+# Floats closer than this many decimals map to the same cache entry
+FLOAT_DECIMALS = 9
+
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+
+# Replication counts of the partial results of ``iter_cached_monte_carlo``
+PROGRESSIVE_REPLICATIONS = (100, 1000, 10000)
+
+
+def _freeze(value):
+    """Hashable, normalized form of a parameter value."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return round(float(value), FLOAT_DECIMALS) + 0.0
+    if isinstance(value, np.ndarray):
+        return ('array', value.shape, _freeze(value.tolist()))
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, str):
+        return value
+    # Model objects such as absence models: class plus attributes
+    return (type(value).__name__, _freeze(vars(value)))
+
+
+def _rng_key(rng):
+    """Cache key for ``rng``, or None if the run is not reproducible."""
+    if isinstance(rng, (int, np.integer)):
+        return ('seed', int(rng))
+    if isinstance(rng, CommonRandomNumbers) and rng.seed is not None:
+        return ('crn', rng.seed.entropy, rng.seed.spawn_key, rng.days, rng.n_replications)
+    return None
+
+
+def normalize_params(params):
+    """
+    Full ``run_simulation`` parameters with the complexity mix normalized,
+    the start date fixed and schedules resolved to per-day arrays.
+    """
+    p = {**simulation_defaults(), **params}
+    p['start_date'] = _start_timestamp(p['start_date'])
+    p = resolve_params(p)
+    total = sum(p['complexity_mix'].values())
+    if np.all(np.asarray(total) > 0):
+        p['complexity_mix'] = {level: share / total for level, share in p['complexity_mix'].items()}
+    return p
+
+
+def _result_nbytes(result):
+    """Memory held by a cached result."""
+    # Imported here: pages import this module before they run anything
+    import pandas as pd
+
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(deep=True).sum())
+    if isinstance(result, MonteCarloResult):
+        return _result_nbytes(result.bands) + _result_nbytes(result.kpis)
+    if isinstance(result, SimulationResult):
+        return result.nbytes
+    if isinstance(result, ScenarioComparison):
+        frames = [result.differences, *result.ages.values()]
+        return sum(map(_result_nbytes, [*result.results.values(), *frames]))
+    if isinstance(result, dict):
+        return sum(np.asarray(value).nbytes for value in result.values())
+    if isinstance(result, str):
+        # Figure JSON (charts.py)
+        return len(result)
+    raise TypeError(f"Cannot cache results of type {type(result).__name__}")
+
+
+def _copy_result(result):
+    """Copy handed out to callers, so page code can add columns safely."""
+    import pandas as pd
+
+    if isinstance(result, pd.DataFrame):
+        return result.copy()
+    if isinstance(result, (dict, SimulationResult, str)):
+        # Stage outputs and columnar results are read-only arrays and shared as is
+        return result
+    if isinstance(result, ScenarioComparison):
+        return dataclasses.replace(
+            result,
+            results={name: _copy_result(value) for name, value in result.results.items()},
+            differences=result.differences.copy(),
+            ages={name: ages.copy() for name, ages in result.ages.items()},
+        )
+    return dataclasses.replace(result, bands=result.bands.copy(), kpis=result.kpis.copy())
+
+
+class SimulationCache:
+    """
+    Thread-safe LRU cache of simulation results with a memory ceiling.
+
+    Parameters:
+    -----------
+    max_bytes : int
+        Upper bound for the memory of all stored results. Results larger
+        than the bound are returned but not stored.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stage_hits = 0
+        self.stage_misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute, stage=False):
+        """
+        Returns the cached result for ``key``, calling ``compute()`` on a miss.
+
+        ``stage`` counts the lookup as an intermediate pipeline stage rather
+        than a final result.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                if stage:
+                    self.stage_hits += 1
+                else:
+                    self.hits += 1
+                return _copy_result(self._entries[key][0])
+            if stage:
+                self.stage_misses += 1
+            else:
+                self.misses += 1
+
+        # Compute outside the lock so other sessions are not blocked
+        result = compute()
+        nbytes = _result_nbytes(result)
+        with self._lock:
+            if nbytes <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (result, nbytes)
+                self._nbytes += nbytes
+                self._evict()
+        return _copy_result(result)
+
+    def resize(self, max_bytes):
+        """Changes the memory ceiling, evicting entries if needed."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _evict(self):
+        while self._nbytes > self.max_bytes:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            self.evictions += 1
+
+    def stats(self):
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stage_hits': self.stage_hits,
+                'stage_misses': self.stage_misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._nbytes,
+            }
+
+
+class _StageMemo:
+    """
+    ``memoize`` hook for ``_run_stages``: stores each stage output in ``cache``.
+
+    A stage key chains the key of the previous stage with the stage's own
+    normalized parameters, so it covers everything the stage depends on.
+    """
+
+    def __init__(self, cache, n_replications, rng_key):
+        self.cache = cache
+        self.key = ('stages', n_replications, rng_key)
+
+    def __call__(self, name, stage_params, compute):
+        self.key = (self.key, name, _freeze({k: v for k, v in stage_params.items() if k != 'rng'}))
+        return self.cache.get_or_compute(self.key, lambda: _read_only(compute()), stage=True)
+
+
+# Shared by all pages of the app
+SIMULATION_CACHE = SimulationCache()
+
+
+def cached_run_simulation(cache=SIMULATION_CACHE, **params):
+    """``run_simulation`` through ``cache``; runs without a seed bypass it."""
+    p = normalize_params(params)
+    rng_key = _rng_key(p['rng'])
+    if rng_key is None:
+        return run_simulation(**p)
+    key = ('run_simulation', rng_key, _freeze({k: v for k, v in p.items() if k != 'rng'}))
+    if p['engine'] != 'daily':
+        # Only the daily engine runs as memoizable stages
+        return cache.get_or_compute(key, lambda: run_simulation(**p))
+
+    def compute():
+        paths = _run_stages(None, p, _StageMemo(cache, None, rng_key))
+        if p['as_frame']:
+            return _simulation_frame(paths, p['start_date'])
+        return _simulation_result(paths, p['start_date'])
+    return cache.get_or_compute(key, compute)
+
+
+def _monte_carlo_key(n_replications, percentiles, p):
+    rng_key = _rng_key(p['rng'])
+    if rng_key is None:
+        return None
+    return (
+        'run_monte_carlo', n_replications, _freeze(percentiles), rng_key,
+        _freeze({k: v for k, v in p.items() if k != 'rng'})
+    )
+
+
+def monte_carlo_key(n_replications=1000, percentiles=(5, 50, 95), **params):
+    """Cache key of ``cached_run_monte_carlo``, None for runs that bypass the cache."""
+    return _monte_carlo_key(n_replications, percentiles, normalize_params(params))
+
+
+def cached_run_monte_carlo(n_replications=1000, percentiles=(5, 50, 95), cache=SIMULATION_CACHE, **params):
+    """``run_monte_carlo`` through ``cache``; runs without a seed bypass it."""
+    p = normalize_params(params)
+    key = _monte_carlo_key(n_replications, percentiles, p)
+    if key is None:
+        return run_monte_carlo(n_replications, percentiles, **p)
+    return cache.get_or_compute(key, lambda: _monte_carlo_result(
+        _run_stages(n_replications, p, _StageMemo(cache, n_replications, _rng_key(p['rng'])), ages=True),
+        percentiles, p['start_date']
+    ))
+
+
+def iter_cached_monte_carlo(n_replications=1000, percentiles=(5, 50, 95), steps=PROGRESSIVE_REPLICATIONS,
+                            cache=SIMULATION_CACHE, **params):
+    """
+    Progressive ``cached_run_monte_carlo``: runs every replication count of
+    ``steps`` below ``n_replications``, then ``n_replications`` itself.
+
+    Each step is a complete run with its own seed-determined draws, so it
+    equals (and is cached as) ``cached_run_monte_carlo`` with that count.
+    The smaller steps add about a tenth of the final step's work.
+
+    Yields:
+    -------
+    tuple
+        ``(replications, MonteCarloResult)`` per step
+    """
+    for n in [step for step in steps if step < n_replications] + [n_replications]:
+        yield n, cached_run_monte_carlo(n, percentiles, cache, **params)
+
+
+def cached_ticket_age_distribution(cache=SIMULATION_CACHE, **params):
+    """
+    ``ticket_age_distribution`` through ``cache``; runs without a seed bypass it.
+
+    Daily runs read the ages from the memoized stages, so after
+    ``cached_run_simulation`` with the same parameters nothing is recomputed.
+    """
+    p = normalize_params(params)
+    rng_key = _rng_key(p['rng'])
+    if rng_key is None:
+        return ticket_age_distribution(**p)
+    key = ('ticket_age_distribution', rng_key, _freeze({k: v for k, v in p.items() if k != 'rng'}))
+    if p['engine'] != 'daily':
+        return cache.get_or_compute(key, lambda: ticket_age_distribution(**p))
+
+    def compute():
+        paths = _run_stages(None, p, _StageMemo(cache, None, rng_key), ages=True)
+        return age_frame(paths['solved_by_age'], paths['open_by_age'], paths['age_hours'])
+    return cache.get_or_compute(key, compute)
+
+
+def cached_run_comparison(scenarios, n_replications=500, seed=None, baseline=None, confidence=0.95,
+                          cache=SIMULATION_CACHE, **shared):
+    """``run_comparison`` through ``cache``; runs without a seed bypass it."""
+    p = normalize_params(shared)
+    del p['rng']
+    if seed is None:
+        return run_comparison(scenarios, n_replications, seed, baseline, confidence, **p)
+    key = (
+        'run_comparison', n_replications, int(seed), baseline, _freeze(confidence), _freeze(p),
+        tuple((name, _freeze(params)) for name, params in scenarios.items())
+    )
+    return cache.get_or_compute(
+        key, lambda: run_comparison(scenarios, n_replications, seed, baseline, confidence, **p)
+    )
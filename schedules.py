@@ -0,0 +1,234 @@
+"""
+Time-varying parameters: per-day arrays and piecewise ``Schedule`` objects.
+
+The daily model takes the parameters of ``TIME_VARYING_PARAMS`` either as
+a scalar for the whole horizon or as one value per day, e.g. a hiring ramp,
+an automation rollout or a weekly inbound profile. A value per day is
+given as an array of shape (days,) or as a compact ``Schedule``:
+
+- ``Schedule.steps({0: 5, 60: 8})``: 5 agents, 8 from day 60 on;
+- ``Schedule.ramp({'2025-01-01': 0.1, '2025-04-01': 0.4})``: automation
+  rising linearly over the first quarter;
+- ``Schedule.weekly([...])`` and ``Schedule.monthly([...])``: profiles by
+  weekday (Monday first) and by calendar month.
+
+Schedules multiply with numbers and with each other, so
+``120 * Schedule.weekly(week) * Schedule.monthly(season)`` is a seasonal
+inbound profile. Points of ``steps`` and ``ramp`` are day offsets or dates.
+
+``resolve_params`` turns schedules into arrays for the horizon once per
+run; scalars are left untouched, so constant scenarios run exactly as
+before. The stages then compute with (days,) arrays that broadcast against
+the (replications, days) draws, and a time-varying run costs the same
+array operations as a constant one.
+"""
+import numpy as np
+
+# run_simulation parameters that may vary by day; complexity_mix per level
+TIME_VARYING_PARAMS = (
+    'avg_daily_tickets', 'volatility', 'full_time_agents', 'part_time_agents', 'agent_efficiency',
+    'part_time_hours', 'automation_rate', 'complexity_mix',
+)
+
+# Headcounts are whole agents; per-day values are rounded
+HEADCOUNT_PARAMS = ('full_time_agents', 'part_time_agents')
+
+
+class Schedule:
+    """
+    Piecewise per-day values of one parameter.
+
+    Build schedules with the class methods (``steps``, ``ramp``, ``weekly``,
+    ``monthly``) and combine them with ``*``.
+
+    Attributes:
+    -----------
+    kind : str
+        ``'steps'``, ``'ramp'``, ``'weekly'``, ``'monthly'`` or ``'product'``
+    points : tuple
+        ``(day, value)`` pairs of ``steps`` and ``ramp``, with days as int
+        offsets or ISO dates; the values of a profile; the factors of a
+        product
+    """
+
+    def __init__(self, kind, points):
+        self.kind = kind
+        self.points = points
+
+    @classmethod
+    def _piecewise(cls, kind, points):
+        if not points:
+            raise ValueError(f"A {kind} schedule needs at least one point")
+        return cls(kind, tuple((_point_key(day), float(value)) for day, value in dict(points).items()))
+
+    @classmethod
+    def steps(cls, points):
+        """Each value holds from its day until the next point; the first one also before it."""
+        return cls._piecewise('steps', points)
+
+    @classmethod
+    def ramp(cls, points):
+        """Linear between the points, constant before the first and after the last one."""
+        return cls._piecewise('ramp', points)
+
+    @classmethod
+    def weekly(cls, values):
+        """One value per weekday, Monday first."""
+        return cls._profile('weekly', values, 7)
+
+    @classmethod
+    def monthly(cls, values):
+        """One value per calendar month, January first."""
+        return cls._profile('monthly', values, 12)
+
+    @classmethod
+    def _profile(cls, kind, values, length):
+        values = tuple(float(value) for value in values)
+        if len(values) != length:
+            raise ValueError(f"A {kind} schedule needs {length} values, got {len(values)}")
+        return cls(kind, values)
+
+    def __mul__(self, other):
+        if not isinstance(other, (Schedule, int, float, np.integer, np.floating)):
+            return NotImplemented
+        return Schedule('product', _factors(self) + _factors(other))
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return f"Schedule({self.kind!r}, {self.points!r})"
+
+    def values(self, days, start_date=None):
+        """
+        Value of each day.
+
+        Parameters:
+        -----------
+        days : int
+            Length of the horizon
+        start_date : date-like, optional
+            Date of the first day, which places dates and profiles; today if
+            None
+
+        Returns:
+        --------
+        np.ndarray
+            Shape (days,)
+        """
+        if self.kind == 'product':
+            result = np.ones(days)
+            for factor in self.points:
+                result = result * (factor.values(days, start_date) if isinstance(factor, Schedule) else factor)
+            return result
+        if self.kind in ('weekly', 'monthly'):
+            dates = _dates(days, start_date)
+            index = dates.weekday if self.kind == 'weekly' else dates.month - 1
+            return np.asarray(self.points)[np.asarray(index)]
+
+        start = _dates(1, start_date)[0] if any(isinstance(day, str) for day, _ in self.points) else None
+        offsets = np.array([day if isinstance(day, int) else (_timestamp(day) - start).days for day, _ in self.points])
+        order = np.argsort(offsets, kind='stable')
+        offsets, values = offsets[order], np.array([value for _, value in self.points])[order]
+        if len(np.unique(offsets)) < len(offsets):
+            raise ValueError(f"Schedule has several values for the same day: {self!r}")
+        day = np.arange(days)
+        if self.kind == 'ramp':
+            return np.interp(day, offsets, values)
+        return values[np.maximum(np.searchsorted(offsets, day, side='right') - 1, 0)]
+
+
+def _factors(value):
+    """Factors of a product with ``value``; products are flattened."""
+    if not isinstance(value, Schedule):
+        return (float(value),)
+    return value.points if value.kind == 'product' else (value,)
+
+
+def _point_key(day):
+    """Day offsets stay ints, dates become ISO strings (hashable and cacheable)."""
+    if isinstance(day, (int, np.integer)):
+        return int(day)
+    return _timestamp(day).date().isoformat()
+
+
+def _timestamp(value):
+    import pandas as pd
+
+    return pd.Timestamp(value).normalize()
+
+
+def _dates(days, start_date):
+    import pandas as pd
+
+    start = pd.Timestamp.now() if start_date is None else pd.Timestamp(start_date)
+    return pd.date_range(start=start.normalize(), periods=days, freq='D')
+
+
+def is_time_varying(value):
+    """True for a ``Schedule``, a per-day array or a complexity mix holding one."""
+    if isinstance(value, (int, float)):
+        # Plain numbers are the common case; np.ndim costs more than the check
+        return False
+    if isinstance(value, dict):
+        return any(is_time_varying(item) for item in value.values())
+    return isinstance(value, Schedule) or np.ndim(value) > 0
+
+
+def time_varying_params(p):
+    """Names of the parameters in ``p`` that vary by day."""
+    return [name for name in TIME_VARYING_PARAMS if name in p and is_time_varying(p[name])]
+
+
+def resolve_value(value, days, start_date=None, name='value'):
+    """
+    ``value`` for a horizon of ``days``: a scalar as is, a ``Schedule`` or
+    array-like as a float array of shape (days,).
+    """
+    if isinstance(value, Schedule):
+        return value.values(days, start_date)
+    if np.ndim(value) == 0:
+        return value
+    values = np.asarray(value, dtype=float)
+    if values.shape != (days,):
+        raise ValueError(f"{name} must have one value per day, shape ({days},), got {values.shape}")
+    return values
+
+
+def resolve_params(p):
+    """
+    ``p`` with every time-varying parameter resolved for ``p['days']``
+    from ``p['start_date']``.
+
+    Scalars are kept, so a constant run is unchanged. Per-day headcounts
+    are rounded to whole agents. Returns ``p`` itself if nothing varies.
+    """
+    names = time_varying_params(p)
+    if not names:
+        return p
+    days, start_date = p['days'], p['start_date']
+    resolved = dict(p)
+    for name in names:
+        if name == 'complexity_mix':
+            resolved[name] = {
+                level: resolve_value(share, days, start_date, f"complexity_mix[{level!r}]")
+                for level, share in p[name].items()
+            }
+            continue
+        values = resolve_value(p[name], days, start_date, name)
+        if name in HEADCOUNT_PARAMS:
+            values = np.rint(values).astype(np.int64)
+            if (values < 0).any():
+                raise ValueError(f"{name} must not be negative")
+        resolved[name] = values
+    return resolved
+
+
+def slice_params(p, start, stop):
+    """Resolved ``p`` for days ``[start, stop)`` of its horizon."""
+    sliced = dict(p)
+    for name in time_varying_params(p):
+        if name == 'complexity_mix':
+            sliced[name] = {level: share[start:stop] if np.ndim(share) else share for level, share in p[name].items()}
+        else:
+            sliced[name] = p[name][start:stop]
+    return sliced
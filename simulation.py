@@ -1,5 +1,476 @@
+import inspect
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
+
+# pandas is imported by the functions that build tables and dates, so
+# ``import simulation`` (and every worker process) only pays for NumPy
+if TYPE_CHECKING:
+    import pandas as pd
+
+from absence import AbsenceSchedule, UniformAbsences, count_absences, employed_keys
+from profiling import section
+from random_streams import CommonRandomNumbers, is_standardized, legacy_state, resolve_rng, standard_normals
+from schedules import resolve_params, time_varying_params
+
+# Simulation constants
+HOURS_PER_DAY = 8  # Operating hours for full-time agents
+REACTION_TIME_HOURS = 0.5  # Minimum time before an agent picks up a ticket
+NO_CAPACITY_WAIT_DAYS = 999  # Queue wait reported when there is no capacity
+
+# run_simulation parameters the event engine does not take
+EVENT_EXCLUDED_PARAMS = ('engine', 'queue_policy', 'priority_mix')
+
+
+def _lognormal_params(avg_daily_tickets, volatility):
+    """
+    Returns (mu, sigma) of a lognormal distribution with the given mean and
+    coefficient of variation.
+    """
+    sigma = np.sqrt(np.log(1 + volatility**2))
+    mu = np.log(avg_daily_tickets) - 0.5 * sigma**2
+    return mu, sigma
+
+
+def _draw_inbound(days, avg_daily_tickets, volatility, n_replications=None, rng=None):
+    """
+    Draws the raw daily inbound series.
+
+    With ``n_replications`` the result has shape (n_replications, days).
+    The global or a ``RandomState`` draws lognormal values directly;
+    Generators and common random numbers provide standard normals that are
+    scaled to the scenario's lognormal parameters. ``avg_daily_tickets``
+    and ``volatility`` may be arrays of shape (days,); a day without
+    tickets or volatility gets exactly its average.
+    """
+    size = days if n_replications is None else (n_replications, days)
+    if np.any(np.asarray(volatility) > 0):
+        with np.errstate(divide='ignore'):
+            mu, sigma = _lognormal_params(avg_daily_tickets, volatility)
+        if is_standardized(rng):
+            return np.exp(mu + sigma * standard_normals(rng, size))
+        return legacy_state(rng).lognormal(mu, sigma, size=size)
+    if np.ndim(avg_daily_tickets):
+        return np.broadcast_to(np.asarray(avg_daily_tickets, dtype=float), size).copy()
+    return np.full(size, float(avg_daily_tickets))
+
+
+def _require_constant(p, caller):
+    """Rejects time-varying parameters (see ``schedules.py``) where only the daily model takes them."""
+    varying = time_varying_params(p)
+    if varying:
+        raise ValueError(f"{caller} does not support time-varying {varying}")
+
+
+def _resolve_run_rng(rng, days, n_replications):
+    """Resolves ``rng`` for one run and checks common random numbers fit it."""
+    rng = resolve_rng(rng)
+    if isinstance(rng, CommonRandomNumbers):
+        rng.check(days, n_replications)
+    return rng
+
+
+def _round(values, decimals):
+    """
+    Rounds like Python's ``round()`` on every element.
+
+    ``np.round`` scales by a power of ten before rounding, which can flip
+    values that sit on a decimal tie (e.g. 0.645). Those near-ties are few
+    distinct values, so they are re-rounded one by one.
+    """
+    rounded = np.round(values, decimals)
+    scaled = values * 10**decimals
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        ties, inverse = np.unique(values[near_tie], return_inverse=True)
+        rounded[near_tie] = np.array([round(value, decimals) for value in ties.tolist()])[inverse]
+    return rounded
+
+
+def _simulation_dates(days, start_date=None):
+    """Daily date index starting at ``start_date`` (today if None)."""
+    import pandas as pd
+
+    return pd.date_range(start=_start_timestamp(start_date), periods=days, freq='D')
+
+
+def _start_timestamp(start_date=None):
+    """First simulated day as a midnight ``pd.Timestamp`` (today if None)."""
+    import pandas as pd
+
+    if start_date is None:
+        # Use current date as start
+        start_date = pd.Timestamp.now()
+    return pd.Timestamp(start_date).normalize()
+
+
+def _avg_complexity_factor(complexity_mix, complexity_factors):
+    """Weighted average time multiplier of the ticket mix."""
+    return (
+        complexity_mix['Low'] * complexity_factors['Low'] +
+        complexity_mix['Medium'] * complexity_factors['Medium'] +
+        complexity_mix['High'] * complexity_factors['High']
+    )
+
+
+def _process_queue(actual_inbound, daily_capacity_tickets, initial_backlog=0.0):
+    """
+    Runs the backlog recursion ``backlog = max(0, backlog + inbound - capacity)``
+    as an array operation along the last axis.
+
+    The recursion is a Lindley process: with ``S`` the cumulative net flow
+    (inbound - capacity), the end-of-day backlog is ``S - min(0, running_min(S))``.
+    An ``initial_backlog`` (shape of the inputs without the day axis) is the
+    queue before the first day; it shifts ``S`` up and is never negative,
+    so the same formula holds.
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (solved, backlog) with the same shape as the inputs.
+    """
+    initial_backlog = np.asarray(initial_backlog, dtype=float)[..., None]
+    net_flow = initial_backlog + np.cumsum(actual_inbound - daily_capacity_tickets, axis=-1)
+    running_min = np.minimum.accumulate(net_flow, axis=-1)
+    backlog = np.maximum(net_flow - np.minimum(running_min, 0.0), 0.0)
+
+    previous_backlog = np.empty_like(backlog)
+    previous_backlog[..., :1] = initial_backlog
+    previous_backlog[..., 1:] = backlog[..., :-1]
+    solved = np.minimum(previous_backlog + actual_inbound, daily_capacity_tickets)
+    return solved, backlog
+
+
+def _wait_time_days(backlog, daily_capacity_tickets, avg_complexity_factor, agent_efficiency):
+    """
+    Estimated wait time in days: queue wait plus processing and reaction time.
+    """
+    # Queue wait time (in days): backlog / daily capacity
+    # This represents how many days it would take to clear the current backlog
+    has_capacity = daily_capacity_tickets > 0
+    queue_wait_days = np.divide(
+        backlog, daily_capacity_tickets,
+        out=np.full(np.shape(backlog), float(NO_CAPACITY_WAIT_DAYS)),
+        where=has_capacity
+    )
+
+    # Processing time per ticket (in hours)
+    # Average time to process one ticket = (avg_complexity_factor / agent_efficiency)
+    processing_time_hours = _processing_hours(avg_complexity_factor, agent_efficiency)
+
+    return queue_wait_days + (processing_time_hours + REACTION_TIME_HOURS) / 24.0
+
+
+def _processing_hours(complexity_factor, agent_efficiency):
+    """
+    Hours to process one ticket, 0 without efficiency. ``agent_efficiency``
+    may be an array, e.g. one value per row in ``run_comparison``.
+    """
+    if np.ndim(agent_efficiency) == 0:
+        return complexity_factor / agent_efficiency if agent_efficiency > 0 else 0
+    agent_efficiency = np.asarray(agent_efficiency, dtype=float)
+    return np.divide(
+        complexity_factor, agent_efficiency,
+        out=np.zeros(np.broadcast_shapes(np.shape(complexity_factor), agent_efficiency.shape)),
+        where=agent_efficiency > 0
+    )
+
+
+def _agent_rows(p):
+    """
+    (full-time, part-time) agent rows of the absence draws: the headcounts,
+    or their maximum over the horizon when they vary by day.
+    """
+    return tuple(
+        int(np.max(p[name])) if np.ndim(p[name]) else p[name] for name in ('full_time_agents', 'part_time_agents')
+    )
+
+
+def _draw_stage(paths, p, n_replications):
+    """
+    Stage 1: random draws. Inbound series and agents available per day.
+
+    ``n_replications=None`` is a single run with 1D arrays; otherwise arrays
+    have shape (n_replications, days).
+    """
+    days = p['days']
+    rng = _resolve_run_rng(p['rng'], days, n_replications or 1)
+
+    # Pre-calculate absence schedule for more realistic vacation modeling
+    # Instead of binomial per day, we model planned absences more realistically
+    # Each agent has a certain number of absent days over the period
+    full_time_agents, part_time_agents = _agent_rows(p)
+    total_agents = full_time_agents + part_time_agents
+    # A headcount schedule draws absences for the largest team and keeps those of employed agents
+    varying_headcount = np.ndim(p['full_time_agents']) or np.ndim(p['part_time_agents'])
+    absence_model = p['absence_model'] or UniformAbsences()
+    with section('absences'):
+        if n_replications is None:
+            absence_keys = absence_model.draw_keys(total_agents, days, p['vacation_rate'], rng=rng)
+            if varying_headcount:
+                absence_keys = employed_keys(absence_keys, total_agents, full_time_agents, days,
+                                             p['full_time_agents'], p['part_time_agents'])
+            absence_schedule = AbsenceSchedule.from_keys(absence_keys, total_agents, days)
+            # Count available agents per day with one reduction over the absence schedule
+            ft_absent, pt_absent = absence_schedule.absent_counts(full_time_agents)
+        else:
+            absence_keys = absence_model.draw_keys(total_agents, days, p['vacation_rate'], n_replications, rng=rng)
+            if varying_headcount:
+                absence_keys = employed_keys(absence_keys, total_agents, full_time_agents, days,
+                                             p['full_time_agents'], p['part_time_agents'])
+            ft_absent, pt_absent = count_absences(absence_keys, total_agents, full_time_agents, days, n_replications)
+
+    # 1. Inbound Tickets
+    # Use lognormal distribution for more realistic traffic modeling
+    # Lognormal ensures non-negative values and realistic right-skewed distribution
+    with section('inbound'):
+        raw_inbound = _draw_inbound(days, p['avg_daily_tickets'], p['volatility'], n_replications, rng=rng)
+
+    return {
+        'raw_inbound': raw_inbound,
+        'ft_agents_available': p['full_time_agents'] - ft_absent,
+        'pt_agents_available': p['part_time_agents'] - pt_absent,
+    }
+
+
+def _capacity_stage(paths, p, n_replications):
+    """Stage 2: daily capacity in tickets from available agents, efficiency and complexity."""
+    # 3. Calculate Effective Capacity
+    # Total agent hours available
+    total_hours = (paths['ft_agents_available'] * HOURS_PER_DAY) + (paths['pt_agents_available'] * p['part_time_hours'])
+
+    # 4. Adjust for Complexity
+    # Weighted average complexity factor: how much longer an "average" ticket
+    # takes compared to baseline
+    avg_complexity_factor = _avg_complexity_factor(p['complexity_mix'], p['complexity_factors'])
+
+    # Effective capacity in terms of tickets (accounting for complexity)
+    # Base capacity: total_hours * agent_efficiency (for complexity factor 1.0)
+    # Adjusted for actual complexity: divide by avg_complexity_factor
+    work_capacity = total_hours * p['agent_efficiency']
+    daily_capacity_tickets = np.divide(
+        work_capacity, avg_complexity_factor,
+        out=np.zeros(np.broadcast_shapes(np.shape(work_capacity), np.shape(avg_complexity_factor))),
+        where=np.asarray(avg_complexity_factor) > 0
+    )
+
+    return {
+        'daily_capacity_tickets': daily_capacity_tickets,
+        'avg_complexity_factor': avg_complexity_factor,
+        'work_capacity': work_capacity,
+    }
+
+
+def _queue_stage(paths, p, n_replications):
+    """
+    Stage 3: automation deflection and the backlog recursion.
+
+    The queue starts empty unless ``paths`` holds ``carried_backlog``
+    (tickets) or, with a queue policy, ``carried_class_work`` (work units
+    per class and arrival day) from a previous stretch of days.
+    """
+    # 2. Automation Deflection
+    actual_inbound = paths['raw_inbound'] * (1 - p['automation_rate'])
+
+    if p['queue_policy'] is not None:
+        queues = _class_queues(actual_inbound, paths['work_capacity'], p, paths.get('carried_class_work'))
+        return {'actual_inbound': actual_inbound, **queues}
+    if p['priority_mix'] is not None:
+        raise ValueError("priority_mix requires a queue_policy")
+
+    # 5. Process Tickets
+    # Solve as many tickets as capacity allows, carry the rest over
+    solved, new_backlog = _process_queue(
+        actual_inbound, paths['daily_capacity_tickets'], paths.get('carried_backlog', 0.0)
+    )
+    return {'actual_inbound': actual_inbound, 'solved': solved, 'backlog': new_backlog}
+
+
+def _class_queues(actual_inbound, work_capacity, p, carried_work=None):
+    """
+    Per-class backlogs under ``p['queue_policy']`` (see ``queue_policy.py``).
+
+    Class arrays have shape (..., classes, days); ``solved`` and ``backlog``
+    are their totals in tickets and ``backlog_work`` the queued work units.
+    ``carried_work`` (..., classes, arrival days) is queued work from before
+    the first day, oldest first.
+    """
+    # Imported here: queue_policy builds on this module's backlog recursion
+    from queue_policy import queue_classes
+
+    labels, shares, factors = queue_classes(p['complexity_mix'], p['complexity_factors'], p['priority_mix'])
+    # Shares are (classes,) or, with a time-varying complexity mix, (classes, days)
+    class_inbound = actual_inbound[..., None, :] * shares.reshape(len(labels), -1)
+    inbound_work = class_inbound * factors[:, None]
+    if carried_work is None:
+        solved_work, backlog_work = p['queue_policy'].serve(inbound_work, work_capacity, labels)
+    else:
+        # Carried work arrives on extra days without capacity ahead of the
+        # first one, in its arrival order, which gives every policy its starting queue
+        carried_days = carried_work.shape[-1]
+        inbound_work = np.concatenate([carried_work, inbound_work], axis=-1)
+        work_capacity = np.concatenate(
+            [np.zeros(np.shape(work_capacity)[:-1] + (carried_days,)), work_capacity], axis=-1
+        )
+        solved_work, backlog_work = p['queue_policy'].serve(inbound_work, work_capacity, labels)
+        solved_work, backlog_work = solved_work[..., carried_days:], backlog_work[..., carried_days:]
+
+    # Back to tickets; tickets that need no work are solved on arrival
+    has_work = (factors > 0)[:, None]
+    class_solved = np.divide(solved_work, factors[:, None], out=class_inbound.copy(), where=has_work)
+    class_backlog = np.divide(backlog_work, factors[:, None], out=np.zeros_like(class_inbound), where=has_work)
+    return {
+        'solved': class_solved.sum(axis=-2),
+        'backlog': class_backlog.sum(axis=-2),
+        'backlog_work': backlog_work.sum(axis=-2),
+        'queue_classes': labels,
+        'class_factors': factors,
+        'class_inbound': class_inbound,
+        'class_solved': class_solved,
+        'class_backlog': class_backlog,
+    }
+
+
+def _metrics_stage(paths, p, n_replications):
+    """Stage 4: wait-time estimates."""
+    return _wait_metrics(paths, p)
+
+
+def _ages_stage(paths, p, n_replications):
+    """Optional stage 5: real ticket ages, for the callers that report them."""
+    return _ticket_ages(paths, p['agent_efficiency'])
+
+
+def _wait_metrics(paths, p):
+    """Estimated wait per day, overall and per queue class."""
+    # 6. Calculate Wait Time Metrics
+    # Queue wait (backlog / capacity) plus processing and reaction time
+    backlog = paths['backlog']
+    if 'class_backlog' in paths:
+        # Queued work in average tickets: a priority policy shifts the backlog's complexity mix
+        factor = paths['avg_complexity_factor']
+        backlog = np.divide(paths['backlog_work'], factor, out=backlog.copy(), where=np.asarray(factor) > 0)
+    est_wait_time_days = _wait_time_days(
+        backlog, paths['daily_capacity_tickets'], paths['avg_complexity_factor'], p['agent_efficiency']
+    )
+    metrics = {'est_wait_time_days': est_wait_time_days, 'est_wait_time_hours': est_wait_time_days * 24}
+    if 'class_backlog' in paths:
+        metrics['class_wait_time_hours'] = _class_wait_time_hours(paths, p['agent_efficiency'])
+    return metrics
+
+
+def _ticket_ages(paths, agent_efficiency):
+    """
+    Real ticket ages from first-in, first-out cohorts (see ``cohorts.py``):
+    ``solved_by_age`` and ``open_by_age`` per age bucket, and ``age_hours``,
+    the mean wait of the tickets in each bucket.
+    """
+    # Imported here: cohorts builds on this module's constants
+    from cohorts import age_hours, track_cohorts
+
+    if 'class_inbound' in paths:
+        # First in, first out within each class, whatever the policy between classes
+        ages = track_cohorts(paths['class_inbound'], paths['class_solved'])
+        tickets = ages['solved_by_age'] + ages['open_by_age']
+        total = tickets.sum(axis=-2)
+        age_days = np.divide((ages['age_days'] * tickets).sum(axis=-2), total,
+                             out=ages['age_days'][..., 0, :].copy(), where=total > 0)
+        ages = {'solved_by_age': ages['solved_by_age'].sum(axis=-2),
+                'open_by_age': ages['open_by_age'].sum(axis=-2), 'age_days': age_days}
+    else:
+        ages = track_cohorts(paths['actual_inbound'], paths['solved'])
+    factor = paths['avg_complexity_factor']
+    processing_hours = _processing_hours(factor, agent_efficiency)
+    if np.shape(processing_hours)[-1:] not in ((), (1,)):
+        # Age buckets are not calendar days: a processing time that varies by
+        # day counts with its mean over the solved tickets, at unit efficiency
+        solved = paths['solved']
+        total = solved.sum(axis=-1, keepdims=True)
+        mean_hours = np.broadcast_to(np.mean(processing_hours, axis=-1, keepdims=True), total.shape).copy()
+        factor = np.divide((processing_hours * solved).sum(axis=-1, keepdims=True), total, out=mean_hours,
+                           where=total > 0)
+        agent_efficiency = 1.0
+    wait_hours = age_hours(ages.pop('age_days'), factor, agent_efficiency)
+    return {**ages, 'age_hours': wait_hours}
+
+
+def _class_wait_time_hours(paths, agent_efficiency):
+    """
+    Estimated wait per class: days to clear the class backlog at the rate the
+    policy served the class that day, plus processing and reaction time.
+    A class with a backlog that got no capacity is starving.
+    """
+    class_backlog, class_solved = paths['class_backlog'], paths['class_solved']
+    queue_wait_days = np.divide(
+        class_backlog, class_solved,
+        out=np.where(class_backlog > 0, float(NO_CAPACITY_WAIT_DAYS), 0.0),
+        where=class_solved > 0
+    )
+    # (classes, 1), or (classes, days) with a time-varying efficiency
+    processing_time_hours = _processing_hours(paths['class_factors'][:, None], agent_efficiency)
+    return queue_wait_days * 24 + (processing_time_hours + REACTION_TIME_HOURS)
+
+
+# Pipeline stages in order, with the parameters each one reads. A stage also
+# depends on every stage before it, so a parameter change recomputes its own
+# stage and the ones after it; the random draws only rerun for draw parameters.
+SIMULATION_STAGES = (
+    ('draws', _draw_stage, (
+        'days', 'avg_daily_tickets', 'volatility', 'full_time_agents', 'part_time_agents',
+        'vacation_rate', 'absence_model', 'rng'
+    )),
+    ('capacity', _capacity_stage, ('agent_efficiency', 'part_time_hours', 'complexity_mix', 'complexity_factors')),
+    ('queue', _queue_stage, ('automation_rate', 'queue_policy', 'priority_mix')),
+    ('metrics', _metrics_stage, ()),
+)
+
+# Ticket ages track every cohort of the run, which costs about as much as the
+# other stages together; only runs that report ages add this stage
+AGES_STAGE = ('ages', _ages_stage, ())
+
+
+def _run_stages(n_replications, p, memoize=None, ages=False):
+    """
+    Runs all ``SIMULATION_STAGES`` for the full parameter dict ``p``, and
+    the ``AGES_STAGE`` after them with ``ages=True``.
+
+    Time-varying parameters are resolved to per-day arrays first (see
+    ``schedules.py``), so stages and memoized outputs see the values of the
+    actual days. ``memoize(stage_name, stage_params, compute)`` may return a stored
+    output instead of calling ``compute()``; see ``result_cache.py``.
+    Stage outputs are never modified after they are computed. Each stage
+    that actually computes is timed as ``stage: <name>`` by an active
+    profiler (see ``profiling.py``); memoized stages are not.
+
+    Returns:
+    --------
+    dict of np.ndarray
+        Unrounded daily paths of all stages: ``raw_inbound``,
+        ``ft_agents_available``, ``pt_agents_available``,
+        ``daily_capacity_tickets``, ``actual_inbound``, ``solved``,
+        ``backlog``, ``est_wait_time_days`` and ``est_wait_time_hours``;
+        with ``ages=True`` also ``solved_by_age``, ``open_by_age`` and
+        ``age_hours``.
+    """
+    p = resolve_params(p)
+    paths = {}
+    for name, stage, parameters in SIMULATION_STAGES + ((AGES_STAGE,) if ages else ()):
+        upstream = paths
+        compute = lambda: _timed_stage(name, stage, upstream, p, n_replications)
+        if memoize is None:
+            output = compute()
+        else:
+            output = memoize(name, {parameter: p[parameter] for parameter in parameters}, compute)
+        paths = {**paths, **output}
+    return paths
+
+
+def _timed_stage(name, stage, paths, p, n_replications):
+    with section(f'stage: {name}'):
+        return stage(paths, p, n_replications)
+
 
 def run_simulation(
     days=30,
@@ -12,11 +483,35 @@ def run_simulation(
     vacation_rate=0.05,
     complexity_mix={'Low': 0.5, 'Medium': 0.3, 'High': 0.2},
     complexity_factors={'Low': 1.0, 'Medium': 1.5, 'High': 2.5},
-    automation_rate=0.1
+    automation_rate=0.1,
+    absence_model=None,
+    rng=None,
+    start_date=None,
+    engine='daily',
+    arrival_curve=None,
+    shift_coverage=None,
+    resolution='day',
+    queue_policy=None,
+    priority_mix=None,
+    as_frame=True
 ):
     """
     Simulates ticket flow day by day with realistic modeling.
 
+    The whole horizon is computed as NumPy arrays: all inbound values are
+    drawn at once, availability is one reduction over the packed absence
+    schedule and the backlog recursion runs as a cumulative array operation.
+    For a given seed of the global random state the output matches the
+    previous day-by-day loop.
+
+    Internally the run is a pipeline of ``SIMULATION_STAGES`` (draws,
+    capacity, queue, metrics) that callers can memoize stage by stage.
+
+    Inbound, volatility, headcounts, efficiency, part-time hours,
+    automation and the complexity mix shares may vary by day (daily engine
+    only): pass an array of shape (days,) or a ``Schedule`` from
+    ``schedules.py``, e.g. a hiring ramp or a weekly inbound profile.
+
     This simulation models a support ticket system considering:
     - Stochastic inbound ticket arrivals (lognormal distribution)
     - Variable agent availability (planned absences)
@@ -51,133 +546,508 @@ def run_simulation(
         - High: 2.5 (150% more time)
     automation_rate : float
         Proportion of tickets deflected by automation (e.g., 0.1 = 10%)
+    absence_model : object, optional
+        Absence model from ``absence.py`` (``UniformAbsences`` or
+        ``ClusteredAbsences``). Defaults to uniformly spread absent days.
+    rng : None, int, np.random.Generator or CommonRandomNumbers, optional
+        Source of randomness (see ``random_streams.py``). None uses the
+        global ``np.random`` state; an int seeds a new Generator; a shared
+        ``CommonRandomNumbers`` instance reuses the same draws across
+        scenarios for paired comparisons.
+    start_date : date-like, optional
+        First simulated day. Defaults to today; pass a fixed date to make
+        the output a pure function of the parameters (e.g. for caching).
+    engine : {'daily', 'event'}
+        ``'daily'`` is the fluid day-level model. ``'event'`` simulates
+        individual tickets and agents (see ``event_engine.py``) and rolls
+        them up into the same columns; there the wait time is the mean real
+        arrival-to-resolution time of the tickets arriving each day.
+        ``'hourly'`` runs on hourly buckets (see ``intraday.py``).
+    arrival_curve : array-like, optional
+        Hourly engine only: relative inbound per hour of the day, shape (24,)
+        or (7, 24) with one row per weekday (Monday first). Defaults to a
+        business-hours profile.
+    shift_coverage : dict, optional
+        Hourly engine only: ``{'FT': [...], 'PT': [...]}`` with the share of
+        present agents working in each of the 24 hours. Defaults to FT
+        08-17 with a lunch break and PT from 09:00 for ``part_time_hours``.
+    resolution : {'day', 'hour'}
+        ``'hour'`` returns one row per hour (hourly engine only).
+    queue_policy : object, optional
+        Daily engine only: policy from ``queue_policy.py`` (``FifoPolicy``,
+        ``StrictPriority`` or ``WeightedFairShare``). Keeps one backlog per
+        complexity class and adds ``Backlog (End of Day) [<class>]`` and
+        ``Est. Wait Time (Hours) [<class>]`` columns. None keeps the single
+        backlog of average tickets.
+    priority_mix : dict, optional
+        With ``queue_policy``: share of each priority level, most urgent
+        first, e.g. ``{'Urgent': 0.2, 'Normal': 0.8}``. Classes are then
+        (priority, complexity) pairs labelled like ``'Urgent High'``.
+    as_frame : bool
+        False returns the compact ``SimulationResult`` instead of the table
+        (daily resolution only).
 
     Returns:
     --------
-    pd.DataFrame
+    pd.DataFrame or SimulationResult
         Daily simulation results with columns for inbound, capacity, solved tickets,
         backlog, and estimated wait times.
     """
     
-    # Simulation parameters
-    hours_per_day = 8  # Operating hours for full-time agents
+    # All parameters by name, as the engines read them
+    p = dict(locals())
+    if engine not in ('daily', 'event', 'hourly'):
+        raise ValueError(f"Unknown engine {engine!r}, expected 'daily', 'event' or 'hourly'")
+    if engine != 'daily':
+        _require_constant(p, f"engine={engine!r}")
+    if resolution not in ('day', 'hour') or (resolution == 'hour' and engine != 'hourly'):
+        raise ValueError("resolution='hour' requires engine='hourly'")
+    if engine != 'daily' and (queue_policy is not None or priority_mix is not None):
+        raise ValueError("queue_policy and priority_mix require engine='daily'")
+    if not as_frame and resolution != 'day':
+        raise ValueError("as_frame=False requires resolution='day'")
 
-    # Use current date as start
-    start_date = pd.Timestamp.now().normalize()
-    dates = pd.date_range(start=start_date, periods=days, freq='D')
-    results = []
+    # Imported here: the other engines build on this module's helpers
+    if engine == 'event':
+        from event_engine import simulate_tickets
 
-    current_backlog = 0.0  # Use float to maintain precision
+        params = {name: value for name, value in p.items() if name not in EVENT_EXCLUDED_PARAMS}
+        with section('engine: event'):
+            frame = simulate_tickets(**params).daily_frame(start_date)
+        return frame if as_frame else SimulationResult.from_frame(frame)
+    if engine == 'hourly':
+        from intraday import daily_frame, hourly_frame, simulate_hours
 
-    # Pre-calculate absence schedule for more realistic vacation modeling
-    # Instead of binomial per day, we model planned absences more realistically
-    # Each agent has a certain number of absent days over the period
-    total_agents = full_time_agents + part_time_agents
-    expected_absent_days = int(days * vacation_rate * total_agents)
-
-    # Create absence schedule: randomly assign absent days to agents
-    absence_schedule = np.zeros((total_agents, days), dtype=bool)
-    if expected_absent_days > 0 and total_agents > 0:
-        # Randomly distribute absences across agents and days
-        for _ in range(expected_absent_days):
-            agent_idx = np.random.randint(0, total_agents)
-            day_idx = np.random.randint(0, days)
-            absence_schedule[agent_idx, day_idx] = True
-
-    for day_idx, date in enumerate(dates):
-        # 1. Inbound Tickets
-        # Use lognormal distribution for more realistic traffic modeling
-        # Lognormal ensures non-negative values and realistic right-skewed distribution
-        if volatility > 0:
-            # Parameters for lognormal distribution to achieve desired mean and CV
-            sigma = np.sqrt(np.log(1 + volatility**2))
-            mu = np.log(avg_daily_tickets) - 0.5 * sigma**2
-            raw_inbound = np.random.lognormal(mu, sigma)
-        else:
-            raw_inbound = avg_daily_tickets
-        
-        # 2. Automation Deflection
-        actual_inbound = raw_inbound * (1 - automation_rate)
-
-        # 3. Calculate Effective Capacity
-        # Count available agents based on pre-calculated absence schedule
-        ft_agents_available = full_time_agents
-        pt_agents_available = part_time_agents
-
-        if total_agents > 0:
-            # Check absence schedule for this day
-            for agent_idx in range(full_time_agents):
-                if absence_schedule[agent_idx, day_idx]:
-                    ft_agents_available -= 1
-
-            for agent_idx in range(full_time_agents, total_agents):
-                if absence_schedule[agent_idx, day_idx]:
-                    pt_agents_available -= 1
-
-        # Total agent hours available
-        total_hours = (ft_agents_available * hours_per_day) + (pt_agents_available * part_time_hours)
-        
-        # 4. Adjust for Complexity
-        # Calculate weighted average complexity factor
-        # This represents how much longer an "average" ticket takes compared to baseline
-        avg_complexity_factor = (
-            complexity_mix['Low'] * complexity_factors['Low'] +
-            complexity_mix['Medium'] * complexity_factors['Medium'] +
-            complexity_mix['High'] * complexity_factors['High']
+        with section('engine: hourly'):
+            hours = simulate_hours(p)
+        if resolution == 'hour':
+            return hourly_frame(hours)
+        return daily_frame(hours) if as_frame else SimulationResult.from_frame(daily_frame(hours))
+
+    paths = _run_stages(None, p)
+    with section('result'):
+        return _simulation_frame(paths, start_date) if as_frame else _simulation_result(paths, start_date)
+
+
+def _simulation_frame(paths, start_date=None):
+    """The ``run_simulation`` output table for single-run ``paths``."""
+    import pandas as pd
+
+    frame = {
+        'Date': _simulation_dates(len(paths['raw_inbound']), start_date),
+        'Inbound (Raw)': np.rint(paths['raw_inbound']).astype(np.int64),
+        'Inbound (Net)': np.rint(paths['actual_inbound']).astype(np.int64),
+        'Capacity (Tickets)': np.rint(paths['daily_capacity_tickets']).astype(np.int64),
+        'Solved': np.rint(paths['solved']).astype(np.int64),
+        'Backlog (End of Day)': np.rint(paths['backlog']).astype(np.int64),
+        'Est. Wait Time (Days)': _round(paths['est_wait_time_days'], 3),
+        'Est. Wait Time (Hours)': _round(paths['est_wait_time_days'] * 24, 2),
+        'Staff Available (FT)': paths['ft_agents_available'].astype(np.int64),
+        'Staff Available (PT)': paths['pt_agents_available'].astype(np.int64)
+    }
+    for c, label in enumerate(paths.get('queue_classes', ())):
+        frame[f'Backlog (End of Day) [{label}]'] = np.rint(paths['class_backlog'][c]).astype(np.int64)
+        frame[f'Est. Wait Time (Hours) [{label}]'] = _round(paths['class_wait_time_hours'][c], 2)
+    return pd.DataFrame(frame, copy=False)
+
+
+# run_simulation columns and the SimulationResult fields behind them
+RESULT_COLUMNS = {
+    'Inbound (Raw)': 'raw_inbound',
+    'Inbound (Net)': 'net_inbound',
+    'Capacity (Tickets)': 'capacity',
+    'Solved': 'solved',
+    'Backlog (End of Day)': 'backlog',
+    'Est. Wait Time (Days)': 'wait_days',
+    'Est. Wait Time (Hours)': 'wait_hours',
+    'Staff Available (FT)': 'ft_available',
+    'Staff Available (PT)': 'pt_available',
+}
+
+# Decimals of the rounded wait columns
+WAIT_DECIMALS = {'wait_days': 3, 'wait_hours': 2, 'class_wait_hours': 2}
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """
+    Columnar outcome of ``run_simulation(as_frame=False)`` and ``run_replications``.
+
+    Counts are int32 and waits float32, both already rounded like the table
+    columns; dates are a start date plus the day index. A simulated day takes
+    36 bytes instead of a DataFrame row with a Timestamp and 64-bit columns.
+    Columns have shape (days,) for one run or (n_replications, days). Arrays
+    are read-only.
+
+    ``to_frame()`` reproduces the ``run_simulation`` table exactly for waits
+    below 65,536 hours; beyond that float32 keeps only about 0.01 hours.
+
+    Attributes:
+    -----------
+    start_date : pd.Timestamp
+        Date of day 0
+    raw_inbound, net_inbound, capacity, solved, backlog : np.ndarray
+        Daily ticket counts (int32), see ``RESULT_COLUMNS``
+    wait_days, wait_hours : np.ndarray
+        Estimated wait time (float32)
+    ft_available, pt_available : np.ndarray
+        Agents present per day (int32)
+    queue_classes : tuple
+        Class labels if a ``queue_policy`` was used
+    class_backlog, class_wait_hours : np.ndarray or None
+        Per-class backlog (int32) and wait (float32), shape (..., classes, days)
+    """
+    start_date: 'pd.Timestamp'
+    raw_inbound: np.ndarray
+    net_inbound: np.ndarray
+    capacity: np.ndarray
+    solved: np.ndarray
+    backlog: np.ndarray
+    wait_days: np.ndarray
+    wait_hours: np.ndarray
+    ft_available: np.ndarray
+    pt_available: np.ndarray
+    queue_classes: tuple = ()
+    class_backlog: np.ndarray | None = field(default=None, repr=False)
+    class_wait_hours: np.ndarray | None = field(default=None, repr=False)
+
+    @property
+    def days(self):
+        return self.solved.shape[-1]
+
+    @property
+    def n_replications(self):
+        """Number of replications, None for a single run."""
+        return self.solved.shape[0] if self.solved.ndim == 2 else None
+
+    @property
+    def nbytes(self):
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Packs a ``run_simulation`` table, e.g. from the event or hourly engine."""
+        import pandas as pd
+
+        columns = {
+            name: frame[column].to_numpy(dtype=np.float32 if name in WAIT_DECIMALS else np.int32)
+            for column, name in RESULT_COLUMNS.items()
+        }
+        return cls(start_date=pd.Timestamp(frame['Date'].iloc[0]), **_read_only(columns))
+
+    def to_frame(self):
+        """
+        The ``run_simulation`` table; replications are stacked with a leading
+        ``Replication`` column.
+        """
+        import pandas as pd
+
+        frame = {}
+        if self.n_replications is not None:
+            frame['Replication'] = np.repeat(np.arange(self.n_replications), self.days)
+        frame['Date'] = np.tile(_simulation_dates(self.days, self.start_date), self.n_replications or 1)
+        for column, name in RESULT_COLUMNS.items():
+            values = getattr(self, name).ravel()
+            if name in WAIT_DECIMALS:
+                frame[column] = _round(values.astype(np.float64), WAIT_DECIMALS[name])
+            else:
+                frame[column] = values.astype(np.int64)
+        for c, label in enumerate(self.queue_classes):
+            frame[f'Backlog (End of Day) [{label}]'] = self.class_backlog[..., c, :].ravel().astype(np.int64)
+            frame[f'Est. Wait Time (Hours) [{label}]'] = _round(
+                self.class_wait_hours[..., c, :].ravel().astype(np.float64), WAIT_DECIMALS['class_wait_hours']
+            )
+        return pd.DataFrame(frame, copy=False)
+
+    def kpis(self):
+        """
+        Dashboard KPIs computed on the columns: average wait, max backlog,
+        total solved and clearance rate. Scalars for a single run, one value
+        per replication otherwise.
+        """
+        total_solved = self.solved.sum(axis=-1, dtype=np.int64)
+        total_inbound = self.net_inbound.sum(axis=-1, dtype=np.int64)
+        days = self.wait_hours.shape[-1]
+        total_wait = self.wait_hours.sum(axis=-1, dtype=np.float64)
+        return {
+            # A run without days has no average wait
+            'Avg Wait Time (Hours)': np.divide(
+                total_wait, days, out=np.full(np.shape(total_wait), np.nan), where=days > 0
+            )[()],
+            'Max Backlog': self.backlog.max(axis=-1, initial=0),
+            'Total Solved': total_solved,
+            'Clearance Rate (%)': np.divide(
+                total_solved * 100.0, total_inbound,
+                out=np.full(np.shape(total_inbound), np.nan), where=total_inbound > 0
+            )[()],
+        }
+
+
+def _read_only(arrays):
+    for value in arrays.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return arrays
+
+
+def _simulation_result(paths, start_date=None):
+    """Packs ``paths`` of ``_run_stages`` into a ``SimulationResult``."""
+    def counts(values):
+        return np.rint(values).astype(np.int32)
+
+    def waits(values, name):
+        return _round(values, WAIT_DECIMALS[name]).astype(np.float32)
+
+    columns = {
+        'raw_inbound': counts(paths['raw_inbound']),
+        'net_inbound': counts(paths['actual_inbound']),
+        'capacity': counts(paths['daily_capacity_tickets']),
+        'solved': counts(paths['solved']),
+        'backlog': counts(paths['backlog']),
+        'wait_days': waits(paths['est_wait_time_days'], 'wait_days'),
+        'wait_hours': waits(paths['est_wait_time_days'] * 24, 'wait_hours'),
+        'ft_available': paths['ft_agents_available'].astype(np.int32),
+        'pt_available': paths['pt_agents_available'].astype(np.int32),
+    }
+    if 'queue_classes' in paths:
+        columns['queue_classes'] = paths['queue_classes']
+        columns['class_backlog'] = counts(paths['class_backlog'])
+        columns['class_wait_hours'] = waits(paths['class_wait_time_hours'], 'class_wait_hours')
+    start_date = _start_timestamp(start_date)
+    return SimulationResult(start_date=start_date, **_read_only(columns))
+
+
+# Daily series summarized as percentile bands by run_monte_carlo
+BAND_COLUMNS = {
+    'Inbound (Net)': 'actual_inbound',
+    'Capacity (Tickets)': 'daily_capacity_tickets',
+    'Solved': 'solved',
+    'Backlog (End of Day)': 'backlog',
+    'Est. Wait Time (Hours)': 'est_wait_time_hours',
+}
+
+
+@dataclass
+class MonteCarloResult:
+    """
+    Outcome of ``run_monte_carlo``.
+
+    Attributes:
+    -----------
+    bands : pd.DataFrame
+        One row per day with a ``Date`` column and ``<column> P<p>`` columns
+        for every entry of ``BAND_COLUMNS`` and every requested percentile.
+    kpis : pd.DataFrame
+        One row per replication with the dashboard KPIs.
+    percentiles : tuple
+        Percentiles used for the bands, e.g. (5, 50, 95).
+    """
+    bands: 'pd.DataFrame'
+    kpis: 'pd.DataFrame'
+    percentiles: tuple
+
+    def kpi_summary(self):
+        """Percentiles of each KPI across replications, indexed by ``P<p>``."""
+        summary = self.kpis.quantile(np.asarray(self.percentiles) / 100.0)
+        summary.index = [_percentile_label(p) for p in self.percentiles]
+        return summary
+
+    def median_interval(self, confidence=0.95):
+        """
+        Distribution-free confidence interval of each KPI's median.
+
+        The bounds are the order statistics at ranks n/2 -/+ z * sqrt(n)/2
+        of the n replications, so the interval narrows with 1/sqrt(n).
+
+        Returns:
+        --------
+        pd.DataFrame
+            Rows ``Low`` and ``High``, one column per KPI
+        """
+        # Imported here: statistics adds to the import time of every worker process
+        from statistics import NormalDist
+
+        half_width = NormalDist().inv_cdf(0.5 + confidence / 2) * 0.5 / math.sqrt(max(len(self.kpis), 1))
+        interval = self.kpis.quantile([max(0.5 - half_width, 0.0), min(0.5 + half_width, 1.0)])
+        interval.index = ['Low', 'High']
+        return interval
+
+
+def _percentile_label(percentile):
+    return f"P{percentile:g}"
+
+
+def simulation_defaults():
+    """Default keyword arguments of ``run_simulation``."""
+    return {
+        name: parameter.default
+        for name, parameter in inspect.signature(run_simulation).parameters.items()
+    }
+
+
+def _monte_carlo_params(caller, params):
+    """Merges ``params`` into the ``run_simulation`` defaults, rejecting unknown names."""
+    defaults = simulation_defaults()
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise TypeError(f"{caller}() got unexpected parameters: {sorted(unknown)}")
+    if params.get('engine', 'daily') != 'daily':
+        raise ValueError(f"{caller}() only supports engine='daily'")
+    return {**defaults, **params}
+
+
+def _replication_kpis(paths, wait_percentiles=(95,)):
+    """
+    KPIs per replication, defined like the dashboard KPI row, plus
+    percentiles of each replication's daily wait times.
+    """
+    total_solved = paths['solved'].sum(axis=-1)
+    total_inbound = paths['actual_inbound'].sum(axis=-1)
+    clearance_rate = np.divide(
+        total_solved * 100, total_inbound,
+        out=np.full(np.shape(total_inbound), np.nan), where=total_inbound > 0
+    )
+    kpis = {'Avg Wait Time (Hours)': paths['est_wait_time_hours'].mean(axis=-1)}
+    if len(wait_percentiles):
+        wait_quantiles = np.percentile(paths['est_wait_time_hours'], wait_percentiles, axis=-1)
+        for percentile, values in zip(wait_percentiles, wait_quantiles):
+            kpis[f"{_percentile_label(percentile)} Wait Time (Hours)"] = values
+    kpis['Max Backlog'] = paths['backlog'].max(axis=-1)
+    kpis['Total Solved'] = total_solved
+    kpis['Clearance Rate (%)'] = clearance_rate
+    if 'solved_by_age' in paths:
+        kpis.update(_age_kpis(paths))
+    for c, label in enumerate(paths.get('queue_classes', ())):
+        kpis[f'Avg Wait Time (Hours) [{label}]'] = paths['class_wait_time_hours'][..., c, :].mean(axis=-1)
+        kpis[f'Max Backlog [{label}]'] = paths['class_backlog'][..., c, :].max(axis=-1)
+    return kpis
+
+
+def _age_kpis(paths):
+    """Percentiles of the real ticket ages of each replication, solved and still open tickets."""
+    from cohorts import AGE_PERCENTILES, age_percentiles
+
+    counts = paths['solved_by_age'] + paths['open_by_age']
+    values = age_percentiles(paths['age_hours'], counts, AGE_PERCENTILES)
+    return {
+        f"{_percentile_label(percentile)} Ticket Age (Hours)": row
+        for percentile, row in zip(AGE_PERCENTILES, values)
+    }
+
+
+def run_monte_carlo(n_replications=1000, percentiles=(5, 50, 95), wait_percentiles=(95,), **params):
+    """
+    Runs many independent replications of ``run_simulation`` in one batched pass.
+
+    Inbound draws, absences, capacity and the backlog recursion are computed
+    on (replications x days) arrays, so 10k replications cost a handful of
+    vectorized operations instead of 10k simulation calls.
+
+    Parameters:
+    -----------
+    n_replications : int
+        Number of independent random paths to simulate
+    percentiles : tuple of float
+        Percentiles reported for the daily bands and the KPI summary
+    wait_percentiles : tuple of float
+        Percentiles of each replication's daily wait times reported as
+        ``P<p> Wait Time (Hours)`` KPIs
+    **params
+        Any keyword argument accepted by ``run_simulation``; omitted ones use
+        the same defaults. ``rng`` may be a seed, a Generator or a
+        ``CommonRandomNumbers`` instance drawn for ``n_replications``.
+
+    Returns:
+    --------
+    MonteCarloResult
+        Daily percentile bands for inbound, capacity, solved tickets, backlog
+        and wait time, plus one row of KPIs per replication.
+    """
+    p = _monte_carlo_params('run_monte_carlo', params)
+    paths = _run_stages(n_replications, p, ages=True)
+    return _monte_carlo_result(paths, percentiles, p['start_date'], wait_percentiles)
+
+
+def _monte_carlo_result(paths, percentiles, start_date=None, wait_percentiles=(95,)):
+    """Summarizes batched ``paths`` into a ``MonteCarloResult``."""
+    import pandas as pd
+
+    with section('monte carlo summary'):
+        # Daily bands: percentiles across replications for every day
+        bands = {'Date': _simulation_dates(paths['raw_inbound'].shape[-1], start_date)}
+        for column, key in BAND_COLUMNS.items():
+            values = np.percentile(paths[key], percentiles, axis=0)
+            for percentile, row in zip(percentiles, values):
+                bands[f"{column} {_percentile_label(percentile)}"] = row
+        if 'class_backlog' in paths:
+            class_values = np.percentile(paths['class_backlog'], percentiles, axis=0)
+            for c, label in enumerate(paths['queue_classes']):
+                for percentile, row in zip(percentiles, class_values[:, c]):
+                    bands[f"Backlog (End of Day) [{label}] {_percentile_label(percentile)}"] = row
+
+        return MonteCarloResult(
+            bands=pd.DataFrame(bands, copy=False),
+            kpis=pd.DataFrame(_replication_kpis(paths, wait_percentiles), copy=False),
+            percentiles=tuple(percentiles)
         )
 
-        # Effective capacity in terms of tickets (accounting for complexity)
-        # Base capacity: total_hours * agent_efficiency (for complexity factor 1.0)
-        # Adjusted for actual complexity: divide by avg_complexity_factor
-        daily_capacity_tickets = (total_hours * agent_efficiency) / avg_complexity_factor if avg_complexity_factor > 0 else 0
 
-        # 5. Process Tickets
-        # Total demand = backlog from previous days + today's new tickets
-        total_demand = current_backlog + actual_inbound
+def run_replications(n_replications=1000, **params):
+    """
+    Keeps every replication as compact daily columns.
 
-        # Solve as many tickets as capacity allows
-        solved = min(total_demand, daily_capacity_tickets)
-        new_backlog = total_demand - solved
+    Same batched simulation as ``run_monte_carlo``, but instead of bands the
+    full paths are returned as a ``SimulationResult`` of shape
+    (n_replications, days): 10k replications of a year take ~130 MB rather
+    than ~320 MB as one DataFrame.
 
-        # 6. Calculate Wait Time Metrics
-        # Wait time has two components:
-        # a) Queue wait: time spent waiting in backlog
-        # b) Processing time: time to actually resolve the ticket
+    Parameters:
+    -----------
+    n_replications : int
+        Number of random paths to simulate
+    **params
+        Any keyword argument accepted by ``run_simulation``
 
-        # Queue wait time (in days): backlog / daily capacity
-        # This represents how many days it would take to clear the current backlog
-        if daily_capacity_tickets > 0:
-            queue_wait_days = new_backlog / daily_capacity_tickets
-        else:
-            queue_wait_days = 999  # Infinite wait if no capacity
+    Returns:
+    --------
+    SimulationResult
+        Per-replication daily columns; ``kpis()`` gives one value per replication.
+    """
+    p = _monte_carlo_params('run_replications', params)
+    return _simulation_result(_run_stages(n_replications, p), p['start_date'])
 
-        # Processing time per ticket (in hours)
-        # Average time to process one ticket = (avg_complexity_factor / agent_efficiency)
-        # This is the time spent actively working on the ticket
-        if agent_efficiency > 0:
-            processing_time_hours = avg_complexity_factor / agent_efficiency
-        else:
-            processing_time_hours = 0
-
-        # Add minimum reaction time (time before agent picks up ticket): 0.5 hours
-        reaction_time_hours = 0.5
-
-        # Total estimated wait time
-        est_wait_time_days = queue_wait_days + (processing_time_hours + reaction_time_hours) / 24.0
-        
-        results.append({
-            'Date': date,
-            'Inbound (Raw)': round(raw_inbound),
-            'Inbound (Net)': round(actual_inbound),
-            'Capacity (Tickets)': round(daily_capacity_tickets),
-            'Solved': round(solved),
-            'Backlog (End of Day)': round(new_backlog),
-            'Est. Wait Time (Days)': round(est_wait_time_days, 3),
-            'Est. Wait Time (Hours)': round(est_wait_time_days * 24, 2),
-            'Staff Available (FT)': ft_agents_available,
-            'Staff Available (PT)': pt_agents_available
-        })
-        
-        current_backlog = new_backlog
-
-    return pd.DataFrame(results)
+
+def run_monte_carlo_kpis(n_replications=1000, wait_percentiles=(95,), ticket_ages=True, **params):
+    """
+    Per-replication KPIs without daily bands.
+
+    Same batched simulation as ``run_monte_carlo`` but skips the per-day
+    percentiles, which is all that sweeps and staffing searches need.
+
+    Parameters:
+    -----------
+    n_replications : int
+        Number of random paths to simulate
+    wait_percentiles : tuple of float
+        Percentiles of each replication's daily wait times to report,
+        as ``P<p> Wait Time (Hours)`` columns
+    ticket_ages : bool
+        Whether to report ``P<p> Ticket Age (Hours)``; tracking the ages
+        costs about as much as the rest of the run
+    **params
+        Any keyword argument accepted by ``run_simulation``; ``as_frame=False``
+        returns the KPI columns as a dict of arrays and never imports pandas
+
+    Returns:
+    --------
+    pd.DataFrame or dict of np.ndarray
+        One row (array element) per replication.
+    """
+    p = _monte_carlo_params('run_monte_carlo_kpis', params)
+    kpis = _replication_kpis(_run_stages(n_replications, p, ages=ticket_ages), wait_percentiles)
+    if not p['as_frame']:
+        return kpis
+
+    import pandas as pd
+
+    return pd.DataFrame(kpis, copy=False)
@@ -0,0 +1,237 @@
+"""
+SLA-targeted staffing search.
+
+``find_minimum_staffing`` answers questions like "what is the cheapest FT/PT
+mix that keeps the P90 wait under 24 hours in 95% of replications?". It
+relies on KPIs improving as capacity grows: for each part-time level it
+bisects over full-time agents, and every cheaper mix found bounds the rest
+of the search (branch and bound). Candidates are evaluated with Monte Carlo
+batches that stop as soon as the candidate is statistically clearly above
+or below the target.
+"""
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from random_streams import CommonRandomNumbers
+from schedules import resolve_params
+from simulation import HOURS_PER_DAY, _percentile_label, run_monte_carlo_kpis, simulation_defaults
+
+EVALUATION_COLUMNS = [
+    'full_time_agents', 'part_time_agents', 'staff_hours', 'replications', 'success_rate', 'meets_target'
+]
+
+
+@dataclass
+class StaffingResult:
+    """
+    Outcome of ``find_minimum_staffing``.
+
+    ``full_time_agents`` and ``part_time_agents`` are None when no mix within
+    the search bounds meets the target. ``evaluations`` lists every candidate
+    that was simulated, in evaluation order.
+    """
+    full_time_agents: int | None
+    part_time_agents: int | None
+    staff_hours: float | None
+    success_rate: float | None
+    evaluations: 'pd.DataFrame'
+
+    @property
+    def feasible(self):
+        return self.full_time_agents is not None
+
+
+def wilson_interval(successes, trials, confidence):
+    """Two-sided Wilson score interval for a binomial proportion."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    share = successes / trials
+    denominator = 1 + z ** 2 / trials
+    center = (share + z ** 2 / (2 * trials)) / denominator
+    half_width = z * math.sqrt(share * (1 - share) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+    return center - half_width, center + half_width
+
+
+class _CandidateEvaluator:
+    """
+    Sequentially tests candidates against the SLA on shared replication batches.
+
+    Batch ``i`` uses the same common random numbers for every candidate, so
+    candidates are compared on identical inbound and absence paths.
+    """
+
+    def __init__(self, target_wait_hours, wait_percentile, service_level, decision_confidence,
+                 batch_size, max_replications, seed, params):
+        self.target_wait_hours = target_wait_hours
+        self.wait_column = f"{_percentile_label(wait_percentile)} Wait Time (Hours)"
+        self.wait_percentile = wait_percentile
+        self.service_level = service_level
+        self.decision_confidence = decision_confidence
+        self.batch_size = batch_size
+        self.max_batches = max(1, math.ceil(max_replications / batch_size))
+        self.batch_seeds = np.random.SeedSequence(seed).spawn(self.max_batches)
+        self.batches = []
+        self.params = params
+        self.evaluations = {}
+
+    def _batch(self, index):
+        while len(self.batches) <= index:
+            self.batches.append(CommonRandomNumbers(
+                self.params['days'], self.batch_size, self.batch_seeds[len(self.batches)]
+            ))
+        return self.batches[index]
+
+    def meets_target(self, full_time_agents, part_time_agents):
+        """True if the mix keeps the wait percentile under target in ``service_level`` of replications."""
+        key = (full_time_agents, part_time_agents)
+        if key not in self.evaluations:
+            self.evaluations[key] = self._evaluate(full_time_agents, part_time_agents)
+        return self.evaluations[key]['meets_target']
+
+    def _evaluate(self, full_time_agents, part_time_agents):
+        successes = trials = 0
+        for index in range(self.max_batches):
+            kpis = run_monte_carlo_kpis(
+                self.batch_size,
+                wait_percentiles=(self.wait_percentile,),
+                ticket_ages=False,
+                **{
+                    **self.params,
+                    'full_time_agents': full_time_agents,
+                    'part_time_agents': part_time_agents,
+                    'rng': self._batch(index)
+                }
+            )
+            successes += int((kpis[self.wait_column] <= self.target_wait_hours).sum())
+            trials += self.batch_size
+
+            # Early stop once the success rate is clearly on one side of the service level
+            low, high = wilson_interval(successes, trials, self.decision_confidence)
+            if low > self.service_level or high < self.service_level:
+                break
+
+        success_rate = successes / trials
+        return {
+            'full_time_agents': full_time_agents,
+            'part_time_agents': part_time_agents,
+            'staff_hours': full_time_agents * HOURS_PER_DAY + part_time_agents * _mean_part_time_hours(self.params),
+            'replications': trials,
+            'success_rate': success_rate,
+            'meets_target': success_rate >= self.service_level,
+        }
+
+
+def _mean_part_time_hours(params):
+    """Part-time hours per day, averaged over the horizon when they vary by day."""
+    return float(np.mean(params['part_time_hours']))
+
+
+def find_minimum_staffing(target_wait_hours=24, wait_percentile=90, service_level=0.95,
+                          max_full_time_agents=50, max_part_time_agents=20,
+                          decision_confidence=0.99, batch_size=100, max_replications=2000,
+                          seed=None, **params):
+    """
+    Finds the FT/PT mix with the fewest daily staff hours that meets an SLA.
+
+    A mix meets the SLA if the ``wait_percentile`` of daily wait times stays at
+    or below ``target_wait_hours`` in at least ``service_level`` of Monte Carlo
+    replications. Each candidate is simulated in batches of ``batch_size``
+    replications until a Wilson interval at ``decision_confidence`` lies
+    entirely above or below ``service_level``, or ``max_replications`` is
+    reached (then the point estimate decides).
+
+    The search assumes that adding agents never hurts: for each part-time
+    level it bisects for the fewest full-time agents that pass. The result
+    bounds the next level, since more part-time agents never need more
+    full-time agents, and levels that cannot beat the best mix so far are
+    skipped.
+
+    Parameters:
+    -----------
+    target_wait_hours : float
+        Wait time the percentile must stay under
+    wait_percentile : float
+        Percentile of each replication's daily wait times (e.g. 90 for P90)
+    service_level : float
+        Required share of replications meeting the target (0-1)
+    max_full_time_agents : int
+        Upper bound for full-time agents
+    max_part_time_agents : int
+        Upper bound for part-time agents
+    decision_confidence : float
+        Confidence of the early-stopping interval (0-1)
+    batch_size : int
+        Replications per evaluation step
+    max_replications : int
+        Replications after which a candidate is decided by its point estimate
+    seed : int, optional
+        Seed of the common random numbers shared by all candidates
+    **params
+        Other ``run_simulation`` parameters (inbound, efficiency, absences, ...),
+        constant or varying by day. Staff hours count the mean part-time
+        hours per day.
+
+    Returns:
+    --------
+    StaffingResult
+        Cheapest passing mix and the log of evaluated candidates.
+    """
+    import pandas as pd
+
+    searched = {'full_time_agents', 'part_time_agents', 'rng'} & set(params)
+    if searched:
+        raise TypeError(f"find_minimum_staffing() sets {sorted(searched)} itself")
+    # Schedules are resolved once, so every candidate runs on the same per-day values
+    params = resolve_params({**simulation_defaults(), **params})
+    pt_hours = _mean_part_time_hours(params)
+
+    evaluator = _CandidateEvaluator(
+        target_wait_hours, wait_percentile, service_level, decision_confidence,
+        batch_size, max_replications, seed, params
+    )
+
+    best = None
+    best_hours = math.inf
+    ft_upper = max_full_time_agents
+    for part_time_agents in range(max_part_time_agents + 1):
+        pt_staff_hours = part_time_agents * pt_hours
+        if pt_staff_hours >= best_hours:
+            break
+
+        # Bound: only FT levels that are cheaper than the best mix so far
+        ft_limit = ft_upper
+        if best is not None:
+            ft_limit = min(ft_limit, math.ceil((best_hours - pt_staff_hours) / HOURS_PER_DAY) - 1)
+        if ft_limit < 0 or not evaluator.meets_target(ft_limit, part_time_agents):
+            continue
+
+        # Bisection: low fails (or is below range), high passes
+        low, high = -1, ft_limit
+        while high - low > 1:
+            middle = (low + high) // 2
+            if evaluator.meets_target(middle, part_time_agents):
+                high = middle
+            else:
+                low = middle
+
+        ft_upper = high
+        hours = high * HOURS_PER_DAY + pt_staff_hours
+        if hours < best_hours:
+            best, best_hours = (high, part_time_agents), hours
+
+    evaluations = pd.DataFrame(list(evaluator.evaluations.values()), columns=EVALUATION_COLUMNS)
+    if best is None:
+        return StaffingResult(None, None, None, None, evaluations)
+    return StaffingResult(
+        full_time_agents=best[0],
+        part_time_agents=best[1],
+        staff_hours=best_hours,
+        success_rate=evaluator.evaluations[best]['success_rate'],
+        evaluations=evaluations
+    )
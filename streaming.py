@@ -0,0 +1,310 @@
+"""
+Streaming runs for long horizons (``iter_simulation``).
+
+``run_simulation`` holds the whole horizon in memory. For planning over
+years, optionally with many replications, ``iter_simulation`` runs the same
+daily model in fixed-size chunks of days and yields each chunk as soon as
+it is done. Memory then depends on the chunk size, not on the horizon.
+
+State that crosses a chunk boundary is carried over:
+
+- the backlog at the end of the chunk (per class with a ``queue_policy``)
+  is the queue before the first day of the next one; per class it is
+  carried by arrival day, which FIFO serves in order, so a deep queue
+  carries as many days as it holds;
+- absence blocks of ``ClusteredAbsences`` are kept whole across the
+  boundary: days a block reaches past the end of its chunk go to the next
+  chunk, days it reaches back before the start go to the previous one. The
+  absences of each chunk are therefore drawn before the previous chunk is
+  yielded.
+
+Time-varying parameters (see ``schedules.py``) are resolved for the whole
+horizon and each chunk gets its days. Absences are drawn for the largest
+team of the horizon, so absence blocks keep their agent across chunks.
+
+Random draws come from one stream for the whole run, chunk after chunk, so
+a seeded run is reproducible for a given ``chunk_days``. A single chunk
+covering the horizon reproduces ``run_simulation``.
+
+``CsvSink`` and ``ParquetSink`` append chunks to a file as they arrive;
+``write_simulation`` streams a run straight into one.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from absence import ClusteredAbsences, UniformAbsences, _unique_keys, count_absences, employed_keys
+from random_streams import CommonRandomNumbers, resolve_rng
+from schedules import resolve_params, slice_params
+from simulation import (
+    _agent_rows,
+    _capacity_stage,
+    _draw_inbound,
+    _monte_carlo_params,
+    _queue_stage,
+    _start_timestamp,
+    _simulation_frame,
+    _simulation_result,
+    _wait_metrics,
+)
+
+# Days per chunk unless the caller picks another size
+DEFAULT_CHUNK_DAYS = 365
+
+
+def iter_simulation(chunk_days=DEFAULT_CHUNK_DAYS, n_replications=None, **params):
+    """
+    Runs the daily model chunk by chunk and yields each chunk's results.
+
+    Parameters:
+    -----------
+    chunk_days : int
+        Days per chunk; the last chunk holds the remainder of ``days``
+    n_replications : int, optional
+        Number of replications computed side by side, as in
+        ``run_replications``. None is a single run.
+    **params
+        Any keyword argument accepted by ``run_simulation`` for the daily
+        engine. ``days`` is the full horizon. ``rng`` may be None, a seed or a
+        Generator; common random numbers are drawn for a fixed horizon and
+        are not supported.
+
+    Yields:
+    -------
+    pd.DataFrame or SimulationResult
+        What ``run_simulation`` would return for the days of the chunk, with
+        the dates of those days: a table, stacked by ``Replication`` with
+        ``n_replications``, or a ``SimulationResult`` with ``as_frame=False``.
+        Ticket ages need the whole horizon and are not computed.
+    """
+    p = resolve_params(_monte_carlo_params('iter_simulation', params))
+    if p['resolution'] != 'day':
+        raise ValueError("iter_simulation() yields daily rows, resolution must be 'day'")
+    if chunk_days < 1:
+        raise ValueError("chunk_days must be at least 1")
+    rng = resolve_rng(p['rng'])
+    if isinstance(rng, CommonRandomNumbers):
+        raise ValueError("iter_simulation() draws chunk by chunk; pass a seed or Generator instead of common random numbers")
+    absence_model = p['absence_model'] or UniformAbsences()
+    if isinstance(absence_model, ClusteredAbsences) and absence_model.start_weights is not None:
+        if len(absence_model.start_weights) != p['days']:
+            raise ValueError(f"start_weights has {len(absence_model.start_weights)} entries, expected {p['days']}")
+
+    start_date = _start_timestamp(p['start_date'])
+    agent_rows = _agent_rows(p)
+    chunks = []
+    for offset in range(0, p['days'], chunk_days):
+        days = min(chunk_days, p['days'] - offset)
+        chunks.append({
+            **slice_params(p, offset, offset + days), 'days': days, 'rng': rng,
+            'absence_model': _chunk_absence_model(absence_model, offset, days)
+        })
+
+    absences = _draw_absences(chunks[0], agent_rows, n_replications)
+    spilled = _no_absences()
+    carried = {}
+    for index, chunk in enumerate(chunks):
+        days = chunk['days']
+        raw_inbound = _draw_inbound(days, chunk['avg_daily_tickets'], chunk['volatility'], n_replications, rng=rng)
+
+        # Own absences, the previous chunk's spill and what the next chunk reaches back
+        pieces = [absences, spilled]
+        if index + 1 < len(chunks):
+            next_rows, next_days = _draw_absences(chunks[index + 1], agent_rows, n_replications)
+            before = next_days < 0
+            pieces.append((next_rows[before], next_days[before] + days))
+            absences = (next_rows[~before], next_days[~before])
+        rows = np.concatenate([piece[0] for piece in pieces])
+        absent_days = np.concatenate([piece[1] for piece in pieces])
+        after = absent_days >= days
+        spilled = (rows[after], absent_days[after] - days)
+        inside = (absent_days >= 0) & ~after
+
+        paths = {
+            'raw_inbound': raw_inbound,
+            **_available_agents(chunk, agent_rows, rows[inside], absent_days[inside], n_replications)
+        }
+        paths = {**paths, **_capacity_stage(paths, chunk, n_replications), **carried}
+        paths = {**paths, **_queue_stage(paths, chunk, n_replications)}
+        paths = {**paths, **_wait_metrics(paths, chunk)}
+        carried = _carried_queue(paths)
+
+        chunk_start = start_date + pd.Timedelta(days=index * chunk_days)
+        if not p['as_frame']:
+            yield _simulation_result(paths, chunk_start)
+        elif n_replications is None:
+            yield _simulation_frame(paths, chunk_start)
+        else:
+            yield _simulation_result(paths, chunk_start).to_frame()
+
+
+def _chunk_absence_model(absence_model, offset, days):
+    """The absence model for days ``[offset, offset + days)`` of the horizon."""
+    if isinstance(absence_model, ClusteredAbsences) and absence_model.start_weights is not None:
+        return ClusteredAbsences(
+            absence_model.min_block_days, absence_model.max_block_days,
+            absence_model.start_weights[offset:offset + days]
+        )
+    return absence_model
+
+
+def _draw_absences(p, agent_rows, n_replications):
+    """
+    Absent days of one chunk as (row, day) pairs with ``row = replication *
+    agents + agent`` over the (FT, PT) ``agent_rows``; ``day`` is counted
+    from the chunk start and may reach ``spill_days`` before or after it.
+    """
+    spill_days = p['absence_model'].spill_days
+    keys = p['absence_model'].draw_keys(
+        sum(agent_rows), p['days'], p['vacation_rate'], n_replications or 1,
+        rng=p['rng'], spill_days=spill_days
+    )
+    rows, column = np.divmod(keys, p['days'] + 2 * spill_days)
+    return rows, column - spill_days
+
+
+def _no_absences():
+    return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+
+def _available_agents(p, agent_rows, rows, absent_days, n_replications):
+    """
+    FT and PT agents present per day, counting each absent (row, day) once
+    and only for agents employed that day.
+    """
+    days = p['days']
+    full_time_agents = agent_rows[0]
+    total_agents = sum(agent_rows)
+    keys = _unique_keys(rows * days + absent_days) if len(rows) else rows
+    if np.ndim(p['full_time_agents']) or np.ndim(p['part_time_agents']):
+        keys = employed_keys(keys, total_agents, full_time_agents, days, p['full_time_agents'], p['part_time_agents'])
+    ft_absent, pt_absent = count_absences(keys, total_agents, full_time_agents, days, n_replications or 1)
+    if n_replications is None:
+        ft_absent, pt_absent = ft_absent[0], pt_absent[0]
+    return {
+        'ft_agents_available': p['full_time_agents'] - ft_absent,
+        'pt_agents_available': p['part_time_agents'] - pt_absent,
+    }
+
+
+def _carried_queue(paths):
+    """
+    End-of-chunk queue, in the form ``_queue_stage`` takes it for the next chunk.
+
+    With a queue policy the queued work of each class is carried per arrival
+    day, oldest first: FIFO serves it in that order, and a complexity mix
+    that varies by day makes the order matter. Within a class the open work
+    is its latest arrivals; days before the oldest open work anywhere are
+    dropped, carried work included.
+    """
+    if 'class_backlog' not in paths:
+        return {'carried_backlog': paths['backlog'][..., -1]}
+    factors = paths['class_factors'][:, None]
+    arrivals = paths['class_inbound'] * factors
+    if 'carried_class_work' in paths:
+        arrivals = np.concatenate([paths['carried_class_work'], arrivals], axis=-1)
+    backlog = paths['class_backlog'][..., -1:] * factors
+    # Work that arrived after each day
+    later = np.cumsum(arrivals[..., ::-1], axis=-1)[..., ::-1] - arrivals
+    queued = np.clip(backlog - later, 0.0, arrivals)
+    is_open = (queued > 0).reshape(-1, queued.shape[-1]).any(axis=0)
+    first = int(np.argmax(is_open)) if is_open.any() else queued.shape[-1] - 1
+    return {'carried_class_work': queued[..., first:]}
+
+
+class CsvSink:
+    """
+    Appends chunks to one CSV file; the header is written with the first chunk.
+
+    Use as a context manager, or call ``close()`` when done.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'w', newline='')
+        self._header = True
+
+    def write(self, frame):
+        frame.to_csv(self._file, header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ParquetSink:
+    """
+    Appends chunks to one Parquet file, one row group per chunk.
+
+    The first chunk fixes the schema. Needs ``pyarrow``, which is imported
+    only when a sink is created.
+    """
+
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from error
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+        self.path = Path(path)
+        self._writer = None
+
+    def write(self, frame):
+        table = self._pyarrow.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._parquet.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# File suffixes and the sinks that write them
+SINKS = {'.csv': CsvSink, '.parquet': ParquetSink, '.pq': ParquetSink}
+
+
+def write_simulation(path, chunk_days=DEFAULT_CHUNK_DAYS, n_replications=None, **params):
+    """
+    Streams ``iter_simulation`` into a CSV or Parquet file.
+
+    Parameters:
+    -----------
+    path : str or Path
+        Output file; the suffix (``.csv``, ``.parquet`` or ``.pq``) picks the sink
+    chunk_days : int
+        Days per chunk, see ``iter_simulation``
+    n_replications : int, optional
+        Replications side by side; rows then carry a ``Replication`` column
+    **params
+        Any keyword argument accepted by ``run_simulation`` for the daily engine
+
+    Returns:
+    --------
+    int
+        Number of rows written.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in SINKS:
+        raise ValueError(f"Unknown output format {suffix!r}, expected one of {sorted(SINKS)}")
+    rows = 0
+    with SINKS[suffix](path) as sink:
+        for frame in iter_simulation(chunk_days, n_replications, **{**params, 'as_frame': True}):
+            sink.write(frame)
+            rows += len(frame)
+    return rows
@@ -0,0 +1,175 @@
+"""
+Parameter sweeps over staffing grids.
+
+``run_sweep`` evaluates every point of a parameter grid with Monte Carlo
+replications and returns one tidy KPI table. Grid points are split into
+chunks and fanned out over a ``ProcessPoolExecutor``. All points share one
+set of common random numbers: it is copied into shared memory once and the
+workers map it read-only, instead of receiving a pickled copy per task.
+Workers only import NumPy; the table is built with pandas in the parent.
+"""
+import itertools
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from absence import UniformAbsences
+from random_streams import CommonRandomNumbers
+from schedules import resolve_params
+from simulation import _agent_rows, run_monte_carlo_kpis, simulation_defaults
+
+# Summary columns of the sweep table, computed from per-replication KPIs
+SWEEP_KPIS = {
+    'Avg Wait (Hours)': 'Avg Wait Time (Hours)',
+    'P95 Wait (Hours)': 'P95 Wait Time (Hours)',
+    'Max Backlog': 'Max Backlog',
+    'Clearance Rate (%)': 'Clearance Rate (%)',
+}
+
+# Common random numbers attached by each worker process
+_worker_crn = None
+_worker_shared_memory = []
+
+
+def parameter_grid(grid):
+    """Cartesian product of ``{name: values}`` as a list of dicts, last name varying fastest."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def _evaluate_chunk(points, n_replications, base_params, rng):
+    """Simulates each grid point and averages its per-replication KPIs."""
+    rows = []
+    days = base_params.get('days', simulation_defaults()['days'])
+    for point in points:
+        # Points with a shorter horizon use the first days of the draws
+        kpis = run_monte_carlo_kpis(
+            n_replications, rng=rng.first_days(point.get('days', days)), ticket_ages=False, as_frame=False,
+            **{**base_params, **point}
+        )
+        rows.append({**point, **{name: kpis[column].mean() for name, column in SWEEP_KPIS.items()}})
+    return rows
+
+
+def _attach_shared_draws(inbound_spec, absence_spec):
+    """Process-pool initializer: maps the shared draws into this worker."""
+    global _worker_crn
+    arrays = []
+    for name, shape in (inbound_spec, absence_spec):
+        block = shared_memory.SharedMemory(name=name, track=False)
+        _worker_shared_memory.append(block)
+        array = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        array.flags.writeable = False
+        arrays.append(array)
+    _worker_crn = CommonRandomNumbers.from_arrays(*arrays)
+
+
+def _evaluate_chunk_in_worker(points, n_replications, base_params):
+    return _evaluate_chunk(points, n_replications, base_params, _worker_crn)
+
+
+def pool_context():
+    """
+    Start method for worker pools: ``forkserver`` where the platform has
+    it, ``spawn`` otherwise. Forking the multithreaded Streamlit server can
+    copy locks held by its other threads into a worker and deadlock it.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _share(array):
+    """Copies ``array`` into a new shared-memory block; returns (block, (name, shape))."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=np.float64, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape)
+
+
+def run_sweep(grid, n_replications=200, seed=None, max_workers=None, chunk_size=None, **base_params):
+    """
+    Evaluates a parameter grid with Monte Carlo replications on all cores.
+
+    Parameters:
+    -----------
+    grid : dict
+        Parameter name -> list of values, e.g.
+        ``{'full_time_agents': range(3, 12), 'part_time_agents': range(0, 6)}``.
+        Any ``run_simulation`` parameter except ``rng`` can be swept; with
+        ``days`` in the grid, shorter runs use the first days of the draws.
+    n_replications : int
+        Replications per grid point
+    seed : int, optional
+        Seed of the common random numbers shared by all grid points
+    max_workers : int, optional
+        Worker processes; defaults to the number of CPUs. 1 runs in-process.
+    chunk_size : int, optional
+        Grid points per task; defaults to about four tasks per worker
+    **base_params
+        ``run_simulation`` parameters that are the same for every grid point;
+        the draws come from ``seed``, so ``rng`` is not accepted
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per grid point (in grid order) with the swept parameters and
+        average wait, P95 wait, max backlog and clearance rate, each averaged
+        over replications.
+    """
+    import pandas as pd
+
+    if 'rng' in grid or 'rng' in base_params:
+        raise TypeError("run_sweep() draws common random numbers from seed; pass seed instead of rng")
+    points = parameter_grid(grid)
+    if not points:
+        return pd.DataFrame(columns=[*grid, *SWEEP_KPIS])
+
+    # One set of draws for the whole grid, large enough for its biggest team and longest horizon
+    params = {**simulation_defaults(), **base_params}
+    days = max(point.get('days', params['days']) for point in points)
+    crn = CommonRandomNumbers(days, n_replications, seed)
+    absence_draws = 0
+    for point in points:
+        p = resolve_params({**params, **point})
+        absence_model = p['absence_model'] or UniformAbsences()
+        total_agents = sum(_agent_rows(p))
+        absence_draws = max(absence_draws, absence_model.n_draws(total_agents, p['days'], p['vacation_rate']))
+    crn.reserve(absence_draws)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(points) == 1:
+        rows = _evaluate_chunk(points, n_replications, base_params, crn)
+        return pd.DataFrame(rows)
+
+    chunk_size = chunk_size or math.ceil(len(points) / (max_workers * 4))
+    chunks = [points[i:i + chunk_size] for i in range(0, len(points), chunk_size)]
+
+    blocks = []
+    try:
+        inbound_block, inbound_spec = _share(crn.inbound_z)
+        blocks.append(inbound_block)
+        absence_block, absence_spec = _share(crn.absence_uniforms_array)
+        blocks.append(absence_block)
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=pool_context(),
+            initializer=_attach_shared_draws,
+            initargs=(inbound_spec, absence_spec)
+        ) as executor:
+            results = executor.map(
+                _evaluate_chunk_in_worker,
+                chunks,
+                itertools.repeat(n_replications),
+                itertools.repeat(base_params)
+            )
+            rows = [row for chunk_rows in results for row in chunk_rows]
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return pd.DataFrame(rows)
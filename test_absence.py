@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from absence import AbsenceSchedule, ClusteredAbsences, UniformAbsences, count_absences
+
+
+class TestAbsence(unittest.TestCase):
+    def test_packed_schedule_round_trip(self):
+        """Test that packing keeps the matrix and counts FT/PT absences per day."""
+        rng = np.random.RandomState(0)
+        matrix = rng.random_sample((13, 40)) < 0.3
+        schedule = AbsenceSchedule.from_dense(matrix)
+        np.testing.assert_array_equal(schedule.to_dense(), matrix)
+        self.assertEqual(schedule.n_absent_days, matrix.sum())
+
+        ft_absent, pt_absent = schedule.absent_counts(full_time_agents=9)
+        np.testing.assert_array_equal(ft_absent, matrix[:9].sum(axis=0))
+        np.testing.assert_array_equal(pt_absent, matrix[9:].sum(axis=0))
+
+        keys = np.flatnonzero(matrix)
+        np.testing.assert_array_equal(AbsenceSchedule.from_keys(keys, 13, 40).packed, schedule.packed)
+
+    def test_batched_counts_match_schedules(self):
+        """Test that counting flat keys matches per-replication schedules."""
+        np.random.seed(1)
+        keys = UniformAbsences().draw_keys(n_agents=7, days=30, vacation_rate=0.2, n_replications=3)
+        ft_absent, pt_absent = count_absences(keys, 7, 5, 30, 3)
+        for replication in range(3):
+            rows = keys[keys // (7 * 30) == replication] % (7 * 30)
+            schedule = AbsenceSchedule.from_keys(rows, 7, 30)
+            ft, pt = schedule.absent_counts(5)
+            np.testing.assert_array_equal(ft_absent[replication], ft)
+            np.testing.assert_array_equal(pt_absent[replication], pt)
+
+    def test_clustered_absences_form_blocks(self):
+        """Test that clustered absences keep the absence rate but come in multi-day blocks."""
+        np.random.seed(2)
+        model = ClusteredAbsences(min_block_days=5, max_block_days=5)
+        keys = model.draw_keys(n_agents=200, days=365, vacation_rate=0.05)
+        matrix = AbsenceSchedule.from_keys(keys, 200, 365).to_dense()
+
+        expected = 365 * 0.05 * 200
+        self.assertAlmostEqual(matrix.sum() / expected, 1.0, delta=0.1)
+        # Most absent days have an absent neighbour day for the same agent
+        neighbours = matrix[:, 1:] & matrix[:, :-1]
+        self.assertGreater(neighbours.sum() / matrix.sum(), 0.6)
+
+    def test_clustered_start_weights(self):
+        """Test that start weights concentrate absences in the weighted period."""
+        np.random.seed(3)
+        weights = np.zeros(120)
+        weights[60:90] = 1.0
+        model = ClusteredAbsences(min_block_days=1, max_block_days=3, start_weights=weights)
+        keys = model.draw_keys(n_agents=50, days=120, vacation_rate=0.05)
+        days = keys % 120
+        self.assertTrue(((days >= 58) & (days < 92)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from absence import ClusteredAbsences
+from analytic import run_analytic
+from simulation import HOURS_PER_DAY, REACTION_TIME_HOURS, run_monte_carlo
+
+
+class TestAnalytic(unittest.TestCase):
+    def test_agrees_with_monte_carlo(self):
+        """Test that estimates match Monte Carlo means for stable, near-critical and overloaded teams."""
+        scenarios = [
+            {'days': 60},
+            {'days': 365, 'full_time_agents': 8, 'volatility': 0.3, 'avg_daily_tickets': 200, 'agent_efficiency': 4},
+            {'days': 60, 'full_time_agents': 2, 'absence_model': ClusteredAbsences()},
+        ]
+        for params in scenarios:
+            analytic = run_analytic(**params)
+            simulated = run_monte_carlo(300, rng=1, **params).kpis.mean()
+            checks = analytic.cross_check(simulated)
+            self.assertTrue(all(check['Agrees'] for check in checks), checks)
+            self.assertAlmostEqual(analytic.kpis()['Total Solved'] / simulated['Total Solved'], 1, delta=0.01)
+        self.assertGreater(run_analytic(**scenarios[2]).utilization, 1)
+
+    def test_deterministic_limits(self):
+        """Test the exact fluid model without volatility and absences."""
+        params = {
+            'days': 30, 'volatility': 0, 'vacation_rate': 0, 'part_time_agents': 0, 'automation_rate': 0,
+            'complexity_factors': {'Low': 1.0, 'Medium': 1.0, 'High': 1.0}
+        }
+        stable = run_analytic(**params)
+        self.assertEqual(stable.capacity, 5 * HOURS_PER_DAY * 5)
+        self.assertEqual(stable.kpis()['Max Backlog'], 0)
+        self.assertAlmostEqual(stable.kpis()['Avg Wait Time (Hours)'], 1 / 5 + REACTION_TIME_HOURS)
+
+        overloaded = run_analytic(**{**params, 'full_time_agents': 1})
+        growth = 100 - HOURS_PER_DAY * 5
+        self.assertAlmostEqual(overloaded.backlog_growth, growth)
+        np.testing.assert_allclose(overloaded.expected_backlog, growth * np.arange(1, 31))
+        self.assertAlmostEqual(overloaded.kpis()['Clearance Rate (%)'], HOURS_PER_DAY * 5)
+
+        idle = run_analytic(avg_daily_tickets=0)
+        self.assertEqual((idle.utilization, idle.kpis()['Max Backlog'], idle.kpis()['Total Solved']), (0, 0, 0))
+
+    def test_cross_check(self):
+        """Test that only differences beyond tolerance and the per-KPI floor are flagged."""
+        analytic = run_analytic(days=60, full_time_agents=2)
+        kpis = analytic.kpis()
+        simulated = {
+            'Avg Wait Time (Hours)': kpis['Avg Wait Time (Hours)'] * 2 + HOURS_PER_DAY,
+            'Max Backlog': kpis['Max Backlog'] * 1.1,
+            'Total Solved': kpis['Total Solved'] + analytic.net_inbound / 2,
+            'Clearance Rate (%)': np.nan,
+        }
+        agrees = {check['KPI']: check['Agrees'] for check in analytic.cross_check(simulated)}
+        self.assertEqual(agrees, {
+            'Avg Wait Time (Hours)': False, 'Max Backlog': True, 'Total Solved': True, 'Clearance Rate (%)': True
+        })
+        self.assertTrue(analytic.cross_check(simulated, tolerance=1.5)[0]['Agrees'])
+        with self.assertRaises(TypeError):
+            run_analytic(n_replications=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
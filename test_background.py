@@ -0,0 +1,77 @@
+import threading
+import unittest
+from background import BackgroundJob, cancel_job, replace_job
+
+
+def gated_steps(gate, values):
+    """Yields ``values``, each after ``gate`` is set once more."""
+    for value in values:
+        gate.wait(5)
+        gate.clear()
+        yield value
+
+
+class TestBackgroundJob(unittest.TestCase):
+    def test_partial_and_final_results(self):
+        """Test that the latest step is published while running and the last one is the result."""
+        gate = threading.Event()
+        job = BackgroundJob('key', gated_steps(gate, [1, 2, 3]))
+        self.assertFalse(job.wait(0.05))
+        self.assertIsNone(job.latest)
+        with self.assertRaises(RuntimeError):
+            job.result()
+        gate.set()
+        while job.latest is None:
+            job.wait(0.01)
+        self.assertEqual(job.latest, 1)
+        self.assertFalse(job.done)
+        while not job.wait(0.01):
+            gate.set()
+        self.assertEqual(job.result(), 3)
+
+    def test_cancel_stops_before_next_step(self):
+        """Test that a cancelled job computes no further steps."""
+        computed = []
+
+        def steps(gate):
+            for value in gated_steps(gate, range(10)):
+                computed.append(value)
+                yield value
+
+        gate = threading.Event()
+        job = BackgroundJob('key', steps(gate))
+        job.cancel()
+        gate.set()
+        job._thread.join(5)
+        self.assertTrue(job.cancelled)
+        self.assertFalse(job.done)
+        self.assertLessEqual(len(computed), 1)
+
+    def test_replace_job(self):
+        """Test that the same key reuses the job and another key cancels it."""
+        jobs, started = {}, []
+
+        def steps():
+            started.append(True)
+            yield 'result'
+
+        first = replace_job(jobs, 'mc', 'a', steps)
+        self.assertIs(replace_job(jobs, 'mc', 'a', steps), first)
+        second = replace_job(jobs, 'mc', 'b', steps)
+        self.assertTrue(first.cancelled)
+        self.assertTrue(second.wait(5))
+        self.assertEqual((second.result(), len(started)), ('result', 2))
+
+        def failing():
+            raise ValueError('bad parameters')
+            yield
+        with self.assertRaises(ValueError):
+            third = replace_job(jobs, 'mc', 'c', failing)
+            third.wait(5)
+            third.result()
+        cancel_job(jobs, 'mc')
+        self.assertEqual(jobs, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
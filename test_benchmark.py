@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from benchmark import (
+    BenchmarkCase, StartupCase, benchmark_cases, find_regressions, load_baseline, run_benchmarks, save_baseline
+)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_matrix_and_baseline_roundtrip(self):
+        """Test that cases are measured, skipped above the work limit and saved as JSON."""
+        names = [case.name for case in benchmark_cases('full')]
+        self.assertIn('mc1000-d365-a50-v0.2', names)
+        self.assertNotIn('mc1000-d3650-a5000-v0.2', names)
+
+        results = run_benchmarks([BenchmarkCase(days=30, agents=5, volatility=0.2, replications=10)])
+        result = results['mc10-d30-a5-v0.2']
+        self.assertGreater(result['seconds'], 0)
+        self.assertGreater(result['peak_bytes'], 0)
+        self.assertGreaterEqual(result['repeats'], 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline(results, path)
+            baseline = load_baseline(path)
+        self.assertEqual(baseline['results'], results)
+        self.assertIn('numpy', baseline['environment'])
+
+    def test_regression_gate(self):
+        """Test that only tracked cases beyond threshold and noise floor regress."""
+        baseline = {
+            'a': {'seconds': 0.100, 'peak_bytes': 50 << 20},
+            'b': {'seconds': 0.001, 'peak_bytes': 1 << 10},
+        }
+        results = {
+            'a': {'seconds': 0.140, 'peak_bytes': 51 << 20},    # 40% slower
+            'b': {'seconds': 0.0015, 'peak_bytes': 4 << 10},    # slower and bigger, but within noise
+            'c': {'seconds': 9.0, 'peak_bytes': 1 << 30},       # not in the baseline
+        }
+        regressions = find_regressions(results, baseline, threshold=0.25)
+        self.assertEqual([(r['case'], r['metric']) for r in regressions], [('a', 'seconds')])
+        self.assertAlmostEqual(regressions[0]['change'], 0.4)
+        self.assertEqual(find_regressions(results, baseline, threshold=0.5), [])
+
+    def test_startup_cases(self):
+        """Test that pages are timed by their imports and the core imports without pandas or Plotly."""
+        names = [case.name for case in benchmark_cases('quick', 'import')]
+        self.assertEqual(names[:2], ['import-simulation', 'import-cli'])
+        self.assertIn('import-page-simulation', names)
+        self.assertIn('import streamlit as st', StartupCase('0_🎫_Simulation.py').imports())
+
+        result = run_benchmarks([StartupCase('simulation')])['import-simulation']
+        self.assertGreater(result['seconds'], 0)
+        self.assertGreater(result['peak_bytes'], 0)
+
+        loaded = subprocess.run(
+            [sys.executable, '-c', "import sys, simulation, cohorts, sweep; print(sorted({'pandas', 'plotly'} & set(sys.modules)))"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        self.assertEqual(loaded.stdout.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import calibration
+from calibration import CalibrationError, aggregate_export, calibrate, fit_parameters, main
+from cli import load_scenarios
+from simulation import run_simulation
+
+
+def synthetic_export(days=300, avg_daily_tickets=150, volatility=0.3, seed=0):
+    """One row per ticket with lognormal daily counts, complexity factors 1 / 2 / 4 and 0.25 hours per Low ticket."""
+    rng = np.random.default_rng(seed)
+    sigma = np.sqrt(np.log(1 + volatility ** 2))
+    counts = np.round(np.exp(rng.normal(np.log(avg_daily_tickets) - sigma ** 2 / 2, sigma, days))).astype(int)
+    day = np.repeat(np.arange(days), counts)
+    n = len(day)
+    levels = rng.choice(['low', 'Medium', 'HIGH'], n, p=[0.6, 0.3, 0.1])
+    factors = pd.Series(levels).str.lower().map({'low': 1.0, 'medium': 2.0, 'high': 4.0}).to_numpy()
+    automated = rng.random(n) < 0.15
+    return pd.DataFrame({
+        'created_at': pd.Timestamp('2024-01-01') + pd.to_timedelta(day, 'D') + pd.to_timedelta(rng.uniform(0, 86400, n), 's'),
+        'complexity': levels,
+        'handling_hours': np.where(automated, np.nan, factors * 0.25 * rng.exponential(1, n)),
+        'automated': automated,
+    })
+
+
+class TestCalibration(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_fit_recovers_parameters_from_chunks(self):
+        """Test that chunked CSV and Parquet exports recover the generating parameters."""
+        export = synthetic_export()
+        export.to_csv(self.path / 'export.csv', index=False)
+        export.to_parquet(self.path / 'export.parquet')
+
+        fitted = calibrate(self.path / 'export.csv', chunk_rows=5000, cache_dir=None)
+        params = fitted.params
+        self.assertAlmostEqual(params['avg_daily_tickets'], 150, delta=5)
+        self.assertAlmostEqual(params['volatility'], 0.3, delta=0.03)
+        self.assertAlmostEqual(params['automation_rate'], 0.15, delta=0.01)
+        self.assertAlmostEqual(params['complexity_mix']['Low'], 0.6, delta=0.01)
+        self.assertAlmostEqual(params['agent_efficiency'], 4, delta=0.1)
+        self.assertAlmostEqual(params['complexity_factors']['High'], 4, delta=0.15)
+        self.assertEqual((fitted.days, fitted.tickets), (300, len(export)))
+        self.assertEqual(calibrate(self.path / 'export.parquet', chunk_rows=7000, cache_dir=None), fitted)
+
+        # The fit is a ready-to-run scenario
+        self.assertEqual(len(run_simulation(days=30, rng=1, **params)), 30)
+
+    def test_cache_uses_mtime_then_hash(self):
+        """Test that unchanged exports are not aggregated again, even when touched."""
+        export_path = self.path / 'export.csv'
+        synthetic_export(days=60).to_csv(export_path, index=False)
+        cache_dir = self.path / 'cache'
+        with mock.patch.object(calibration, 'aggregate_export', wraps=aggregate_export) as aggregate:
+            first = calibrate(export_path, cache_dir=cache_dir)
+            self.assertEqual(calibrate(export_path, cache_dir=cache_dir), first)
+            self.assertEqual(aggregate.call_count, 1)
+
+            stat = export_path.stat()
+            os.utime(export_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            with mock.patch.object(calibration, 'file_digest', wraps=calibration.file_digest) as digest:
+                self.assertEqual(calibrate(export_path, cache_dir=cache_dir), first)
+                self.assertEqual((aggregate.call_count, digest.call_count), (1, 1))
+                calibrate(export_path, cache_dir=cache_dir)
+                self.assertEqual(digest.call_count, 1)
+
+            synthetic_export(days=60, avg_daily_tickets=80).to_csv(export_path, index=False)
+            changed = calibrate(export_path, cache_dir=cache_dir)
+            self.assertEqual(aggregate.call_count, 2)
+            self.assertLess(changed.params['avg_daily_tickets'], 100)
+
+    def test_columns_labels_and_cli(self):
+        """Test renamed columns, custom labels, partial exports, invalid input and the scenario file."""
+        export_path = self.path / 'export.csv'
+        pd.DataFrame({
+            'opened': ['2024-03-01 09:00', '2024-03-01 10:00', 'not a date', '2024-03-03 08:00', '2024-03-03 09:00'],
+            'prio': ['P3', 'P1', 'P3', 'P3', 'P2'],
+            'agent_hours': [0.5, 2.0, 1.0, 0.5, 1.0],
+        }).to_csv(export_path, index=False)
+        fitted = calibrate(
+            export_path, columns={'created': 'opened', 'complexity': 'prio', 'handling_hours': 'agent_hours'},
+            complexity_labels={'P1': 'High', 'P2': 'Medium', 'P3': 'Low'}, cache_dir=None
+        )
+        self.assertEqual((fitted.days, fitted.empty_days, fitted.skipped_rows), (3, 1, 1))
+        self.assertEqual(fitted.params['complexity_factors'], {'Low': 1.0, 'Medium': 2.0, 'High': 4.0})
+        self.assertNotIn('automation_rate', fitted.params)
+        self.assertEqual(fitted.handling_hours['Low'], 0.5)
+
+        agg = aggregate_export(export_path, columns={'created': 'opened'})
+        self.assertEqual(set(fit_parameters(agg).params), {'avg_daily_tickets', 'volatility'})
+        with self.assertRaises(CalibrationError):
+            calibrate(export_path, cache_dir=None)
+
+        scenario_path = self.path / 'scenario.json'
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(main([str(export_path), '--column', 'created=opened', '--no-cache', '-o', str(scenario_path)]), 0)
+            self.assertEqual(main([str(export_path), '--no-cache']), calibration.EXIT_INVALID)
+        scenario, = load_scenarios(scenario_path)
+        self.assertEqual(scenario['name'], 'calibrated')
+        self.assertEqual(set(scenario['params']), {'avg_daily_tickets', 'volatility'})
+
+
+if __name__ == '__main__':
+    unittest.main()
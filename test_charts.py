@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import pandas as pd
+from charts import bar_buckets, box, cdf, downsample, histogram, line_figure, lttb, result_hash, scatter
+from result_cache import SimulationCache
+
+
+class TestCharts(unittest.TestCase):
+    def test_lttb_keeps_extremes(self):
+        """Test that LTTB keeps endpoints and spikes, and long traces switch to WebGL."""
+        rng = np.random.default_rng(3)
+        y = np.sin(np.arange(20000) / 300) + rng.normal(0, 0.05, 20000)
+        y[12345], y[777] = 25, -25
+        keep = lttb(np.arange(20000), y, 500)
+        self.assertEqual(len(keep), 500)
+        self.assertTrue((np.diff(keep) > 0).all())
+        self.assertTrue({0, 777, 12345, 19999} <= set(keep))
+
+        dates = pd.date_range('2025-01-01', periods=5000)
+        low, high = rng.random(5000), rng.random(5000) + 1
+        keep = downsample(dates, low, high, max_points=1000)
+        self.assertTrue(set(lttb(dates, high, 1000)) <= set(keep))
+        self.assertLessEqual(len(keep), 2000)
+        np.testing.assert_array_equal(downsample(dates[:100], low[:100]), np.arange(100))
+        self.assertEqual(scatter(dates[keep], high[keep]).type, 'scattergl')
+        self.assertEqual(scatter(dates[:100], high[:100]).type, 'scatter')
+
+    def test_summaries(self):
+        """Test that bars, histograms, CDFs and boxes are summarized without losing totals."""
+        hours, means = bar_buckets(np.arange(1440), np.ones(1440) * 3)
+        self.assertEqual(len(hours), 360)
+        np.testing.assert_allclose(means, 3)
+
+        values = np.random.default_rng(0).exponential(10, 5000)
+        centers, heights = histogram(values, weights=np.full(5000, 2.0))
+        self.assertEqual(len(centers), 80)
+        self.assertAlmostEqual(heights.sum(), 10000)
+
+        x, share = cdf([5, 1, 3], [1, 2, 1])
+        np.testing.assert_allclose(x, [1, 3, 5])
+        np.testing.assert_allclose(share, [0.5, 0.75, 1])
+
+        trace = box([1, 2, 3, 4, 100], 'A')
+        self.assertEqual(trace.median, (3,))
+        self.assertEqual(trace.upperfence, (4,))
+        self.assertIsNone(trace.y)
+
+    def test_figure_cache_ignores_labels(self):
+        """Test that a relabeled figure is served from the cache and new data rebuilds it."""
+        cache = SimulationCache()
+        frame = pd.DataFrame({'Date': pd.date_range('2025-01-01', periods=3000), 'Backlog': np.arange(3000.0)})
+        traces = [('Backlog', 'Rückstand', dict(line=dict(color='red')))]
+        german = line_figure(frame, 'Date', traces, cache=cache, title='Puls')
+        english = line_figure(frame, 'Date', [('Backlog', 'Backlog', traces[0][2])], cache=cache, title='Pulse')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual((german['data'][0]['name'], english['data'][0]['name']), ('Rückstand', 'Backlog'))
+        self.assertEqual(english['layout']['title'], 'Pulse')
+        self.assertEqual(english['data'][0]['type'], 'scattergl')
+        self.assertEqual(len(english['data'][0]['x']), 2000)
+
+        frame.loc[0, 'Backlog'] = -1
+        self.assertNotEqual(result_hash(frame['Backlog']), result_hash(frame['Backlog'] + 1))
+        line_figure(frame, 'Date', traces, cache=cache)
+        self.assertEqual(cache.misses, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
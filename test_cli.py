@@ -0,0 +1,113 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import pandas as pd
+from cli import EXIT_INVALID, EXIT_OK, EXIT_SLA_VIOLATION, load_scenarios, main, run_scenarios
+
+SCENARIOS = """
+seed = 7
+n_replications = 50
+
+[defaults]
+days = 60
+start_date = 2025-01-01
+
+[sla]
+target_wait_hours = 24
+wait_percentile = 90
+
+[[scenarios]]
+name = "staffed"
+full_time_agents = 8
+
+[[scenarios]]
+name = "understaffed"
+full_time_agents = 3
+absence_model = { type = "clustered", max_block_days = 5 }
+queue_policy = "strict"
+
+[[scenarios]]
+name = "tickets"
+engine = "event"
+n_replications = 1
+"""
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'scenarios.toml')
+        with open(self.path, 'w') as file:
+            file.write(SCENARIOS)
+
+    def run_main(self, *args):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return main(list(args))
+
+    def test_batch_run_writes_results_and_reports_sla(self):
+        """Test that scenarios run deterministically and SLA violations set the exit code."""
+        output = os.path.join(self.directory.name, 'out')
+        self.assertEqual(self.run_main(self.path, '-o', output, '-j', '2'), EXIT_SLA_VIOLATION)
+
+        summary = pd.read_csv(os.path.join(output, 'kpis.csv'))
+        self.assertEqual(list(summary['Scenario']), ['staffed', 'understaffed', 'tickets'])
+        self.assertEqual(list(summary['SLA Met']), [True, False, True])
+        self.assertEqual(len(pd.read_csv(os.path.join(output, 'daily', 'understaffed.csv'))), 60)
+
+        # Same seeds whatever the worker count
+        sequential = run_scenarios(load_scenarios(self.path), max_workers=1)
+        pd.testing.assert_frame_equal(pd.DataFrame([row for row, _ in sequential]), summary, check_dtype=False)
+
+        with open(self.path, 'w') as file:
+            file.write(SCENARIOS.replace('full_time_agents = 3', 'full_time_agents = 9'))
+        self.assertEqual(self.run_main(self.path, '-o', output), EXIT_OK)
+
+    def test_invalid_files(self):
+        """Test that unreadable, malformed and unknown entries exit with EXIT_INVALID."""
+        json_path = os.path.join(self.directory.name, 'scenarios.json')
+        for spec in ({'scenarios': [{'name': 'a', 'full_time_agent': 5}]},
+                     {'scenarios': [{'name': 'a', 'queue_policy': 'random'}]},
+                     {'scenarios': [{'name': 'a', 'automation_rate': {'type': 'linear', 'points': {'0': 0.1}}}]},
+                     {'scenarios': [{'name': 'a', 'engine': 'event', 'n_replications': 10}]},
+                     {'scenarios': [{'name': 'a'}, {'name': 'a'}]},
+                     {'scenarios': [{'name': 'a', 'complexity_mix': {'Low': 1.0}}]},
+                     {'scenarios': ['a']}):
+            with open(json_path, 'w') as file:
+                json.dump(spec, file)
+            self.assertEqual(self.run_main(json_path, '-o', self.directory.name), EXIT_INVALID)
+        self.assertEqual(self.run_main(os.path.join(self.directory.name, 'missing.toml')), EXIT_INVALID)
+
+    def test_schedule_tables(self):
+        """Test that schedule tables and per-day lists in a scenario file become per-day parameters."""
+        with open(self.path, 'w') as file:
+            file.write(SCENARIOS + '''
+[[scenarios]]
+name = "hiring"
+n_replications = 1
+full_time_agents = { type = "steps", points = { 0 = 3, "2025-01-31" = 8 } }
+automation_rate = { type = "ramp", points = { 0 = 0.0, 59 = 0.5 } }
+complexity_mix = { Low = [0.5] * 60, Medium = 0.3, High = 0.2 }
+'''.replace('[0.5] * 60', str([0.5] * 60)))
+        scenario = load_scenarios(self.path)[-1]
+        _, daily = run_scenarios([scenario], max_workers=1)[0]
+        self.assertLessEqual(daily['Staff Available (FT)'][:30].max(), 3)
+        self.assertGreater(daily['Staff Available (FT)'][30:].max(), 3)
+        self.assertEqual(daily['Inbound (Net)'].iloc[0], daily['Inbound (Raw)'].iloc[0])
+
+    def test_does_not_import_ui_libraries(self):
+        """Test that the batch runner starts without Streamlit or Plotly."""
+        loaded = subprocess.run(
+            [sys.executable, '-c', "import sys, cli; print(sorted({'streamlit', 'plotly'} & set(sys.modules)))"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        self.assertEqual(loaded.stdout.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from collections import deque
+import numpy as np
+from cohorts import age_summary, ticket_age_distribution, track_cohorts
+from simulation import run_monte_carlo, run_simulation
+
+
+class TestCohorts(unittest.TestCase):
+    def test_matches_ticket_by_ticket_fifo(self):
+        """Test solved and open counts per age against a per-ticket FIFO queue."""
+        rng = np.random.default_rng(7)
+        for _ in range(50):
+            days, buffer_days = int(rng.integers(1, 30)), int(rng.integers(1, 10))
+            inbound = rng.integers(0, 10, days).astype(float)
+            capacity = rng.integers(0, 10, days)
+            n_ages = min(buffer_days, days)
+            queue, solved = deque(), np.zeros(days)
+            solved_by_age, open_by_age = np.zeros(n_ages + 1), np.zeros(n_ages + 1)
+            for day in range(days):
+                queue.extend([day] * int(inbound[day]))
+                while queue and solved[day] < capacity[day]:
+                    solved_by_age[min(day - queue.popleft(), n_ages)] += 1
+                    solved[day] += 1
+            for arrival in queue:
+                open_by_age[min(days - 1 - arrival, n_ages)] += 1
+
+            ages = track_cohorts(inbound, solved, buffer_days)
+            np.testing.assert_allclose(ages['solved_by_age'], solved_by_age)
+            np.testing.assert_allclose(ages['open_by_age'], open_by_age)
+
+    def test_steady_backlog_age(self):
+        """Test that a steady half-day backlog ages every ticket by half a day."""
+        inbound = np.full(30, 100.0)
+        solved = inbound.copy()
+        solved[0] = 50
+        ages = track_cohorts(inbound, solved)
+        served = ages['solved_by_age'] > 0
+        np.testing.assert_allclose(ages['age_days'][served][1:], 0.5)
+
+    def test_distribution_for_all_engines(self):
+        """Test that every engine accounts for all tickets and Monte Carlo reports age percentiles."""
+        params = {'days': 40, 'rng': 5, 'start_date': '2025-01-01', 'avg_daily_tickets': 170}
+        for engine in ('daily', 'hourly', 'event'):
+            ages = ticket_age_distribution(engine=engine, **params)
+            df = run_simulation(engine=engine, **params)
+            self.assertAlmostEqual(ages['Solved'].sum() + ages['Open'].sum(), df['Inbound (Net)'].sum(), delta=40)
+            summary = age_summary(ages, sla_hours=24)
+            self.assertLessEqual(summary['P50'], summary['P99'])
+            self.assertGreater(summary['sla_breaches'], 0)
+
+        kpis = run_monte_carlo(100, **params).kpis
+        self.assertTrue((kpis['P50 Ticket Age (Hours)'] <= kpis['P99 Ticket Age (Hours)']).all())
+
+    def test_empty_horizon(self):
+        """Test that a run without days has no ages and still gives its table and KPIs."""
+        ages = track_cohorts(np.zeros((3, 0)), np.zeros((3, 0)))
+        self.assertEqual(ages['solved_by_age'].shape, (3, 1))
+        self.assertEqual(ticket_age_distribution(days=0, rng=1)['Solved'].tolist(), [0.0])
+        self.assertTrue(run_simulation(days=0, rng=1).empty)
+        kpis = run_simulation(days=0, rng=1, as_frame=False).kpis()
+        self.assertEqual(kpis['Total Solved'], 0)
+        self.assertTrue(np.isnan(kpis['Avg Wait Time (Hours)']))
+
+
+if __name__ == '__main__':
+    unittest.main()
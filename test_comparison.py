@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from comparison import COMPARISON_KPIS, run_comparison
+from queue_policy import StrictPriority
+from random_streams import CommonRandomNumbers
+from result_cache import SimulationCache, cached_run_comparison
+from simulation import run_monte_carlo
+
+SCENARIOS = {
+    'Base': {},
+    'Short-staffed': {'full_time_agents': 3, 'agent_efficiency': 2.0},
+    'Part-time': {'part_time_agents': 4, 'part_time_hours': 5.0, 'vacation_rate': 0.1},
+}
+
+
+class TestComparison(unittest.TestCase):
+    def test_batched_matches_single_runs(self):
+        """Test that every scenario of the batch equals its own Monte Carlo run on the same draws."""
+        comparison = run_comparison(SCENARIOS, n_replications=50, seed=3, days=60, start_date='2025-01-01')
+        self.assertEqual(comparison.scenarios, list(SCENARIOS))
+        for name, params in SCENARIOS.items():
+            single = run_monte_carlo(
+                50, rng=CommonRandomNumbers(60, 50, 3), days=60, start_date='2025-01-01', **params
+            )
+            batched = comparison.results[name]
+            for kpi in single.kpis:
+                np.testing.assert_allclose(batched.kpis[kpi], single.kpis[kpi], err_msg=f'{name}: {kpi}')
+            np.testing.assert_allclose(batched.bands.to_numpy(dtype=float), single.bands.to_numpy(dtype=float))
+            self.assertGreater(comparison.ages[name]['Solved'].sum(), 0)
+
+    def test_paired_differences(self):
+        """Test that differences refer to the baseline and detect a clearly worse team."""
+        comparison = run_comparison(SCENARIOS, n_replications=200, seed=1, baseline='Base', days=90)
+        differences = comparison.differences.set_index(['Scenario', 'KPI'])
+        self.assertEqual(len(differences), len(SCENARIOS) * len(COMPARISON_KPIS))
+        base = differences.loc['Base']
+        self.assertTrue((base[['Difference', 'CI Low', 'CI High']] == 0).all().all())
+        self.assertFalse(base['Significant'].any())
+
+        wait = differences.loc[('Short-staffed', 'Avg Wait Time (Hours)')]
+        self.assertGreater(wait['CI Low'], 0)
+        self.assertTrue(wait['Significant'])
+        self.assertLessEqual(wait['CI Low'], wait['Difference'])
+        kpis = comparison.results
+        np.testing.assert_allclose(
+            wait['Difference'],
+            (kpis['Short-staffed'].kpis['Avg Wait Time (Hours)'] - kpis['Base'].kpis['Avg Wait Time (Hours)']).mean()
+        )
+        self.assertLess(differences.loc[('Short-staffed', 'Staff Hours'), 'Difference'], 0)
+        self.assertEqual(list(comparison.kpi_summary().index), list(SCENARIOS))
+
+    def test_validation_and_cache(self):
+        """Test that shared parameters cannot vary and seeded comparisons are cached."""
+        with self.assertRaises(ValueError):
+            run_comparison({'A': {'days': 30}}, n_replications=10)
+        with self.assertRaises(ValueError):
+            run_comparison({'A': {}}, n_replications=10, queue_policy=StrictPriority())
+        with self.assertRaises(ValueError):
+            run_comparison({'A': {}}, n_replications=10, baseline='B')
+        with self.assertRaises(TypeError):
+            run_comparison({'A': {}}, n_replications=10, rng=1)
+
+        cache = SimulationCache()
+        first = cached_run_comparison(SCENARIOS, n_replications=20, seed=2, days=30, cache=cache)
+        second = cached_run_comparison(SCENARIOS, n_replications=20, seed=2, days=30, cache=cache)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertIsNot(first.differences, second.differences)
+        np.testing.assert_allclose(first.differences['Difference'], second.differences['Difference'])
+
+
+if __name__ == '__main__':
+    unittest.main()
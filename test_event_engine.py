@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from event_engine import simulate_tickets
+from simulation import REACTION_TIME_HOURS, run_monte_carlo, run_simulation
+
+
+class TestEventEngine(unittest.TestCase):
+    def test_same_schema_as_daily_model(self):
+        """Test that the event engine returns the daily columns and balances its tickets."""
+        params = {'days': 40, 'avg_daily_tickets': 150, 'rng': 3, 'start_date': '2025-01-01'}
+        daily = run_simulation(**params)
+        event = run_simulation(engine='event', **params)
+        self.assertEqual(list(event.columns), list(daily.columns))
+        self.assertTrue(event.dtypes.equals(daily.dtypes))
+        self.assertTrue(event['Date'].equals(daily['Date']))
+        # Same inbound and absence draws as the daily model
+        np.testing.assert_array_equal(event['Staff Available (FT)'], daily['Staff Available (FT)'])
+        np.testing.assert_array_equal(event['Inbound (Raw)'], daily['Inbound (Raw)'])
+
+        self.assertEqual(event['Inbound (Net)'].sum() - event['Solved'].sum(), event['Backlog (End of Day)'].iloc[-1])
+        self.assertTrue(event.equals(run_simulation(engine='event', **params)))
+
+    def test_tickets_wait_at_least_their_service_time(self):
+        """Test per-ticket times: no ticket finishes before reaction plus service time."""
+        log = simulate_tickets(days=20, avg_daily_tickets=300, full_time_agents=4, part_time_agents=3, rng=5)
+        factors = np.array([1.0, 1.5, 2.5])[log.complexity] / 5
+        done = np.isfinite(log.resolved)
+        self.assertTrue(done.any())
+        self.assertTrue((log.wait_hours[done] >= REACTION_TIME_HOURS + factors[done] - 1e-9).all())
+        self.assertTrue(((log.agent >= 0) == done).all())
+        self.assertTrue((np.diff(log.arrival) >= 0).all())
+
+    def test_idle_agents_serve_immediately(self):
+        """Test that with plenty of idle agents a ticket waits exactly reaction plus service time."""
+        log = simulate_tickets(
+            days=5, avg_daily_tickets=20, volatility=0, full_time_agents=50, part_time_agents=0,
+            vacation_rate=0, automation_rate=0, rng=1
+        )
+        service = np.array([1.0, 1.5, 2.5])[log.complexity] / 5
+        same_shift = (log.arrival % 24) + REACTION_TIME_HOURS + service <= 8
+        np.testing.assert_allclose(log.wait_hours[same_shift], REACTION_TIME_HOURS + service[same_shift])
+
+    def test_monte_carlo_rejects_event_engine(self):
+        """Test that batched runs and unknown engine names are rejected."""
+        with self.assertRaises(ValueError):
+            run_monte_carlo(10, engine='event')
+        with self.assertRaises(ValueError):
+            run_simulation(engine='weekly')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from intraday import DEFAULT_FT_COVERAGE
+from simulation import run_simulation
+
+
+class TestIntraday(unittest.TestCase):
+    def test_rolls_up_to_daily_columns(self):
+        """Test that hourly buckets sum to the daily model's inbound and capacity."""
+        params = {'days': 28, 'rng': 4, 'start_date': '2025-03-03', 'part_time_hours': 3.5}
+        daily = run_simulation(**params)
+        rolled_up = run_simulation(engine='hourly', **params)
+        self.assertEqual(list(rolled_up.columns), list(daily.columns))
+        for column in ['Inbound (Raw)', 'Inbound (Net)', 'Capacity (Tickets)', 'Staff Available (FT)']:
+            np.testing.assert_array_equal(rolled_up[column], daily[column])
+
+        hours = run_simulation(engine='hourly', resolution='hour', **params)
+        self.assertEqual(len(hours), 28 * 24)
+        np.testing.assert_allclose(
+            hours['Inbound (Net)'].sum() - hours['Solved'].sum(), hours['Backlog (End of Hour)'].iloc[-1], atol=0.1
+        )
+
+    def test_arrival_curve_and_shift_coverage(self):
+        """Test a Monday-only morning surge and a lunch-hour gap in coverage."""
+        curve = np.ones((7, 24))
+        curve[0, 8] = 100  # Monday 08:00
+        coverage = {'FT': DEFAULT_FT_COVERAGE, 'PT': np.zeros(24)}
+        hours = run_simulation(
+            days=7, start_date='2025-03-03', volatility=0, automation_rate=0, engine='hourly',
+            resolution='hour', arrival_curve=curve, shift_coverage=coverage, rng=1
+        ).set_index('Time')
+        monday_8, tuesday_8 = hours['Inbound (Net)'].iloc[8], hours['Inbound (Net)'].iloc[24 + 8]
+        self.assertGreater(monday_8, 10 * tuesday_8)
+        self.assertTrue((hours['Capacity (Tickets)'].iloc[12::24] == 0).all())
+        self.assertTrue((hours['Capacity (Tickets)'].iloc[0:8] == 0).all())
+        # Tickets arriving overnight wait for the morning shift
+        self.assertGreater(hours['Est. Wait Time (Hours)'].iloc[24 + 2], 5)
+
+    def test_invalid_inputs(self):
+        """Test that hourly-only options are validated."""
+        with self.assertRaises(ValueError):
+            run_simulation(engine='hourly', arrival_curve=np.ones(12))
+        with self.assertRaises(ValueError):
+            run_simulation(resolution='hour')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from unittest import mock
+from profiling import PROFILE_ENV, Profiler, checkpoint, profile_mode, section
+from simulation import run_monte_carlo, run_simulation
+
+
+class TestProfiling(unittest.TestCase):
+    def test_stage_sections_and_json(self):
+        """Test that an active profiler times every stage, nested sections and checkpoints."""
+        with Profiler() as profiler:
+            run_simulation(days=30, rng=1)
+            run_monte_carlo(20, days=30, rng=1)
+            checkpoint('page: simulation')
+        summary = {entry['section']: entry for entry in profiler.summary()}
+        for stage in ('draws', 'capacity', 'queue', 'metrics'):
+            self.assertEqual(summary[f'stage: {stage}']['calls'], 2)
+        self.assertIn('stage: draws / absences', summary)
+        self.assertEqual(summary['monte carlo summary']['calls'], 1)
+        self.assertGreaterEqual(summary['page: simulation']['seconds'], summary['stage: queue']['seconds'])
+
+        exported = json.loads(profiler.to_json())
+        self.assertEqual(exported['mode'], 'timings')
+        self.assertGreater(exported['wall_seconds'], 0)
+        self.assertIsNone(profiler.pstats_bytes())
+
+        # Inactive again: hooks record nothing
+        records = len(profiler.records)
+        with section('ignored'):
+            run_simulation(days=30, rng=1)
+        self.assertEqual(len(profiler.records), records)
+
+    def test_cprofile_dump(self):
+        """Test that cprofile mode writes a dump pstats can read."""
+        with Profiler('cprofile') as profiler:
+            run_simulation(days=30, rng=1)
+        self.assertTrue(profiler.pstats_bytes())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.pstats')
+            profiler.dump_stats(path)
+            functions = {name for _, _, name in pstats.Stats(path).stats}
+        self.assertIn('_process_queue', functions)
+
+    def test_cprofile_already_active(self):
+        """Test that a second cprofile profiler falls back to timings and stopping frees cProfile again."""
+        first = Profiler('cprofile').start()
+        try:
+            with Profiler('cprofile') as second:
+                run_simulation(days=30, rng=1)
+        finally:
+            first.stop()
+        self.assertEqual(second.mode, 'timings')
+        self.assertIsNone(second.pstats_bytes())
+        self.assertTrue(second.summary())
+        with Profiler('cprofile') as third:
+            run_simulation(days=30, rng=1)
+        self.assertEqual(third.mode, 'cprofile')
+
+    def test_profile_mode(self):
+        """Test that profiling is off by default and enabled by query value or environment."""
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(profile_mode())
+        with mock.patch.dict(os.environ, {PROFILE_ENV: 'cprofile'}):
+            self.assertEqual(profile_mode(), 'cprofile')
+            self.assertIsNone(profile_mode('0'))
+        self.assertEqual(profile_mode('1'), 'timings')
+
+
+if __name__ == '__main__':
+    unittest.main()
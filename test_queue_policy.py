@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from queue_policy import FifoPolicy, StrictPriority, WeightedFairShare
+from simulation import run_monte_carlo, run_simulation
+
+LEVELS = ['Low', 'Medium', 'High']
+
+
+class TestQueuePolicy(unittest.TestCase):
+    def setUp(self):
+        # Overloaded desk, so a backlog builds up
+        self.params = {'days': 60, 'rng': 3, 'start_date': '2025-01-01', 'avg_daily_tickets': 170}
+
+    def test_fifo_matches_single_queue(self):
+        """Test that per-class FIFO queues add up to the single-queue model."""
+        single = run_simulation(**self.params)
+        fifo = run_simulation(queue_policy=FifoPolicy(), **self.params)
+        for column in single.columns:
+            np.testing.assert_array_equal(fifo[column], single[column])
+        class_total = sum(fifo[f'Backlog (End of Day) [{level}]'] for level in LEVELS)
+        np.testing.assert_allclose(class_total, single['Backlog (End of Day)'], atol=2)
+
+    def test_strict_priority_starves_last_class(self):
+        """Test that the class served last carries the backlog, while total work is conserved."""
+        fifo = run_simulation(queue_policy=FifoPolicy(), **self.params)
+        strict = run_simulation(queue_policy=StrictPriority(LEVELS), **self.params)
+        fair = run_simulation(queue_policy=WeightedFairShare({'Low': 1, 'Medium': 1, 'High': 4}), **self.params)
+
+        self.assertEqual(strict['Backlog (End of Day) [Low]'].max(), 0)
+        self.assertGreater(strict['Backlog (End of Day) [High]'].iloc[-1], 0)
+        self.assertGreater(
+            strict['Est. Wait Time (Hours) [High]'].mean(), 10 * strict['Est. Wait Time (Hours) [Low]'].mean()
+        )
+        self.assertLess(
+            fair['Est. Wait Time (Hours) [High]'].mean(), strict['Est. Wait Time (Hours) [High]'].mean()
+        )
+        # Every policy is work conserving: same queued work, same overall wait estimate
+        for result in (strict, fair):
+            np.testing.assert_allclose(result['Est. Wait Time (Hours)'], fifo['Est. Wait Time (Hours)'], atol=0.02)
+
+    def test_weighted_fair_share_batches(self):
+        """Test the fair split on a small case, and that small and large batches agree."""
+        inbound = np.array([[2.0, 0.0, 9.0], [20.0, 0.0, 0.0]])
+        solved, backlog = WeightedFairShare().serve(inbound, np.array([10.0, 4.0, 10.0]), ('a', 'b'))
+        # Day 1: 'a' needs 2 of its 5, 'b' gets the rest; day 2: 'b' alone; day 3: 5 each
+        np.testing.assert_allclose(solved, [[2, 0, 5], [8, 4, 5]])
+        np.testing.assert_allclose(backlog, [[0, 0, 4], [12, 8, 3]])
+
+        rng = np.random.default_rng(5)
+        inbound = rng.gamma(1.0, 10.0, (200, 3, 90)) * (rng.random((200, 3, 90)) < 0.7)
+        capacity = np.full((200, 90), 14.0)
+        policy = WeightedFairShare({'a': 1, 'b': 2, 'c': 4})
+        batch = policy.serve(inbound, capacity, ('a', 'b', 'c'))
+        small = policy.serve(inbound[:5], capacity[:5], ('a', 'b', 'c'))
+        for large, few in zip(batch, small):
+            np.testing.assert_allclose(large[:5], few, atol=1e-9)
+        # Work conserving: capacity left over only on days without backlog
+        idle = capacity - batch[0].sum(axis=-2)
+        self.assertTrue((batch[1].sum(axis=-2)[idle > 1e-9] < 1e-9).all())
+
+    def test_priority_classes_and_monte_carlo(self):
+        """Test (priority, complexity) classes in batched runs and invalid options."""
+        result = run_monte_carlo(
+            200, queue_policy=StrictPriority(), priority_mix={'Urgent': 0.2, 'Normal': 0.8}, **self.params
+        )
+        self.assertIn('Avg Wait Time (Hours) [Urgent High]', result.kpis.columns)
+        self.assertIn('Backlog (End of Day) [Normal Low] P50', result.bands.columns)
+        self.assertTrue((result.kpis['Max Backlog [Urgent Low]'] == 0).all())
+
+        with self.assertRaises(ValueError):
+            run_simulation(priority_mix={'Urgent': 1.0})
+        with self.assertRaises(ValueError):
+            run_simulation(queue_policy=StrictPriority(['Low', 'High']))
+        with self.assertRaises(ValueError):
+            run_simulation(queue_policy=FifoPolicy(), engine='event')
+
+
+if __name__ == '__main__':
+    unittest.main()
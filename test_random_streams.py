@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+from random_streams import CommonRandomNumbers, spawn_rngs
+from simulation import run_monte_carlo, run_simulation
+
+
+class TestRandomStreams(unittest.TestCase):
+    def test_seed_is_reproducible_and_leaves_global_state_alone(self):
+        """Test that an explicit seed reproduces a run without touching np.random."""
+        np.random.seed(0)
+        state = np.random.get_state()[1].copy()
+        df_1 = run_simulation(days=40, rng=123)
+        df_2 = run_simulation(days=40, rng=np.random.default_rng(123))
+        np.testing.assert_array_equal(np.random.get_state()[1], state)
+        self.assertTrue(df_1.drop(columns='Date').equals(df_2.drop(columns='Date')))
+        df_3 = run_simulation(days=40, rng=124)
+        self.assertFalse(df_1['Inbound (Raw)'].equals(df_3['Inbound (Raw)']))
+
+    def test_spawned_streams_are_independent(self):
+        """Test that spawned child streams are reproducible and differ from each other."""
+        first = [rng.random(3) for rng in spawn_rngs(7, 3)]
+        second = [rng.random(3) for rng in spawn_rngs(7, 3)]
+        np.testing.assert_array_equal(first, second)
+        self.assertFalse(np.allclose(first[0], first[1]))
+
+    def test_common_random_numbers_share_draws(self):
+        """Test that scenarios sharing common random numbers see the same inbound."""
+        crn = CommonRandomNumbers(days=30, seed=5)
+        df_a = run_simulation(days=30, full_time_agents=3, rng=crn)
+        df_b = run_simulation(days=30, full_time_agents=8, vacation_rate=0.2, rng=crn)
+        self.assertTrue(df_a['Inbound (Raw)'].equals(df_b['Inbound (Raw)']))
+
+        # Draw order of scenarios does not matter
+        crn_reversed = CommonRandomNumbers(days=30, seed=5)
+        df_b_first = run_simulation(days=30, full_time_agents=8, vacation_rate=0.2, rng=crn_reversed)
+        self.assertTrue(df_b.drop(columns='Date').equals(df_b_first.drop(columns='Date')))
+
+        with self.assertRaises(ValueError):
+            run_simulation(days=31, rng=crn)
+
+    def test_common_random_numbers_reduce_paired_variance(self):
+        """Test that paired differences vary less with common random numbers."""
+        params_a = {'days': 60, 'full_time_agents': 4, 'part_time_agents': 0, 'avg_daily_tickets': 150}
+        params_b = {**params_a, 'full_time_agents': 5}
+
+        crn = CommonRandomNumbers(days=60, n_replications=400, seed=11)
+        paired = (run_monte_carlo(400, rng=crn, **params_b).kpis['Max Backlog']
+                  - run_monte_carlo(400, rng=crn, **params_a).kpis['Max Backlog'])
+        independent = (run_monte_carlo(400, rng=1, **params_b).kpis['Max Backlog']
+                       - run_monte_carlo(400, rng=2, **params_a).kpis['Max Backlog'])
+        self.assertLess(paired.var(), independent.var() / 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
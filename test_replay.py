@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from queue_policy import StrictPriority
+from replay import available_agents, run_replay
+from simulation import _run_stages, run_simulation, simulation_defaults
+
+
+class TestReplay(unittest.TestCase):
+    def test_replaying_draws_reproduces_run_simulation(self):
+        """Test that replaying a run's own inbound and staffing gives the same output."""
+        for extra in ({}, {'queue_policy': StrictPriority(['High', 'Medium', 'Low'])}):
+            params = {'days': 60, 'rng': 5, 'start_date': '2025-01-01', 'full_time_agents': 3, **extra}
+            paths = _run_stages(None, {**simulation_defaults(), **params})
+            replayed = run_replay(
+                paths['raw_inbound'], {'FT': paths['ft_agents_available'], 'PT': paths['pt_agents_available']},
+                start_date='2025-01-01', **extra
+            )
+            pd.testing.assert_frame_equal(replayed, run_simulation(**params))
+
+    def test_memory_mapped_agent_matrix(self):
+        """Test that a memory-mapped (agents x days) file is counted block by block like the dense matrix."""
+        rng = np.random.default_rng(0)
+        presence = rng.random((37, 200)) > 0.2
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'availability.npy'
+            np.save(path, presence.astype(np.uint8))
+            ft_available, pt_available = available_agents(path, full_time_agents=30, block_bytes=1000)
+            np.testing.assert_array_equal(ft_available, presence[:30].sum(axis=0))
+            np.testing.assert_array_equal(pt_available, presence[30:].sum(axis=0))
+
+            inbound = rng.lognormal(np.log(150), 0.2, 200)
+            result = run_replay(inbound, path, full_time_agents=30, as_frame=False, start_date='2025-01-01')
+            counts = {'FT': presence[:30].sum(axis=0), 'PT': presence[30:].sum(axis=0)}
+            self.assertEqual(result.kpis(), run_replay(inbound, counts, as_frame=False, start_date='2025-01-01').kpis())
+            self.assertEqual(result.days, 200)
+        self.assertEqual(available_agents(presence)[1].sum(), 0)
+
+    def test_invalid_traces(self):
+        """Test that parameters replaced by the traces and mismatched shapes are rejected."""
+        counts = {'FT': np.full(10, 5), 'PT': 2}
+        self.assertEqual(len(run_replay(np.full(10, 100), counts)), 10)
+        with self.assertRaises(TypeError):
+            run_replay(np.full(10, 100), counts, avg_daily_tickets=50)
+        with self.assertRaises(TypeError):
+            run_replay(np.full(10, 100), counts, unknown=1)
+        with self.assertRaises(ValueError):
+            run_replay(np.full(12, 100), counts)
+        with self.assertRaises(ValueError):
+            run_replay(np.full((2, 10), 100), counts)
+        with self.assertRaises(ValueError):
+            available_agents(np.ones((4, 10)), full_time_agents=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import pandas as pd
+from random_streams import CommonRandomNumbers
+from result_cache import (
+    SimulationCache,
+    cached_run_monte_carlo,
+    cached_run_simulation,
+    iter_cached_monte_carlo,
+    monte_carlo_key,
+)
+from simulation import run_monte_carlo, run_simulation
+
+
+class TestResultCache(unittest.TestCase):
+    def test_normalized_parameters_share_an_entry(self):
+        """Test that float noise and an unnormalized complexity mix hit the same entry."""
+        cache = SimulationCache()
+        df_1 = cached_run_simulation(cache=cache, days=20, volatility=0.3, rng=1, start_date='2025-01-01')
+        df_2 = cached_run_simulation(
+            cache=cache, days=20, volatility=0.1 + 0.2, rng=1, start_date='2025-01-01',
+            complexity_mix={'Low': 50, 'Medium': 30, 'High': 20}
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        pd.testing.assert_frame_equal(df_1, df_2)
+        pd.testing.assert_frame_equal(df_1, run_simulation(days=20, volatility=0.3, rng=1, start_date='2025-01-01'))
+
+        # Callers get copies, so page code cannot corrupt the entry
+        df_2['Extra'] = 1
+        self.assertNotIn('Extra', cached_run_simulation(cache=cache, days=20, volatility=0.3, rng=1, start_date='2025-01-01'))
+
+        cached_run_simulation(cache=cache, days=20, volatility=0.3, rng=2, start_date='2025-01-01')
+        cached_run_simulation(cache=cache, days=20, volatility=0.3, rng=CommonRandomNumbers(20, seed=1), start_date='2025-01-01')
+        cached_run_simulation(cache=cache, days=20, volatility=0.3, rng=CommonRandomNumbers(20, seed=1), start_date='2025-01-01')
+        cached_run_simulation(cache=cache, days=20, volatility=0.3, start_date='2025-01-01')  # unseeded: bypassed
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+        self.assertEqual(df_1['Date'].iloc[0], pd.Timestamp('2025-01-01'))
+
+    def test_lru_eviction_respects_memory_ceiling(self):
+        """Test that least recently used entries are evicted above the memory ceiling."""
+        cache = SimulationCache()
+        cached_run_monte_carlo(50, cache=cache, days=30, rng=1)
+        run_bytes = cache.stats()['bytes']
+        cache.resize(int(run_bytes * 2.5))
+
+        cached_run_monte_carlo(50, cache=cache, days=30, rng=2)
+        cached_run_monte_carlo(50, cache=cache, days=30, rng=1)  # refresh seed 1
+        cached_run_monte_carlo(50, cache=cache, days=30, rng=3)
+        stats = cache.stats()
+        self.assertGreater(stats['evictions'], 0)
+        self.assertLessEqual(stats['bytes'], cache.max_bytes)
+
+        cached_run_monte_carlo(50, cache=cache, days=30, rng=1)
+        self.assertEqual(cache.hits, 2)
+
+    def test_stages_recompute_only_downstream(self):
+        """Test that a capacity parameter reuses the draws and matches a full run."""
+        cache = SimulationCache()
+        params = {'days': 30, 'rng': 4, 'start_date': '2025-01-01'}
+        cached_run_monte_carlo(200, cache=cache, agent_efficiency=5, **params)
+        self.assertEqual((cache.stage_hits, cache.stage_misses), (0, 5))
+
+        result = cached_run_monte_carlo(200, cache=cache, agent_efficiency=3, **params)
+        self.assertEqual((cache.stage_hits, cache.stage_misses), (1, 9))
+        pd.testing.assert_frame_equal(result.kpis, run_monte_carlo(200, agent_efficiency=3, **params).kpis)
+
+        cached_run_simulation(cache=cache, automation_rate=0.3, **params)
+        cached_run_simulation(cache=cache, automation_rate=0.4, **params)
+        self.assertEqual((cache.stage_hits, cache.stage_misses), (3, 15))
+
+    def test_progressive_monte_carlo_fills_the_cache(self):
+        """Test that each step equals a cached run and the median interval narrows."""
+        cache = SimulationCache()
+        params = {'days': 30, 'rng': 3, 'start_date': '2025-01-01'}
+        steps = list(iter_cached_monte_carlo(2000, steps=(100, 1000, 10000), cache=cache, **params))
+        self.assertEqual([n for n, _ in steps], [100, 1000, 2000])
+        pd.testing.assert_frame_equal(steps[-1][1].kpis, cached_run_monte_carlo(2000, cache=cache, **params).kpis)
+        self.assertEqual(cache.hits, 1)
+
+        widths = [
+            (mc.median_interval().loc['High'] - mc.median_interval().loc['Low'])['Total Solved'] for _, mc in steps
+        ]
+        self.assertGreater(widths[0], widths[1])
+        self.assertGreater(widths[1], widths[2])
+        self.assertEqual(monte_carlo_key(2000, **params), monte_carlo_key(2000, **{**params, 'volatility': 0.1 + 0.1}))
+        self.assertIsNone(monte_carlo_key(2000, days=30))
+
+
+if __name__ == '__main__':
+    unittest.main()
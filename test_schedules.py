@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from analytic import run_analytic
+from queue_policy import FifoPolicy
+from schedules import Schedule
+from simulation import run_monte_carlo, run_simulation
+from streaming import iter_simulation
+
+
+class TestSchedules(unittest.TestCase):
+    def test_schedule_values(self):
+        """Test steps, ramps with dates, weekday and month profiles and their products."""
+        start = '2025-01-27'  # a Monday
+        np.testing.assert_array_equal(Schedule.steps({2: 8, 0: 5}).values(4, start), [5, 5, 8, 8])
+        np.testing.assert_allclose(
+            Schedule.ramp({'2025-01-28': 0.1, '2025-01-31': 0.4}).values(6, start), [0.1, 0.1, 0.2, 0.3, 0.4, 0.4]
+        )
+        week = Schedule.weekly([1, 1, 1, 1, 1, 0.5, 0])
+        np.testing.assert_array_equal(week.values(7, '2025-02-01'), [0.5, 0, 1, 1, 1, 1, 1])
+        season = Schedule.monthly([1.0] + [2.0] * 11)
+        np.testing.assert_array_equal((100 * week * season).values(7, start), [100, 100, 100, 100, 100, 100, 0])
+        with self.assertRaises(ValueError):
+            run_simulation(days=10, avg_daily_tickets=np.full(9, 100.0))
+
+    def test_constant_schedules_match_scalars(self):
+        """Test that constant arrays and schedules reproduce a scalar run exactly."""
+        params = {'days': 45, 'start_date': '2025-01-01', 'full_time_agents': 4}
+        constant = {
+            'avg_daily_tickets': Schedule.weekly([100] * 7),
+            'full_time_agents': np.full(45, 4),
+            'agent_efficiency': Schedule.steps({0: 5}),
+            'automation_rate': np.full(45, 0.1),
+            'complexity_mix': {'Low': Schedule.ramp({0: 0.5, 44: 0.5}), 'Medium': 0.3, 'High': 0.2},
+        }
+        pd.testing.assert_frame_equal(run_simulation(rng=3, **params), run_simulation(rng=3, **{**params, **constant}))
+        np.random.seed(7)
+        legacy = run_simulation(**params)
+        np.random.seed(7)
+        pd.testing.assert_frame_equal(legacy, run_simulation(**{**params, **constant}))
+        self.assertEqual(
+            run_monte_carlo(50, rng=3, **params).kpi_summary().to_dict(),
+            run_monte_carlo(50, rng=3, **{**params, **constant}).kpi_summary().to_dict()
+        )
+
+    def test_hiring_ramp_and_rollout(self):
+        """Test that agents join on schedule, inbound follows its profile and streaming matches."""
+        params = {
+            'days': 60, 'rng': 11, 'start_date': '2025-01-06', 'vacation_rate': 0.1,
+            'full_time_agents': Schedule.steps({0: 2, 30: 8}),
+            'avg_daily_tickets': Schedule.weekly([100, 100, 100, 100, 100, 0, 0]),
+            'automation_rate': Schedule.ramp({0: 0.0, 59: 0.5}),
+        }
+        frame = run_simulation(**params)
+        self.assertLessEqual(frame['Staff Available (FT)'][:30].max(), 2)
+        self.assertGreater(frame['Staff Available (FT)'][30:].min(), 2)
+        self.assertLessEqual(frame['Staff Available (FT)'][30:].max(), 8)
+        weekend = frame['Date'].dt.weekday >= 5
+        self.assertTrue((frame.loc[weekend, 'Inbound (Raw)'] == 0).all())
+        self.assertLess(frame['Inbound (Net)'].iloc[-3], frame['Inbound (Raw)'].iloc[-3])
+
+        streamed = pd.concat(iter_simulation(chunk_days=60, **params))
+        pd.testing.assert_frame_equal(streamed, frame)
+
+        for engine in ('event', 'hourly'):
+            with self.assertRaises(ValueError):
+                run_simulation(engine=engine, **params)
+        with self.assertRaises(ValueError):
+            run_analytic(**{name: value for name, value in params.items() if name != 'rng'})
+
+    def test_fifo_follows_daily_mix(self):
+        """Test that FIFO classes follow each day's mix, in one run and in chunks."""
+        params = {
+            'days': 10, 'rng': 1, 'start_date': '2025-01-01', 'volatility': 0, 'vacation_rate': 0,
+            'full_time_agents': Schedule.steps({0: 1, 7: 3}), 'part_time_agents': 0, 'automation_rate': 0,
+            'complexity_mix': {'Low': Schedule.steps({0: 1, 5: 0}), 'Medium': 0, 'High': Schedule.steps({0: 0, 5: 1})},
+            'queue_policy': FifoPolicy(),
+        }
+        frame = run_simulation(**params)
+        # One FT agent clears 40 Low tickets a day, all older Low tickets go first
+        self.assertTrue((frame['Backlog (End of Day) [High]'][:5] == 0).all())
+        self.assertEqual(frame['Solved'][:7].tolist(), [40] * 7)
+        self.assertEqual(frame['Backlog (End of Day) [High]'].iloc[6], 200)
+
+        for chunk_days in (1, 3, 4):
+            streamed = pd.concat(iter_simulation(chunk_days=chunk_days, **params), ignore_index=True)
+            pd.testing.assert_frame_equal(streamed, frame)
+
+
+if __name__ == '__main__':
+    unittest.main()
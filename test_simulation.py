@@ -1,6 +1,78 @@
 import unittest
+import numpy as np
 import pandas as pd
-from simulation import run_simulation
+from queue_policy import StrictPriority
+from simulation import SimulationResult, run_monte_carlo, run_replications, run_simulation
+
+
+def reference_run_simulation(
+    days=30,
+    avg_daily_tickets=100,
+    volatility=0.2,
+    full_time_agents=5,
+    part_time_agents=2,
+    agent_efficiency=5,
+    part_time_hours=4,
+    vacation_rate=0.05,
+    complexity_mix={'Low': 0.5, 'Medium': 0.3, 'High': 0.2},
+    complexity_factors={'Low': 1.0, 'Medium': 1.5, 'High': 2.5},
+    automation_rate=0.1
+):
+    """Original day-by-day loop, kept as the oracle for the vectorized engine."""
+    total_agents = full_time_agents + part_time_agents
+    expected_absent_days = int(days * vacation_rate * total_agents)
+    absence_schedule = np.zeros((total_agents, days), dtype=bool)
+    if expected_absent_days > 0 and total_agents > 0:
+        for _ in range(expected_absent_days):
+            agent_idx = np.random.randint(0, total_agents)
+            day_idx = np.random.randint(0, days)
+            absence_schedule[agent_idx, day_idx] = True
+
+    results = []
+    current_backlog = 0.0
+    for day_idx in range(days):
+        if volatility > 0:
+            sigma = np.sqrt(np.log(1 + volatility**2))
+            mu = np.log(avg_daily_tickets) - 0.5 * sigma**2
+            raw_inbound = np.random.lognormal(mu, sigma)
+        else:
+            raw_inbound = avg_daily_tickets
+        actual_inbound = raw_inbound * (1 - automation_rate)
+
+        ft_agents_available = full_time_agents - int(absence_schedule[:full_time_agents, day_idx].sum())
+        pt_agents_available = part_time_agents - int(absence_schedule[full_time_agents:, day_idx].sum())
+        total_hours = (ft_agents_available * 8) + (pt_agents_available * part_time_hours)
+
+        avg_complexity_factor = (
+            complexity_mix['Low'] * complexity_factors['Low'] +
+            complexity_mix['Medium'] * complexity_factors['Medium'] +
+            complexity_mix['High'] * complexity_factors['High']
+        )
+        daily_capacity_tickets = (total_hours * agent_efficiency) / avg_complexity_factor if avg_complexity_factor > 0 else 0
+
+        total_demand = current_backlog + actual_inbound
+        solved = min(total_demand, daily_capacity_tickets)
+        new_backlog = total_demand - solved
+
+        queue_wait_days = new_backlog / daily_capacity_tickets if daily_capacity_tickets > 0 else 999
+        processing_time_hours = avg_complexity_factor / agent_efficiency if agent_efficiency > 0 else 0
+        est_wait_time_days = queue_wait_days + (processing_time_hours + 0.5) / 24.0
+
+        results.append({
+            'Inbound (Raw)': round(raw_inbound),
+            'Inbound (Net)': round(actual_inbound),
+            'Capacity (Tickets)': round(daily_capacity_tickets),
+            'Solved': round(solved),
+            'Backlog (End of Day)': round(new_backlog),
+            'Est. Wait Time (Days)': round(est_wait_time_days, 3),
+            'Est. Wait Time (Hours)': round(est_wait_time_days * 24, 2),
+            'Staff Available (FT)': ft_agents_available,
+            'Staff Available (PT)': pt_agents_available
+        })
+        current_backlog = new_backlog
+
+    return pd.DataFrame(results)
+
 
 class TestSimulation(unittest.TestCase):
     def test_simulation_runs(self):
@@ -38,5 +110,71 @@ class TestSimulation(unittest.TestCase):
         )
         self.assertTrue((df['Backlog (End of Day)'] == 0).all())
 
+    def test_matches_reference_loop(self):
+        """Test that the vectorized engine reproduces the day-by-day loop for the same seed."""
+        scenarios = [
+            {},
+            {'days': 365, 'full_time_agents': 40, 'part_time_agents': 10, 'avg_daily_tickets': 900},
+            {'days': 90, 'volatility': 0, 'vacation_rate': 0.3, 'agent_efficiency': 1},
+            {'days': 60, 'full_time_agents': 0, 'part_time_agents': 0, 'automation_rate': 0.5},
+        ]
+        for seed, params in enumerate(scenarios):
+            with self.subTest(params=params):
+                np.random.seed(seed)
+                expected = reference_run_simulation(**params)
+                np.random.seed(seed)
+                df = run_simulation(**params)
+                pd.testing.assert_frame_equal(df.drop(columns='Date'), expected)
+
+    def test_monte_carlo_single_replication_matches_run_simulation(self):
+        """Test that one batched replication reproduces run_simulation for the same seed."""
+        params = {'days': 45, 'vacation_rate': 0.2, 'avg_daily_tickets': 180}
+        np.random.seed(7)
+        df = run_simulation(**params)
+        np.random.seed(7)
+        result = run_monte_carlo(n_replications=1, **params)
+        for column in ['Solved', 'Backlog (End of Day)', 'Capacity (Tickets)']:
+            np.testing.assert_array_equal(np.rint(result.bands[f'{column} P50']), df[column])
+
+    def test_monte_carlo_bands_are_ordered(self):
+        """Test that percentile bands are monotone and KPIs exist per replication."""
+        result = run_monte_carlo(n_replications=500, days=30, full_time_agents=2)
+        self.assertEqual(len(result.bands), 30)
+        self.assertEqual(len(result.kpis), 500)
+        for column in ['Backlog (End of Day)', 'Est. Wait Time (Hours)', 'Solved']:
+            low, mid, high = (result.bands[f'{column} P{p}'] for p in (5, 50, 95))
+            self.assertTrue((low <= mid).all() and (mid <= high).all())
+        summary = result.kpi_summary()
+        self.assertEqual(list(summary.index), ['P5', 'P50', 'P95'])
+
+    def test_columnar_result_matches_frame(self):
+        """Test that the compact result materializes the run_simulation table and its KPIs."""
+        for params in [
+            {'avg_daily_tickets': 180},
+            {'avg_daily_tickets': 180, 'queue_policy': StrictPriority()},
+            {'engine': 'event'},
+        ]:
+            with self.subTest(params=params):
+                params = {'days': 40, 'rng': 11, 'start_date': '2025-06-01', **params}
+                result = run_simulation(as_frame=False, **params)
+                df = run_simulation(**params)
+                self.assertIsInstance(result, SimulationResult)
+                self.assertEqual(result.wait_hours.dtype, np.float32)
+                pd.testing.assert_frame_equal(result.to_frame(), df)
+                kpis = result.kpis()
+                self.assertAlmostEqual(kpis['Avg Wait Time (Hours)'], df['Est. Wait Time (Hours)'].mean(), places=4)
+                self.assertEqual(kpis['Max Backlog'], df['Backlog (End of Day)'].max())
+
+    def test_replications_keep_compact_paths(self):
+        """Test that run_replications keeps every path and agrees with the Monte Carlo KPIs."""
+        params = {'days': 30, 'rng': 3, 'avg_daily_tickets': 170, 'start_date': '2025-01-01'}
+        result = run_replications(200, **params)
+        self.assertEqual(result.n_replications, 200)
+        self.assertEqual(result.backlog.dtype, np.int32)
+        self.assertEqual(len(result.to_frame()), 200 * 30)
+        mc_kpis = run_monte_carlo(200, **params).kpis
+        np.testing.assert_allclose(result.kpis()['Max Backlog'], mc_kpis['Max Backlog'], atol=0.5)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from staffing import find_minimum_staffing, wilson_interval
+
+
+class TestStaffing(unittest.TestCase):
+    def test_wilson_interval_brackets_share(self):
+        """Test that the Wilson interval contains the observed share and narrows with more trials."""
+        low, high = wilson_interval(90, 100, 0.95)
+        self.assertLess(low, 0.9)
+        self.assertGreater(high, 0.9)
+        low_more, high_more = wilson_interval(900, 1000, 0.95)
+        self.assertLess(high_more - low_more, high - low)
+
+    def test_finds_cheapest_passing_mix(self):
+        """Test that the result passes, one FT agent less fails, and clear candidates stop early."""
+        params = {'days': 30, 'avg_daily_tickets': 200, 'agent_efficiency': 3, 'part_time_hours': 4}
+        result = find_minimum_staffing(target_wait_hours=24, max_part_time_agents=3, seed=7, **params)
+        self.assertTrue(result.feasible)
+
+        evaluations = result.evaluations.set_index(['full_time_agents', 'part_time_agents'])
+        best = evaluations.loc[(result.full_time_agents, result.part_time_agents)]
+        self.assertTrue(best['meets_target'])
+        self.assertEqual(result.staff_hours, result.full_time_agents * 8 + result.part_time_agents * 4)
+        # No passing candidate is cheaper than the result
+        passing = evaluations[evaluations['meets_target']]
+        self.assertEqual(passing['staff_hours'].min(), result.staff_hours)
+        if result.full_time_agents > 0:
+            self.assertFalse(evaluations.loc[(result.full_time_agents - 1, result.part_time_agents), 'meets_target'])
+        self.assertLess(evaluations['replications'].min(), 2000)
+
+    def test_part_time_hours_per_day(self):
+        """Test that per-day part-time hours are searched and priced at their mean."""
+        params = {'days': 30, 'avg_daily_tickets': 200, 'agent_efficiency': 3}
+        for part_time_hours in ([4] * 15 + [6] * 15, np.array([4.0] * 15 + [6.0] * 15)):
+            result = find_minimum_staffing(max_part_time_agents=2, seed=7, part_time_hours=part_time_hours, **params)
+            self.assertTrue(result.feasible)
+            self.assertEqual(result.staff_hours, result.full_time_agents * 8 + result.part_time_agents * 5)
+            evaluations = result.evaluations
+            self.assertTrue((evaluations['staff_hours'] ==
+                             evaluations['full_time_agents'] * 8 + evaluations['part_time_agents'] * 5).all())
+
+    def test_infeasible_within_bounds(self):
+        """Test that no mix is returned when the bounds are too small."""
+        result = find_minimum_staffing(max_full_time_agents=1, max_part_time_agents=1, seed=1, days=30, avg_daily_tickets=500)
+        self.assertFalse(result.feasible)
+        self.assertIsNone(result.staff_hours)
+
+
+if __name__ == '__main__':
+    unittest.main()
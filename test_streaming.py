@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from absence import ClusteredAbsences
+from queue_policy import StrictPriority
+from simulation import run_replications, run_simulation
+from streaming import iter_simulation, write_simulation
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        # No random inputs and an overloaded desk: the backlog grows across every chunk boundary
+        self.params = {
+            'days': 400, 'avg_daily_tickets': 170, 'volatility': 0, 'vacation_rate': 0, 'start_date': '2025-01-01'
+        }
+
+    def test_chunks_carry_backlog(self):
+        """Test that chunks add up to one run when the backlog is carried across boundaries."""
+        for policy in (None, StrictPriority()):
+            full = run_simulation(queue_policy=policy, **self.params)
+            chunks = list(iter_simulation(chunk_days=45, queue_policy=policy, **self.params))
+            self.assertEqual([len(chunk) for chunk in chunks], [45] * 8 + [40])
+            pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full)
+
+        # One chunk over the whole horizon draws exactly like run_simulation
+        params = {'days': 120, 'rng': 5, 'start_date': '2025-01-01', 'absence_model': ClusteredAbsences()}
+        pd.testing.assert_frame_equal(next(iter_simulation(chunk_days=365, **params)), run_simulation(**params))
+
+    def test_absence_blocks_cross_chunks(self):
+        """Test that clustered absences keep their rate when blocks are split across chunks."""
+        params = {
+            'days': 1000, 'rng': 1, 'full_time_agents': 100, 'vacation_rate': 0.05,
+            'absence_model': ClusteredAbsences(10, 10), 'start_date': '2025-01-01'
+        }
+        full = run_replications(100, **params)
+        chunks = list(iter_simulation(chunk_days=100, n_replications=100, as_frame=False, **params))
+        self.assertEqual(len(chunks), 10)
+        self.assertEqual(chunks[0].ft_available.shape, (100, 100))
+        streamed = np.concatenate([chunk.ft_available for chunk in chunks], axis=-1)
+        self.assertAlmostEqual(streamed.mean(), full.ft_available.mean(), delta=0.05)
+
+        with self.assertRaises(ValueError):
+            next(iter_simulation(engine='event'))
+
+    def test_sinks_append_chunks(self):
+        """Test that CSV and Parquet files hold every chunk in order."""
+        expected = pd.concat(iter_simulation(chunk_days=90, n_replications=3, rng=2, **self.params), ignore_index=True)
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('run.csv', 'run.parquet'):
+                path = os.path.join(directory, name)
+                rows = write_simulation(path, chunk_days=90, n_replications=3, rng=2, **self.params)
+                self.assertEqual(rows, 3 * 400)
+                written = pd.read_csv(path, parse_dates=['Date']) if name.endswith('.csv') else pd.read_parquet(path)
+                pd.testing.assert_frame_equal(written, expected, check_dtype=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
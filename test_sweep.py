@@ -0,0 +1,40 @@
+import unittest
+import pandas as pd
+from sweep import SWEEP_KPIS, parameter_grid, run_sweep
+
+
+class TestSweep(unittest.TestCase):
+    def test_parameter_grid_order(self):
+        """Test that the grid is the cartesian product with the last parameter varying fastest."""
+        points = parameter_grid({'full_time_agents': [1, 2], 'automation_rate': [0.1, 0.2]})
+        self.assertEqual(points, [
+            {'full_time_agents': 1, 'automation_rate': 0.1},
+            {'full_time_agents': 1, 'automation_rate': 0.2},
+            {'full_time_agents': 2, 'automation_rate': 0.1},
+            {'full_time_agents': 2, 'automation_rate': 0.2},
+        ])
+
+    def test_process_pool_matches_in_process(self):
+        """Test that workers on shared memory produce the same table as a single process."""
+        grid = {'full_time_agents': [2, 4, 6], 'part_time_agents': [0, 2]}
+        in_process = run_sweep(grid, n_replications=50, seed=3, days=30, max_workers=1)
+        pooled = run_sweep(grid, n_replications=50, seed=3, days=30, max_workers=2, chunk_size=2)
+        pd.testing.assert_frame_equal(in_process, pooled)
+
+        self.assertEqual(list(pooled.columns), [*grid, *SWEEP_KPIS])
+        # More full-time agents never increase the backlog under common random numbers
+        backlog = pooled.pivot(index='full_time_agents', columns='part_time_agents', values='Max Backlog')
+        self.assertTrue((backlog.diff().dropna() <= 0).all().all())
+
+    def test_horizon_grid(self):
+        """Test that days can be swept and rng is rejected in favour of seed."""
+        grid = {'days': [30, 60], 'full_time_agents': [3, 5]}
+        table = run_sweep(grid, n_replications=20, seed=1, max_workers=1)
+        self.assertEqual(list(table['days']), [30, 30, 60, 60])
+        pd.testing.assert_frame_equal(table, run_sweep(grid, n_replications=20, seed=1, max_workers=2, chunk_size=1))
+        with self.assertRaises(TypeError):
+            run_sweep({'full_time_agents': [2, 3]}, n_replications=20, rng=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
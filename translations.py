@@ -17,6 +17,51 @@ def render_language_selector():
         on_change=lambda: st.session_state.update({'language': st.session_state.lang_select})
     )
 
+def render_cache_stats():
+    """Shows hit/miss counters of the shared simulation and figure caches at the bottom of the sidebar."""
+    from charts import FIGURE_CACHE
+    from result_cache import SIMULATION_CACHE
+
+    t = TRANSLATIONS[st.session_state.get('language', 'DE')]
+    stats = SIMULATION_CACHE.stats()
+    st.sidebar.divider()
+    st.sidebar.caption(t['cache_stats'].format(
+        hits=stats['hits'], misses=stats['misses'], entries=stats['entries'], size=stats['bytes'] / 1024 ** 2
+    ))
+    stage_lookups = stats['stage_hits'] + stats['stage_misses']
+    if stage_lookups:
+        st.sidebar.caption(t['cache_stage_stats'].format(reused=stats['stage_hits'], total=stage_lookups))
+    figures = FIGURE_CACHE.stats()
+    if figures['hits'] + figures['misses']:
+        st.sidebar.caption(t['cache_figure_stats'].format(hits=figures['hits'], total=figures['hits'] + figures['misses']))
+
+def start_profiler():
+    """
+    Starts a profiler for this script run when the ``?profile=`` query
+    parameter or ``TICKETSIM_PROFILE`` asks for one (see ``profiling.py``).
+    Returns None when profiling is off.
+    """
+    from profiling import Profiler, profile_mode
+
+    mode = profile_mode(st.query_params.get('profile'))
+    return None if mode is None else Profiler(mode).start()
+
+def render_debug_panel(profiler):
+    """Stops ``profiler`` and shows its timings with JSON/cProfile downloads in a sidebar expander."""
+    if profiler is None:
+        return
+    profiler.stop()
+    t = TRANSLATIONS[st.session_state.get('language', 'DE')]
+    with st.sidebar.expander(t['debug_panel'], expanded=True):
+        st.caption(t['debug_total'].format(seconds=profiler.wall_seconds))
+        st.dataframe(profiler.summary(), hide_index=True, column_config={'seconds': st.column_config.NumberColumn(format='%.4f')})
+        st.download_button(
+            t['debug_download_json'], profiler.to_json(), file_name='ticketsim_profile.json', mime='application/json'
+        )
+        if profiler.mode == 'cprofile':
+            st.download_button(t['debug_download_pstats'], profiler.pstats_bytes(), file_name='ticketsim_profile.pstats')
+            st.caption(t['debug_pstats_hint'])
+
 TRANSLATIONS = {
     'EN': {
         # General
@@ -41,6 +86,8 @@ Adjust the parameters in the sidebar to see how they impact **Resolution Time**
         'help_pt': "Number of agents working partial hours",
         'help_eff': "Base number of tickets an agent can solve per hour",
         'help_absent': "Percentage of staff absent on any given day",
+        'absence_clustered': "Clustered Absences (Vacation Blocks)",
+        'help_clustered': "Absences arrive as blocks of 3–10 consecutive days instead of isolated days",
         
         # Sidebar - Inbound
         'header_inbound': "2. Inbound Traffic",
@@ -57,6 +104,44 @@ Adjust the parameters in the sidebar to see how they impact **Resolution Time**
         'comp_high': "High %",
         'warn_normalize': "Total complexity is {total}%. It will be normalized.",
         'automation': "AI/Automation Deflection (%)",
+        'queue_policy': "Queue Policy",
+        'help_queue_policy': "How agents pick tickets from the per-complexity backlogs. 'Single queue' treats all tickets as average tickets.",
+        'queue_policy_single': "Single queue (average tickets)",
+        'queue_policy_fifo': "Per class, first in first out",
+        'queue_policy_strict_low': "Strict priority: Low first",
+        'queue_policy_strict_high': "Strict priority: High first",
+        'queue_policy_fair': "Weighted fair share",
+        'queue_policy_daily_only': "Queue policies are only available for the daily engine.",
+
+        # Sidebar - Monte Carlo
+        'header_mc': "4. Monte Carlo",
+        'mc_replications': "Replications",
+        'mc_off': "Off (single path)",
+        'help_mc': "Number of random paths simulated together. KPIs and The Pulse show the median with a P5–P95 band.",
+        'mc_range': "P5–P95: {low} – {high}",
+        'mc_median_interval': "Median {low} – {high} (95% CI)",
+        'mc_progress': "Monte Carlo: {done:,} of {total:,} replications – bands are refined in the background",
+        'analytic_preview': "≈ analytic estimate, simulating…",
+        'analytic_summary': "Analytic estimate: utilization {utilization:.0%} · backlog {growth:+.0f} tickets/day while tickets are queued",
+        'analytic_mismatch': "The analytic estimate differs from the simulation by more than {tolerance:.0%}: {kpis}. Trust the simulation; the estimate only approximates the daily model.",
+        'analytic_versus': "{kpi} ≈ {analytic} vs. {simulated}",
+        'legend_backlog_band': "Backlog P5–P95",
+        'seed': "Random Seed",
+        'help_seed': "Same seed and parameters reproduce the same result, which is then served from the cache",
+        'engine': "Simulation Engine",
+        'engine_daily': "Daily (fluid model)",
+        'engine_event': "Event (individual tickets)",
+        'engine_hourly': "Hourly (intraday)",
+        'help_engine': "The hourly engine splits each day into 24 buckets with an arrival curve and shift coverage (lunch gaps, morning surge). The event engine simulates every ticket with its own complexity and real arrival-to-resolution time, handled by individual agents",
+        'engine_event_no_mc': "Monte Carlo is only available for the daily engine.",
+        'cache_stats': "🗄️ Cache: {hits} hits · {misses} misses · {entries} entries ({size:.1f} MB)",
+        'cache_stage_stats': "🧩 Pipeline stages reused: {reused} of {total}",
+        'cache_figure_stats': "🖼️ Figures reused: {hits} of {total}",
+        'debug_panel': "⏱️ Debug Timings",
+        'debug_total': "Script run: {seconds:.3f} s · stage and page timings overlap",
+        'debug_download_json': "Download timings (JSON)",
+        'debug_download_pstats': "Download cProfile dump",
+        'debug_pstats_hint': "Open with `python -m pstats ticketsim_profile.pstats` or snakeviz",
         
         # KPIs
         'kpi_wait': "Avg Wait Time",
@@ -66,50 +151,88 @@ Adjust the parameters in the sidebar to see how they impact **Resolution Time**
         
         # Charts
         'chart_pulse': "📈 The Pulse: Inbound vs. Capacity vs. Backlog",
+        'chart_class_backlog': "🧮 Backlog by Complexity Class",
+        'kpi_class_wait': "Avg Wait ({cls})",
         'chart_dist': "📊 Resolution Time Distribution",
+        'axis_tickets': "Tickets",
+        'sla_breach_hours': "SLA (Hours)",
+        'age_summary': "Real ticket age: P50 {p50:.1f} h · P90 {p90:.1f} h · P99 {p99:.1f} h. {breaches:,.0f} solved tickets waited longer than {sla} h, {open:,.0f} open tickets are already older.",
         'chart_staff': "👥 Staff Availability",
         'legend_inbound': "Net Inbound",
         'legend_capacity': "Capacity",
         'legend_backlog': "Backlog",
+        'chart_intraday': "🕐 Intraday: Inbound vs. Capacity vs. Backlog per Hour",
+        'drill_day': "Drill into Day",
+        'drill_all_days': "All days",
+
+        # SLA Staffing Search
+        'header_staffing_search': "🎯 SLA Staffing Search",
+        'staffing_search_desc': "Find the FT/PT mix with the fewest staff hours per day that meets a wait-time SLA, using the inbound, efficiency and absence settings from the sidebar.",
+        'sla_target_hours': "Target Wait (Hours)",
+        'sla_percentile': "Wait Percentile",
+        'sla_service_level': "Confidence (%)",
+        'help_sla_service_level': "Share of Monte Carlo replications in which the wait percentile must stay under the target",
+        'sla_max_ft': "Max Full-Time Agents",
+        'sla_max_pt': "Max Part-Time Agents",
+        'sla_search': "🔍 Find Minimum Staffing",
+        'sla_searching': "Searching staffing levels…",
+        'sla_success_rate': "Replications Meeting SLA",
+        'sla_found': "{hours:.0f} staff hours per day · {candidates} candidates evaluated",
+        'sla_infeasible': "No staffing mix within the bounds meets the SLA.",
         
         # Data Table
         'expander_data': "View Detailed Data",
         
         # Comparison Page
         'compare_title': "⚖️ Scenario Comparison",
-        'compare_desc': "Compare two staffing strategies side-by-side under the **same** inbound traffic conditions.",
+        'compare_desc': "Compare staffing strategies under the **same** inbound traffic and absences: every scenario runs on the same Monte Carlo replications.",
         'header_shared': "🔒 Shared Environment",
-        'info_shared': "These parameters apply to BOTH scenarios.",
-        'header_scen_a': "🔵 Scenario A",
-        'header_scen_b': "🟠 Scenario B",
-        'config_a': "Configure Staffing A",
-        'config_b': "Configure Staffing B",
-        'ft_agents_a': "🔵 FT Agents (A)",
-        'pt_agents_a': "🔵 PT Agents (A)",
-        'eff_a': "🔵 Efficiency (A)",
-        'absent_a': "🔵 Absenteeism % (A)",
-        'ft_agents_b': "🟠 FT Agents (B)",
-        'pt_agents_b': "🟠 PT Agents (B)",
-        'eff_b': "🟠 Efficiency (B)",
-        'absent_b': "🟠 Absenteeism % (B)",
+        'info_shared': "These parameters apply to ALL scenarios.",
+        'header_scenarios': "👥 Staffing Scenarios",
+        'scenarios_desc': "One row per scenario, up to {max}. Add rows with ➕; the baseline is compared with every other scenario.",
+        'col_scenario': "Scenario",
+        'scenarios_max': "Only the first {max} scenarios are compared.",
+        'scenarios_empty': "Add at least one complete scenario row.",
+        'baseline': "Baseline Scenario",
+        'help_baseline': "Differences are reported as scenario minus baseline, paired per replication",
         
         # Comparison Visuals
         'kpi_compare': "📊 KPI Comparison",
-        'kpi_wait_a': "Avg Wait Time (A)",
-        'kpi_wait_b': "Avg Wait Time (B)",
-        'kpi_backlog_a': "Max Backlog (A)",
-        'kpi_backlog_b': "Max Backlog (B)",
-        'kpi_hours_a': "Total Staff Hours (A)",
-        'kpi_hours_b': "Total Staff Hours (B)",
+        'diff_title': "🎯 Paired Differences",
+        'diff_desc': "Mean difference to {baseline} over {replications:,} shared replications with {confidence:.0f}% confidence intervals; red intervals exclude zero.",
+        'diff_kpi': "KPI",
+        'axis_difference': "{kpi}: difference to {baseline}",
+        'diff_table': "All paired differences",
         'pulse_compare': "📈 Pulse Comparison",
-        'pulse_a': "🔵 Scenario A Pulse",
-        'pulse_b': "🟠 Scenario B Pulse",
-        'box_title': "📦 Wait Time Distribution (Boxplot)",
+        'box_title': "📦 Avg Wait Time across Replications",
         'cdf_title': "📉 Probability of Resolution (CDF)",
         'axis_wait': "Wait Time (Hours)",
         'axis_prob': "Probability (<= x)",
         'title_cdf': "CDF of Wait Time",
 
+        # Sweep Page
+        'page_title_sweep': "Parameter Sweep",
+        'sweep_title': "🗺️ Parameter Sweep",
+        'sweep_desc': "Evaluate a whole grid of staffing options at once. Every grid point is simulated with the same Monte Carlo draws, so differences between cells come from the parameters, not from noise.",
+        'header_grid': "🧮 Sweep Grid",
+        'sweep_ft_range': "Full-Time Agents (Range)",
+        'sweep_pt_range': "Part-Time Agents (Range)",
+        'sweep_efficiencies': "Agent Efficiencies (Tickets/Hour)",
+        'sweep_automation_rates': "AI/Automation Deflection Rates (%)",
+        'sweep_days': "Days Simulated",
+        'sweep_points': "{points} grid points × {replications} replications",
+        'sweep_run': "▶️ Run Sweep",
+        'sweep_running': "Simulating grid…",
+        'sweep_empty': "Pick at least one efficiency and one automation rate.",
+        'sweep_hint': "Configure the grid and press **Run Sweep**.",
+        'sweep_kpi': "KPI",
+        'sweep_slice_eff': "Efficiency Slice",
+        'sweep_slice_auto': "Automation Slice (%)",
+        'sweep_heatmap': "🗺️ {kpi}: Full-Time × Part-Time Agents",
+        'axis_ft': "Full-Time Agents",
+        'axis_pt': "Part-Time Agents",
+        'sweep_table': "View Sweep Table",
+
         # Info Page
         'page_title_info': "Project Info",
         'info_title': "ℹ️ Project Information",
@@ -146,7 +269,7 @@ Adjust the parameters in the sidebar to see how they impact **Resolution Time**
         'limitation_2': "**Equal Efficiency**: All agents have the same performance (no experience differences)",
         'limitation_3': "**FIFO Queue**: No prioritization by SLA or urgency",
         'limitation_4': "**No Escalations**: Tickets are solved once, no reopenings",
-        'limitation_5': "**Daily Granularity**: Hourly dynamics are not modeled",
+        'limitation_5': "**Daily Granularity**: The default engine works per day; the hourly engine adds arrival curves and shift coverage but still treats tickets as a fluid",
         'limitation_6': "**No Seasonality**: Weekly/monthly patterns not implemented",
 
         'section_use_cases': "✅ Recommended Use Cases",
@@ -202,6 +325,8 @@ Passen Sie die Parameter in der Seitenleiste an, um die Auswirkungen auf **Lösu
         'help_pt': "Anzahl der Agenten mit Teilzeit",
         'help_eff': "Basis-Anzahl Tickets, die ein Agent pro Stunde lösen kann",
         'help_absent': "Prozentsatz des Personals, der an einem Tag fehlt (Krankheit/Urlaub)",
+        'absence_clustered': "Gebündelte Abwesenheiten (Urlaubsblöcke)",
+        'help_clustered': "Abwesenheiten kommen als Blöcke von 3–10 aufeinanderfolgenden Tagen statt als einzelne Tage",
         
         # Sidebar - Inbound
         'header_inbound': "2. Ticketaufkommen (Inbound)",
@@ -218,6 +343,44 @@ Passen Sie die Parameter in der Seitenleiste an, um die Auswirkungen auf **Lösu
         'comp_high': "Hoch %",
         'warn_normalize': "Gesamtkomplexität ist {total}%. Wird normalisiert.",
         'automation': "KI/Automatisierung (%)",
+        'queue_policy': "Warteschlangen-Strategie",
+        'help_queue_policy': "Wie Agenten Tickets aus den Rückständen je Komplexität wählen. 'Eine Warteschlange' behandelt alle Tickets als Durchschnittstickets.",
+        'queue_policy_single': "Eine Warteschlange (Durchschnittstickets)",
+        'queue_policy_fifo': "Je Klasse, First In First Out",
+        'queue_policy_strict_low': "Strikte Priorität: Niedrig zuerst",
+        'queue_policy_strict_high': "Strikte Priorität: Hoch zuerst",
+        'queue_policy_fair': "Gewichtete faire Aufteilung",
+        'queue_policy_daily_only': "Warteschlangen-Strategien sind nur für die tägliche Engine verfügbar.",
+
+        # Sidebar - Monte Carlo
+        'header_mc': "4. Monte Carlo",
+        'mc_replications': "Replikationen",
+        'mc_off': "Aus (Einzelpfad)",
+        'help_mc': "Anzahl gemeinsam simulierter Zufallspfade. KPIs und The Pulse zeigen den Median mit einem P5–P95-Band.",
+        'mc_range': "P5–P95: {low} – {high}",
+        'mc_median_interval': "Median {low} – {high} (95%-KI)",
+        'mc_progress': "Monte Carlo: {done:,} von {total:,} Replikationen – die Bänder werden im Hintergrund verfeinert",
+        'analytic_preview': "≈ analytische Schätzung, Simulation läuft…",
+        'analytic_summary': "Analytische Schätzung: Auslastung {utilization:.0%} · Rückstau {growth:+.0f} Tickets/Tag, solange Tickets warten",
+        'analytic_mismatch': "Die analytische Schätzung weicht um mehr als {tolerance:.0%} von der Simulation ab: {kpis}. Maßgeblich ist die Simulation; die Schätzung nähert nur das Tagesmodell an.",
+        'analytic_versus': "{kpi} ≈ {analytic} vs. {simulated}",
+        'legend_backlog_band': "Backlog P5–P95",
+        'seed': "Zufalls-Seed",
+        'help_seed': "Gleicher Seed und gleiche Parameter liefern dasselbe Ergebnis, das dann aus dem Cache kommt",
+        'engine': "Simulations-Engine",
+        'engine_daily': "Täglich (Flussmodell)",
+        'engine_event': "Ereignis (einzelne Tickets)",
+        'engine_hourly': "Stündlich (untertägig)",
+        'help_engine': "Die stündliche Engine teilt jeden Tag in 24 Stunden mit Eingangskurve und Schichtabdeckung (Mittagspause, Montagmorgen-Spitze). Die Ereignis-Engine simuliert jedes Ticket mit eigener Komplexität und echter Zeit von Eingang bis Lösung, bearbeitet von einzelnen Agenten",
+        'engine_event_no_mc': "Monte Carlo ist nur für die tägliche Engine verfügbar.",
+        'cache_stats': "🗄️ Cache: {hits} Treffer · {misses} Fehlzugriffe · {entries} Einträge ({size:.1f} MB)",
+        'cache_stage_stats': "🧩 Wiederverwendete Pipeline-Stufen: {reused} von {total}",
+        'cache_figure_stats': "🖼️ Wiederverwendete Diagramme: {hits} von {total}",
+        'debug_panel': "⏱️ Debug-Zeitmessung",
+        'debug_total': "Skriptlauf: {seconds:.3f} s · Stufen- und Seitenzeiten überlappen sich",
+        'debug_download_json': "Zeiten herunterladen (JSON)",
+        'debug_download_pstats': "cProfile-Dump herunterladen",
+        'debug_pstats_hint': "Öffnen mit `python -m pstats ticketsim_profile.pstats` oder snakeviz",
         
         # KPIs
         'kpi_wait': "Ø Wartezeit",
@@ -227,50 +390,88 @@ Passen Sie die Parameter in der Seitenleiste an, um die Auswirkungen auf **Lösu
         
         # Charts
         'chart_pulse': "📈 Der Puls: Eingang vs. Kapazität vs. Rückstau",
+        'chart_class_backlog': "🧮 Rückstau nach Komplexitätsklasse",
+        'kpi_class_wait': "Ø Wartezeit ({cls})",
         'chart_dist': "📊 Verteilung der Lösungszeiten",
+        'axis_tickets': "Tickets",
+        'sla_breach_hours': "SLA (Stunden)",
+        'age_summary': "Reales Ticketalter: P50 {p50:.1f} h · P90 {p90:.1f} h · P99 {p99:.1f} h. {breaches:,.0f} gelöste Tickets warteten länger als {sla} h, {open:,.0f} offene Tickets sind bereits älter.",
         'chart_staff': "👥 Personalverfügbarkeit",
         'legend_inbound': "Netto Eingang",
         'legend_capacity': "Kapazität",
         'legend_backlog': "Rückstau",
+        'chart_intraday': "🕐 Untertägig: Eingang vs. Kapazität vs. Rückstand pro Stunde",
+        'drill_day': "Tag im Detail",
+        'drill_all_days': "Alle Tage",
+
+        # SLA Staffing Search
+        'header_staffing_search': "🎯 SLA-Personalsuche",
+        'staffing_search_desc': "Findet die VZ/TZ-Kombination mit den wenigsten Personalstunden pro Tag, die ein Wartezeit-SLA erfüllt – mit den Einstellungen zu Ticketaufkommen, Effizienz und Abwesenheit aus der Seitenleiste.",
+        'sla_target_hours': "Ziel-Wartezeit (Stunden)",
+        'sla_percentile': "Wartezeit-Perzentil",
+        'sla_service_level': "Konfidenz (%)",
+        'help_sla_service_level': "Anteil der Monte-Carlo-Replikationen, in denen das Wartezeit-Perzentil unter dem Ziel bleiben muss",
+        'sla_max_ft': "Max. Vollzeit-Agenten",
+        'sla_max_pt': "Max. Teilzeit-Agenten",
+        'sla_search': "🔍 Minimale Besetzung finden",
+        'sla_searching': "Personalstärken werden durchsucht…",
+        'sla_success_rate': "Replikationen im SLA",
+        'sla_found': "{hours:.0f} Personalstunden pro Tag · {candidates} Kandidaten bewertet",
+        'sla_infeasible': "Keine Personalkombination innerhalb der Grenzen erfüllt das SLA.",
         
         # Data Table
         'expander_data': "Detaillierte Daten anzeigen",
         
         # Comparison Page
         'compare_title': "⚖️ Szenario-Vergleich",
-        'compare_desc': "Vergleichen Sie zwei Personalstrategien Seite an Seite unter **gleichen** Eingangsbedingungen.",
+        'compare_desc': "Vergleichen Sie Personalstrategien unter **gleichem** Ticketeingang und gleichen Abwesenheiten: Alle Szenarien laufen auf denselben Monte-Carlo-Replikationen.",
         'header_shared': "🔒 Gemeinsame Umgebung",
-        'info_shared': "Diese Parameter gelten für BEIDE Szenarien.",
-        'header_scen_a': "🔵 Szenario A",
-        'header_scen_b': "🟠 Szenario B",
-        'config_a': "Konfiguration Personal A",
-        'config_b': "Konfiguration Personal B",
-        'ft_agents_a': "🔵 Vollzeit (A)",
-        'pt_agents_a': "🔵 Teilzeit (A)",
-        'eff_a': "🔵 Effizienz (A)",
-        'absent_a': "🔵 Abwesenheit % (A)",
-        'ft_agents_b': "🟠 Vollzeit (B)",
-        'pt_agents_b': "🟠 Teilzeit (B)",
-        'eff_b': "🟠 Effizienz (B)",
-        'absent_b': "🟠 Abwesenheit % (B)",
+        'info_shared': "Diese Parameter gelten für ALLE Szenarien.",
+        'header_scenarios': "👥 Personal-Szenarien",
+        'scenarios_desc': "Eine Zeile pro Szenario, bis zu {max}. Zeilen mit ➕ hinzufügen; das Referenzszenario wird mit jedem anderen verglichen.",
+        'col_scenario': "Szenario",
+        'scenarios_max': "Nur die ersten {max} Szenarien werden verglichen.",
+        'scenarios_empty': "Fügen Sie mindestens eine vollständige Szenario-Zeile hinzu.",
+        'baseline': "Referenzszenario",
+        'help_baseline': "Differenzen werden als Szenario minus Referenz angegeben, gepaart je Replikation",
         
         # Comparison Visuals
         'kpi_compare': "📊 KPI Vergleich",
-        'kpi_wait_a': "Ø Wartezeit (A)",
-        'kpi_wait_b': "Ø Wartezeit (B)",
-        'kpi_backlog_a': "Max Rückstau (A)",
-        'kpi_backlog_b': "Max Rückstau (B)",
-        'kpi_hours_a': "Personalstunden (A)",
-        'kpi_hours_b': "Personalstunden (B)",
+        'diff_title': "🎯 Gepaarte Differenzen",
+        'diff_desc': "Mittlere Differenz zu {baseline} über {replications:,} gemeinsame Replikationen mit {confidence:.0f}%-Konfidenzintervallen; rote Intervalle schließen null aus.",
+        'diff_kpi': "Kennzahl",
+        'axis_difference': "{kpi}: Differenz zu {baseline}",
+        'diff_table': "Alle gepaarten Differenzen",
         'pulse_compare': "📈 Puls-Vergleich",
-        'pulse_a': "🔵 Szenario A Puls",
-        'pulse_b': "🟠 Szenario B Puls",
-        'box_title': "📦 Wartezeit-Verteilung (Boxplot)",
+        'box_title': "📦 Ø Wartezeit über Replikationen",
         'cdf_title': "📉 Lösungswahrscheinlichkeit (CDF)",
         'axis_wait': "Wartezeit (Stunden)",
         'axis_prob': "Wahrscheinlichkeit (<= x)",
         'title_cdf': "CDF der Wartezeit",
 
+        # Sweep Page
+        'page_title_sweep': "Parameter-Sweep",
+        'sweep_title': "🗺️ Parameter-Sweep",
+        'sweep_desc': "Bewerten Sie ein ganzes Raster von Personaloptionen auf einmal. Jeder Rasterpunkt wird mit denselben Monte-Carlo-Zufallszahlen simuliert, sodass Unterschiede zwischen Zellen aus den Parametern stammen und nicht aus Zufallsrauschen.",
+        'header_grid': "🧮 Sweep-Raster",
+        'sweep_ft_range': "Vollzeit-Agenten (Bereich)",
+        'sweep_pt_range': "Teilzeit-Agenten (Bereich)",
+        'sweep_efficiencies': "Effizienzen (Tickets/Stunde)",
+        'sweep_automation_rates': "KI/Automatisierungs-Quoten (%)",
+        'sweep_days': "Simulierte Tage",
+        'sweep_points': "{points} Rasterpunkte × {replications} Replikationen",
+        'sweep_run': "▶️ Sweep starten",
+        'sweep_running': "Raster wird simuliert…",
+        'sweep_empty': "Wählen Sie mindestens eine Effizienz und eine Automatisierungsquote.",
+        'sweep_hint': "Konfigurieren Sie das Raster und klicken Sie auf **Sweep starten**.",
+        'sweep_kpi': "Kennzahl",
+        'sweep_slice_eff': "Effizienz-Schnitt",
+        'sweep_slice_auto': "Automatisierungs-Schnitt (%)",
+        'sweep_heatmap': "🗺️ {kpi}: Vollzeit × Teilzeit-Agenten",
+        'axis_ft': "Vollzeit-Agenten",
+        'axis_pt': "Teilzeit-Agenten",
+        'sweep_table': "Sweep-Tabelle anzeigen",
+
         # Info Page
         'page_title_info': "Projekt Info",
         'info_title': "ℹ️ Projekt Information",
@@ -307,7 +508,7 @@ Passen Sie die Parameter in der Seitenleiste an, um die Auswirkungen auf **Lösu
         'limitation_2': "**Gleiche Effizienz**: Alle Agenten haben die gleiche Leistung (keine Erfahrungsunterschiede)",
         'limitation_3': "**FIFO-Warteschlange**: Keine Priorisierung nach SLA oder Dringlichkeit",
         'limitation_4': "**Keine Eskalationen**: Tickets werden einmal gelöst, keine Wiederöffnungen",
-        'limitation_5': "**Tages-Granularität**: Stunden-genaue Dynamiken werden nicht modelliert",
+        'limitation_5': "**Tages-Granularität**: Die Standard-Engine rechnet pro Tag; die stündliche Engine ergänzt Eingangskurven und Schichtabdeckung, behandelt Tickets aber weiterhin als Fluss",
         'limitation_6': "**Keine Saisonalität**: Wöchentliche/monatliche Muster nicht implementiert",
 
         'section_use_cases': "✅ Empfohlene Anwendungsfälle",